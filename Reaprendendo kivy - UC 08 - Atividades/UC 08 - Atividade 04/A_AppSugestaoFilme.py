@@ -7,14 +7,15 @@ This application demonstrates advanced Kivy concepts:
 - Custom widget creation with visual styling (Card widget)
 - Data management with structured movie database
 - Toggle button groups for exclusive selection
-- ScrollView for dynamic content history
+- RecycleView for a bounded, recycled suggestion history
 - Input validation with age restrictions
 - Professional popup dialogs for user feedback
 - Image handling with error management
 - Complex layout composition (FloatLayout + BoxLayout)
 
 Features:
-- Random movie suggestions based on genre selection
+- Random movie suggestions based on genre selection, ranked by the
+  user's liked movies once they liked one
 - Age-appropriate content filtering
 - Visual movie history with images
 - Comprehensive input validation
@@ -26,8 +27,8 @@ Concepts: Custom widgets, data structures, validation, image handling, scrollabl
 """
 
 # Import Python standard library modules
-import random  # For random movie selection
 import os      # For file path operations
+import sys     # For locating the shared movie_suggestions package
 
 # Import Kivy framework components
 from kivy.app import App                    # Base application class
@@ -39,11 +40,14 @@ from kivy.core.window import Window         # Window management
 from kivy.uix.floatlayout import FloatLayout  # Free-positioning layout
 from kivy.graphics import Color, RoundedRectangle  # Graphics primitives for custom styling
 from kivy.uix.popup import Popup            # Modal dialog widget
-from kivy.uix.scrollview import ScrollView  # Scrollable content container
-from kivy.uix.image import Image            # Image display widget
 from kivy.uix.gridlayout import GridLayout  # Grid-based layout (imported but not used)
 from kivy.uix.togglebutton import ToggleButton  # Toggle button for exclusive selection
 
+# Shared movie catalog package, kept in the activities folder above this one
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from movie_suggestions import MovieCatalog, Recommender, SuggestionHistory, SuggestionSampler  # noqa: E402  # Catalog, recommendations, history and shuffle bags
+from movie_suggestions.history_view import HistoryPanel  # noqa: E402  # Recycled history panel
+
 
 class Card(BoxLayout):
     """
@@ -115,71 +119,65 @@ class FilmeSorteador:
     - Business logic (selection algorithms, age restrictions)
     - Configuration management (age limits per genre)
     
-    The class maintains a structured database of movies organized by genre,
+    The class reads a structured catalog of movies organized by genre,
     with each movie containing title, year, and image filename information.
     
     Design Pattern: This follows the Repository pattern for data access
     and the Strategy pattern for selection logic.
     """
     
-    def __init__(self):
+    def __init__(self, semente=None):
+        """
+        Open the movie catalog without reading it yet.
+        
+        The catalog and the age restriction rules live in the shared data
+        files of the movie_suggestions package (data/filmes.csv and
+        data/generos.csv), so adding a movie no longer means editing code.
+        The catalog file is only opened on first use, and a suggestion
+        reads a single movie of the selected genre.
+        
+        Each user's suggestions and liked movies feed a preference vector
+        (recommender.py); once a user liked a movie, suggestions are ranked
+        by it instead of drawn at random.
+        
+        Args:
+            semente (optional): Seed of the suggestion order, for
+                               reproducible tests (None = random order)
+        """
+        self.catalogo = MovieCatalog()
+        self.sacolas = SuggestionSampler(self.catalogo, semente)
+        self.recomendador = Recommender(self.catalogo, semente)
+
+    @property
+    def idade_limite(self):
+        """
+        Age restriction configuration for content filtering.
+        
+        Returns:
+            dict: Each genre mapped to (minimum_age, maximum_age); the
+                  minimum is the youngest age allowed to watch at least
+                  one of the genre's titles
         """
-        Initialize the movie database and age restriction rules.
+        return self.catalogo.age_limits()
+
+    def permite(self, idade, genero):
+        """
+        Check whether an age may watch at least one title of a genre.
+        
+        Args:
+            idade (int): User's age
+            genero (str): Selected movie genre
+        
+        Returns:
+            bool: True if the genre has a title rated for this age
         
-        Sets up the complete movie catalog with genre categorization
-        and defines age-appropriate viewing restrictions for each genre.
+        Algorithm:
+            Looks the age bucket up in the catalog's eligibility index,
+            built once per catalog version, instead of comparing ranges.
         """
-        # Movie database organized by genre
-        # Each entry: (title, year, image_filename)
-        self.filmes = {
-            "Ação": [
-                ("Mad Max: Estrada da Fúria", 2015, "mad_max.jpg"),
-                ("John Wick", 2014, "john_wick.jpg"),
-                ("Duro de Matar", 1988, "duro_de_matar.jpg"),
-                ("Os Vingadores", 2012, "vingadores.jpg"),
-                ("Gladiador", 2000, "gladiador.jpg"),
-            ],
-            "Comédia": [
-                ("Superbad", 2007, "superbad.png"),
-                ("A Morte Lhe Cai Bem", 1992, "morte_lhe_cai_bem.jpg"),
-                ("Os Caça-Fantasmas", 1984, "caca_fantasmas.jpg"),
-                ("O Diário de uma Princesa", 2001, "diario_princesa.webp"),
-                ("As Branquelas", 2004, "branquelas.jpeg"),
-            ],
-            "Drama": [
-                ("Forrest Gump", 1994, "forrest_gump.jpg"),
-                ("O Poderoso Chefão", 1972, "poderoso_chefa.jpg"),
-                ("A Lista de Schindler", 1993, "lista_schindler.jpg"),
-                ("Clube da Luta", 1999, "clube_luta.jpg"),
-                ("O Senhor dos Anéis: O Retorno do Rei", 2003, "senhor_aneis.jpg"),
-            ],
-            "Ficção Científica": [
-                ("Interestelar", 2014, "interestelar.png"),
-                ("Blade Runner 2049", 2017, "blade_runner.jpg"),
-                ("A Origem", 2010, "origem.jpg"),
-                ("Ex Machina", 2014, "ex_machina.webp"),
-                ("Matrix", 1999, "matrix.png"),
-            ],
-            "Animação": [
-                ("Toy Story", 1995, "toy_story.webp"),
-                ("Procurando Nemo", 2003, "procurando_nemo.jpg"),
-                ("O Rei Leão", 1994, "rei_leao.webp"),
-                ("Shrek", 2001, "shrek.jpg"),
-                ("Divertida Mente", 2015, "divertida_mente.webp"),
-            ]
-        }
-
-        # Age restriction configuration for content filtering
-        # Each genre: (minimum_age, maximum_age)
-        self.idade_limite = {
-            "Ação": (16, 100),           # Action movies: 16+ (violence content)
-            "Comédia": (10, 100),        # Comedy movies: 10+ (mild content)
-            "Drama": (12, 100),          # Drama movies: 12+ (mature themes)
-            "Ficção Científica": (12, 100),  # Sci-fi movies: 12+ (complex themes)
-            "Animação": (0, 100)         # Animation movies: All ages
-        }
-
-    def sortear_filme(self, genero):
+        return self.catalogo.eligibility().allows(idade, genero)
+
+    def sortear_filme(self, genero, idade=None, usuario=""):
         """
         Randomly select a movie from the specified genre.
         
@@ -189,19 +187,43 @@ class FilmeSorteador:
         
         Args:
             genero (str): The movie genre to select from
-                         (must be a key in self.filmes)
+                         (must be a genre of the catalog)
+            idade (int, optional): Only titles rated for this age are drawn
+            usuario (str, optional): User name; each user has their own
+                                    suggestion order per genre
         
         Returns:
-            tuple or None: Movie information as (title, year, image_filename)
-                          Returns None if genre is invalid
+            Movie or None: Movie information as (title, year, image_filename,
+                          id, genre, rating); None if genre is invalid or
+                          has no title for the age
         
         Algorithm:
-            Uses Python's random.choice() for uniform random selection
-            from the available movies in the specified genre.
+            Once the user liked a movie (gostei), returns the title rated
+            for the age that best matches the user's preference vector and
+            was not suggested yet (recommender.py). Before that, or without
+            NumPy, draws the next position of the user's shuffle bag for
+            the genre (shuffle.py): every title rated for the age comes up
+            once, in random order, before any title repeats. Either way the
+            suggestion is recorded in the user's history.
+        """
+        filme = (self.recomendador.suggest(usuario, genero, idade)
+                 or self.sacolas.suggest(usuario, genero, idade))
+        if filme:
+            self.recomendador.record(usuario, filme.id)
+        return filme
+
+    def gostei(self, usuario, filme):
         """
-        if genero in self.filmes:
-            return random.choice(self.filmes[genero])
-        return None
+        Record that the user liked a suggested movie.
+        
+        Args:
+            usuario (str): User name
+            filme (Movie): The movie the user liked
+        
+        The movie's genre, decade and age rating weigh in the user's
+        next suggestions.
+        """
+        self.recomendador.record(usuario, filme.id, accepted=True)
 
 
 class FilmeApp(App):
@@ -226,11 +248,18 @@ class FilmeApp(App):
     Features:
         - Random movie suggestions based on selected genre
         - Age-appropriate content filtering
-        - Visual history of suggestions with movie posters
+        - Visual history of the last suggestions with movie posters;
+          older ones are appended to data/historico.csv
         - Input validation with helpful error messages
         - Professional retro-themed UI design
+    
+    Attributes:
+        history_limit (int): Suggestions kept in the history panel; older
+                             ones are only kept in the log file
     """
     
+    history_limit = 50
+    
     def build(self):
         """
         Constructs the complete application interface.
@@ -239,7 +268,7 @@ class FilmeApp(App):
         - Nested layouts for complex interfaces
         - Custom widget integration (Card component)
         - Multiple input types (TextInput, ToggleButton)
-        - Dynamic content areas (ScrollView for history)
+        - Dynamic content areas (RecycleView for history)
         - Professional styling with consistent theming
         
         Returns:
@@ -305,7 +334,7 @@ class FilmeApp(App):
         )
         
         # Define available movie genres
-        self.genres = ["Ação", "Comédia", "Drama", "Ficção Científica", "Animação"]
+        self.genres = self.sorteador.catalogo.genres()
         self.toggle_buttons = {}  # Store button references for state checking
 
         # Create toggle button for each genre
@@ -320,10 +349,16 @@ class FilmeApp(App):
 
         self.card.add_widget(self.genre_buttons)
 
+        # Row with the suggestion button and the "liked it" button
+        self.action_buttons = BoxLayout(
+            size_hint=(1, 0.2),     # Full width, 20% height
+            spacing=10              # 10px spacing between buttons
+        )
+
         # Main action button for generating movie suggestions
         self.button = Button(
             text=" GERAR FILME ",              # Spaced text for retro feel
-            size_hint=(1, 0.2),               # Full width, 20% height
+            size_hint=(0.7, 1),               # 70% of the row
             background_normal='',              # Remove default background
             background_color=(0, 0.8, 0.4, 1),  # Green action color
             font_size=20,                     # Large, readable font
@@ -331,7 +366,24 @@ class FilmeApp(App):
         )
         # Bind button click to movie suggestion logic
         self.button.bind(on_press=self.sugerir_filme)
-        self.card.add_widget(self.button)
+        self.action_buttons.add_widget(self.button)
+
+        # Like button: the liked movie steers the next suggestions
+        self.like_button = Button(
+            text=" GOSTEI ",                  # Spaced text for retro feel
+            size_hint=(0.3, 1),               # 30% of the row
+            background_normal='',              # Remove default background
+            background_color=(1, 0, 1, 1),    # Magenta neon color
+            font_size=20,                     # Large, readable font
+            color=(0, 0, 0, 1),               # Black text for contrast
+            disabled=True                     # Enabled once a movie is suggested
+        )
+        self.like_button.bind(on_press=self.gostei_do_filme)
+        self.action_buttons.add_widget(self.like_button)
+        self.card.add_widget(self.action_buttons)
+
+        # Last suggestion, as (user name, movie), for the like button
+        self.ultima_sugestao = None
 
         # Clear button for resetting the interface
         self.clear_button = Button(
@@ -360,25 +412,18 @@ class FilmeApp(App):
         self.message_label.bind(size=self.ajustar_texto)
         self.card.add_widget(self.message_label)
 
-        # Scrollable history area for displaying past suggestions
+        # Last suggestions in memory, older ones in data/historico.csv
+        self.history = SuggestionHistory(self.history_limit)
+
+        # Recycled history list for displaying past suggestions
         # Initially hidden (height=0), expands when content is added
-        self.history_scroll = ScrollView(
-            size_hint=(1, None),    # Full width, fixed height
-            height=0                # Initially hidden
-        )
-        
-        # Container for history items with dynamic sizing
-        self.history_box = BoxLayout(
-            orientation='vertical',      # Stack history items vertically
-            size_hint_y=None,           # Fixed height based on content
-            spacing=10,                 # 10px spacing between items
-            padding=5                   # 5px padding around content
+        # Only the rows on screen exist as widgets, whatever the history size
+        self.history_view = HistoryPanel(
+            self.history,
+            os.path.dirname(__file__),           # Posters next to this script
+            missing_note=" - [Imagem não encontrada]"
         )
-        # Bind minimum height to actual height for proper scrolling
-        self.history_box.bind(minimum_height=self.history_box.setter('height'))
-        self.history_scroll.add_widget(self.history_box)
-
-        self.card.add_widget(self.history_scroll)
+        self.card.add_widget(self.history_view)
 
         # Add main card to root layout
         root.add_widget(self.card)
@@ -468,10 +513,9 @@ class FilmeApp(App):
             return False
         
         # Age restriction validation based on genre
-        idade = int(idade_texto)
-        min_idade, max_idade = self.sorteador.idade_limite[genero]
-        
-        if idade < min_idade or idade > max_idade:
+        # (constant-time lookup in the catalog's eligibility index)
+        if not self.sorteador.permite(int(idade_texto), genero):
+            min_idade, max_idade = self.sorteador.idade_limite[genero]
             self.show_popup(
                 f"ERRO: Idade deve estar entre {min_idade} e {max_idade} "
                 f"para o gênero {genero}."
@@ -499,9 +543,9 @@ class FilmeApp(App):
             2. Validate all inputs using comprehensive validation
             3. Generate random movie suggestion from selected genre
             4. Display personalized feedback message
-            5. Add suggestion to visual history with movie poster
-            6. Handle image loading with graceful error management
-            7. Update scrollable history area
+            5. Add suggestion to the bounded history (oldest entry goes
+               to the log file past history_limit)
+            6. Show it in the recycled history panel with its poster
         """
         # Extract user inputs
         nome = self.name_input.text.strip()     # Remove whitespace from name
@@ -519,9 +563,13 @@ class FilmeApp(App):
             return  # Exit if validation fails
 
         # Generate random movie suggestion
-        filme_escolhido = self.sorteador.sortear_filme(genero)
+        filme_escolhido = self.sorteador.sortear_filme(genero, int(idade_texto), nome)
         
         if filme_escolhido:
+            # Remember the suggestion so the user can like it
+            self.ultima_sugestao = (nome, filme_escolhido)
+            self.like_button.disabled = False
+
             # Display personalized suggestion message with rich text formatting
             self.message_label.text = (
                 f"[b][color=00ff99]Olá, {nome}![/color][/b]\n"
@@ -529,51 +577,43 @@ class FilmeApp(App):
                 f"[color=ff00ff]{filme_escolhido[0]} ({filme_escolhido[1]})[/color]"
             )
         
-            # Add suggestion to visual history with movie poster
-            # Construct image path relative to script location
-            img_path = os.path.join(os.path.dirname(__file__), filme_escolhido[2])
-        
-            # Image handling with graceful error management
-            if not os.path.exists(img_path):
-                # Debug output for missing images
-                print(f"ERRO: Arquivo não encontrado: {img_path}")
-                
-                # Add text-only history entry when image is missing
-                self.history_box.add_widget(Label(
-                    text=f"{nome} sugeriu: {filme_escolhido[0]} ({filme_escolhido[1]}) - [Imagem não encontrada]",
-                    color=(1, 1, 1, 1),      # White text
-                    size_hint_y=None,        # Fixed height
-                    height=30                # 30 pixels height
-                ))
-            else:
-                # Debug output for successful image loading
-                print(f"Imagem encontrada: {img_path}")
-                
-                # Create image widget with movie poster
-                img = Image(
-                    source=img_path,         # Movie poster image file
-                    size_hint=(1, None),     # Full width, fixed height
-                    height=200,              # 200 pixels height
-                    allow_stretch=True       # Allow image stretching/scaling
-                )
-                
-                # Create descriptive label for the suggestion
-                label = Label(
-                    text=f"{nome} sugeriu: {filme_escolhido[0]} ({filme_escolhido[1]})",
-                    color=(1, 1, 1, 1),      # White text
-                    size_hint_y=None,        # Fixed height
-                    height=30                # 30 pixels height
-                )
-                
-                # Add both label and image to history
-                self.history_box.add_widget(label)
-                self.history_box.add_widget(img)
-
-            # Expand ScrollView to show history (max 300px height)
-            self.history_scroll.height = min(300, self.history_box.height)
-        
-            # Auto-scroll to the latest entry (first child due to vertical layout)
-            self.history_scroll.scroll_to(self.history_box.children[0])
+            self.adicionar_historico(nome, filme_escolhido)
+
+    def adicionar_historico(self, nome, filme):
+        """
+        Add a suggestion to the history and show it in the recycled panel.
+        
+        Args:
+            nome (str): User name
+            filme (Movie): Suggested movie
+        
+        Technical Implementation:
+            - HistoryPanel records it in the bounded history (past
+              history_limit the oldest entry leaves memory for the log
+              file) and appends its row to the RecycleView data; no widget
+              is created per suggestion
+            - The panel drops its first row only when the history evicted
+              an entry, so it always mirrors the in-memory history
+            - Missing posters give a text-only row, as before
+        """
+        self.history_view.add(nome, filme)
+
+    def gostei_do_filme(self, instance):
+        """
+        Record that the user liked the last suggested movie.
+        
+        Args:
+            instance (Button): The like button that triggered this method
+        
+        The button is disabled until the next suggestion, so a movie is
+        liked at most once.
+        """
+        if self.ultima_sugestao is None:
+            return
+        nome, filme = self.ultima_sugestao
+        self.sorteador.gostei(nome, filme)
+        self.like_button.disabled = True
+        self.message_label.text += f"\n[color=00ff99]Anotado! Próximas sugestões no estilo de {filme[0]}.[/color]"
 
     def limpar_campos(self, instance):
         """
@@ -583,7 +623,7 @@ class FilmeApp(App):
         - Clears all user input fields
         - Resets button states to default
         - Clears feedback messages
-        - Removes suggestion history
+        - Empties the suggestion history panel
         - Returns the interface to initial state
         
         Args:
@@ -593,8 +633,8 @@ class FilmeApp(App):
             1. Clear text input fields (name and age)
             2. Reset all toggle buttons to unpressed state
             3. Clear the main message display
-            4. Remove all items from suggestion history
-            5. Reset history scroll area height
+            4. Move the suggestion history to the log file
+            5. Reset history area height
         """
         # Clear text input fields
         self.name_input.text = ""
@@ -606,12 +646,12 @@ class FilmeApp(App):
         
         # Clear the main feedback message
         self.message_label.text = ""
+        self.ultima_sugestao = None
+        self.like_button.disabled = True
         
-        # Clear the suggestion history
-        self.history_box.clear_widgets()
-        
-        # Reset history scroll area height to hidden
-        self.history_scroll.height = 0
+        # Clear the suggestion history (its entries go to the log file)
+        # and hide its area
+        self.history_view.clear()
 
 
 # Application Entry Point
@@ -630,7 +670,7 @@ if __name__ == "__main__":
     Key Features Demonstrated:
         - Custom widget creation (Card component)
         - Toggle button groups for exclusive selection
-        - ScrollView for dynamic content
+        - RecycleView for a bounded, recycled history
         - Professional popup dialogs
         - Rich text markup for styled messages
         - File system operations with error handling
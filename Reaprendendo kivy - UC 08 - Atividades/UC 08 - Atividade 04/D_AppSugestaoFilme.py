@@ -1,5 +1,5 @@
-import random
 import os
+import sys
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
@@ -9,11 +9,14 @@ from kivy.core.window import Window
 from kivy.uix.floatlayout import FloatLayout
 from kivy.graphics import Color, RoundedRectangle
 from kivy.uix.popup import Popup
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.image import Image
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.togglebutton import ToggleButton
 
+# O pacote movie_suggestions fica na pasta das atividades, acima desta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from movie_suggestions import MovieCatalog, Recommender, SuggestionHistory, SuggestionSampler  # noqa: E402
+from movie_suggestions.history_view import HistoryPanel  # noqa: E402
+
 
 class RoundedCard(BoxLayout):
     """Widget personalizado com fundo arredondado estilo cartão."""
@@ -36,80 +39,48 @@ class RoundedCard(BoxLayout):
 
 
 class MovieSuggester:
-    """Classe responsável por gerenciar o catálogo de filmes e sugerir aleatoriamente."""
+    """Classe responsável por consultar o catálogo de filmes e sugerir filmes aos usuários."""
+    
+    def __init__(self, seed=None):
+        self.catalog = MovieCatalog()
+        self.sampler = SuggestionSampler(self.catalog, seed)
+        self.recommender = Recommender(self.catalog, seed)
     
-    def __init__(self):
-        self.movies = self._initialize_movie_catalog()
-        self.age_limits = self._initialize_age_limits()
+    def genres(self):
+        """Retorna os gêneros do catálogo, na ordem do arquivo de gêneros."""
+        return self.catalog.genres()
     
-    def _initialize_movie_catalog(self):
-        """Inicializa o catálogo de filmes organizado por gênero."""
-        return {
-            "Ação": [
-                ("Mad Max: Estrada da Fúria", 2015, "mad_max.jpg"),
-                ("John Wick", 2014, "john_wick.jpg"),
-                ("Duro de Matar", 1988, "duro_de_matar.jpg"),
-                ("Os Vingadores", 2012, "vingadores.jpg"),
-                ("Gladiador", 2000, "gladiador.jpg"),
-            ],
-            "Comédia": [
-                ("Superbad", 2007, "superbad.png"),
-                ("A Morte Lhe Cai Bem", 1992, "morte_lhe_cai_bem.jpg"),
-                ("Os Caça-Fantasmas", 1984, "caca_fantasmas.jpg"),
-                ("O Diário de uma Princesa", 2001, "diario_princesa.webp"),
-                ("As Branquelas", 2004, "branquelas.jpeg"),
-            ],
-            "Drama": [
-                ("Forrest Gump", 1994, "forrest_gump.jpg"),
-                ("O Poderoso Chefão", 1972, "poderoso_chefao.jpg"),
-                ("A Lista de Schindler", 1993, "lista_schindler.jpg"),
-                ("Clube da Luta", 1999, "clube_luta.jpg"),
-                ("O Senhor dos Anéis: O Retorno do Rei", 2003, "senhor_aneis.jpg"),
-            ],
-            "Ficção Científica": [
-                ("Interestelar", 2014, "interestelar.png"),
-                ("Blade Runner 2049", 2017, "blade_runner.jpg"),
-                ("A Origem", 2010, "origem.jpg"),
-                ("Ex Machina", 2014, "ex_machina.webp"),
-                ("Matrix", 1999, "matrix.png"),
-            ],
-            "Animação": [
-                ("Toy Story", 1995, "toy_story.webp"),
-                ("Procurando Nemo", 2003, "procurando_nemo.jpg"),
-                ("O Rei Leão", 1994, "rei_leao.webp"),
-                ("Shrek", 2001, "shrek.jpg"),
-                ("Divertida Mente", 2015, "divertida_mente.webp"),
-            ]
-        }
+    def suggest_movie(self, genre, age=None, user=""):
+        """Sugere um filme do gênero para a idade: pelas preferências do usuário, se ele já curtiu algum, ou sem repetir até esgotar o gênero."""
+        movie = (self.recommender.suggest(user, genre, age)
+                 or self.sampler.suggest(user, genre, age))
+        if movie:
+            self.recommender.record(user, movie.id)
+        return movie
     
-    def _initialize_age_limits(self):
-        """Define os limites de idade para cada gênero de filme."""
-        return {
-            "Ação": (16, 100),
-            "Comédia": (10, 100),
-            "Drama": (12, 100),
-            "Ficção Científica": (12, 100),
-            "Animação": (0, 100)
-        }
+    def like_movie(self, user, movie):
+        """Registra que o usuário gostou do filme, para orientar as próximas sugestões."""
+        self.recommender.record(user, movie.id, accepted=True)
     
-    def suggest_movie(self, genre):
-        """Sugere aleatoriamente um filme do gênero especificado."""
-        if genre in self.movies:
-            return random.choice(self.movies[genre])
-        return None
+    def is_allowed(self, genre, age):
+        """Indica se a idade pode assistir a algum filme do gênero (índice de elegibilidade)."""
+        return self.catalog.eligibility().allows(age, genre)
     
     def get_age_limits(self, genre):
         """Retorna os limites de idade para um gênero específico."""
-        return self.age_limits.get(genre, (0, 100))
-
+        return self.catalog.age_limits().get(genre, (0, 100))
 
 class MovieSuggestionApp(App):
     """Aplicativo principal de sugestão de filmes aleatórios."""
     
+    # Sugestões mantidas no painel de histórico; as mais antigas vão para o arquivo de log
+    history_limit = 50
+    
     def build(self):
         """Constrói a interface gráfica do aplicativo."""
         Window.clearcolor = (0.1, 0.1, 0.1, 1)
         self.suggester = MovieSuggester()
+        self.history = SuggestionHistory(self.history_limit)
         
         root_layout = FloatLayout()
         self._setup_main_card(root_layout)
@@ -176,7 +147,7 @@ class MovieSuggestionApp(App):
     def _create_genre_buttons(self):
         """Cria os botões de seleção de gênero cinematográfico."""
         self.genre_buttons_layout = BoxLayout(size_hint=(1, 0.15), spacing=10)
-        self.genres = ["Ação", "Comédia", "Drama", "Ficção Científica", "Animação"]
+        self.genres = self.suggester.genres()
         self.toggle_buttons = {}
         
         for genre in self.genres:
@@ -187,17 +158,32 @@ class MovieSuggestionApp(App):
         self.main_card.add_widget(self.genre_buttons_layout)
     
     def _create_action_buttons(self):
-        """Cria os botões de ação (gerar filme e limpar)."""
+        """Cria os botões de ação (gerar filme, gostei e limpar)."""
+        self.action_buttons_layout = BoxLayout(size_hint=(1, 0.2), spacing=10)
         self.generate_button = Button(
             text="GERAR FILME",
-            size_hint=(1, 0.2),
+            size_hint=(0.7, 1),
             background_normal='',
             background_color=(0, 0.8, 0.4, 1),
             font_size=20,
             color=(0, 0, 0, 1)
         )
         self.generate_button.bind(on_press=self._suggest_movie)
-        self.main_card.add_widget(self.generate_button)
+        self.action_buttons_layout.add_widget(self.generate_button)
+        
+        self.like_button = Button(
+            text="GOSTEI",
+            size_hint=(0.3, 1),
+            background_normal='',
+            background_color=(1, 0, 1, 1),
+            font_size=20,
+            color=(0, 0, 0, 1),
+            disabled=True
+        )
+        self.like_button.bind(on_press=self._like_movie)
+        self.action_buttons_layout.add_widget(self.like_button)
+        self.main_card.add_widget(self.action_buttons_layout)
+        self.last_suggestion = None
         
         self.clear_button = Button(
             text="LIMPAR",
@@ -225,17 +211,13 @@ class MovieSuggestionApp(App):
         self.main_card.add_widget(self.message_label)
     
     def _create_history_section(self):
-        """Cria a seção de histórico de sugestões."""
-        self.history_scroll = ScrollView(size_hint=(1, None), height=0)
-        self.history_container = BoxLayout(
-            orientation='vertical', 
-            size_hint_y=None, 
-            spacing=10, 
-            padding=5
+        """Cria a seção de histórico de sugestões (só as linhas visíveis existem como widgets)."""
+        self.history_view = HistoryPanel(
+            self.history,
+            os.path.dirname(__file__),
+            missing_note=" - [Imagem não encontrada]"
         )
-        self.history_container.bind(minimum_height=self.history_container.setter('height'))
-        self.history_scroll.add_widget(self.history_container)
-        self.main_card.add_widget(self.history_scroll)
+        self.main_card.add_widget(self.history_view)
     
     def _show_popup(self, title, message):
         """Exibe um popup com uma mensagem para o usuário."""
@@ -261,10 +243,8 @@ class MovieSuggestionApp(App):
             self._show_popup("Erro de Validação", "Selecione um gênero!")
             return False
         
-        age = int(age_text)
-        min_age, max_age = self.suggester.get_age_limits(selected_genre)
-        
-        if age < min_age or age > max_age:
+        if not self.suggester.is_allowed(selected_genre, int(age_text)):
+            min_age, max_age = self.suggester.get_age_limits(selected_genre)
             self._show_popup("Restrição de Idade", 
                            f"Idade deve estar entre {min_age} e {max_age} para o gênero {selected_genre}.")
             return False
@@ -281,57 +261,33 @@ class MovieSuggestionApp(App):
         if not self._validate_input(name, age_text, selected_genre):
             return
         
-        suggested_movie = self.suggester.suggest_movie(selected_genre)
+        suggested_movie = self.suggester.suggest_movie(selected_genre, int(age_text), name)
         if suggested_movie:
+            self.last_suggestion = (name, suggested_movie)
+            self.like_button.disabled = False
             self._display_movie_suggestion(name, selected_genre, suggested_movie)
             self._add_to_history(name, suggested_movie)
     
+    def _like_movie(self, instance):
+        """Registra que o usuário gostou da última sugestão."""
+        if self.last_suggestion is None:
+            return
+        name, movie = self.last_suggestion
+        self.suggester.like_movie(name, movie)
+        self.like_button.disabled = True
+        self.message_label.text += f"\n[color=00ff99]Anotado! Próximas sugestões no estilo de {movie.title}.[/color]"
+    
     def _display_movie_suggestion(self, name, genre, movie):
         """Exibe a sugestão de filme na interface."""
-        movie_title, movie_year, _ = movie
         self.message_label.text = (
             f"[b][color=00ff99]Olá, {name}![/color][/b]\n"
             f"Sua sugestão de filme de {genre} é:\n"
-            f"[color=ff00ff]{movie_title} ({movie_year})[/color]"
+            f"[color=ff00ff]{movie.title} ({movie.year})[/color]"
         )
     
     def _add_to_history(self, name, movie):
-        """Adiciona a sugestão atual ao histórico."""
-        movie_title, movie_year, image_filename = movie
-        image_path = os.path.join(os.path.dirname(__file__), image_filename)
-        
-        history_label = Label(
-            text=f"{name} sugeriu: {movie_title} ({movie_year})",
-            color=(1, 1, 1, 1),
-            size_hint_y=None,
-            height=30
-        )
-        self.history_container.add_widget(history_label)
-        
-        if os.path.exists(image_path):
-            movie_image = Image(
-                source=image_path,
-                size_hint=(1, None),
-                height=200,
-                allow_stretch=True
-            )
-            self.history_container.add_widget(movie_image)
-        else:
-            error_label = Label(
-                text="[Imagem não encontrada]",
-                color=(1, 0, 0, 1),
-                size_hint_y=None,
-                height=20
-            )
-            self.history_container.add_widget(error_label)
-        
-        self._update_history_display()
-    
-    def _update_history_display(self):
-        """Atualiza a exibição do histórico."""
-        self.history_scroll.height = min(300, self.history_container.height)
-        if self.history_container.children:
-            self.history_scroll.scroll_to(self.history_container.children[0])
+        """Adiciona a sugestão ao histórico; acima do limite, a mais antiga vai para o log e sai do painel."""
+        self.history_view.add(name, movie)
     
     def _clear_fields(self, instance):
         """Limpa todos os campos e o histórico."""
@@ -340,8 +296,9 @@ class MovieSuggestionApp(App):
         for button in self.toggle_buttons.values():
             button.state = 'normal'
         self.message_label.text = ""
-        self.history_container.clear_widgets()
-        self.history_scroll.height = 0
+        self.last_suggestion = None
+        self.like_button.disabled = True
+        self.history_view.clear()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
-import random
+import os
+import sys
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
@@ -11,6 +12,10 @@ from kivy.uix.togglebutton import ToggleButton
 from kivy.uix.popup import Popup
 from kivy.uix.scrollview import ScrollView
 
+# Catálogo compartilhado, na pasta das atividades
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from movie_suggestions import MovieCatalog, SuggestionSampler  # noqa: E402
+
 
 class Card(BoxLayout):
     def __init__(self, **kwargs):
@@ -26,49 +31,13 @@ class Card(BoxLayout):
 
 
 class FilmeSorteador:
-    def __init__(self):
-        self.filmes = {
-            "Ação": [
-                ("Mad Max: Estrada da Fúria", 2015),
-                ("John Wick", 2014),
-                ("Duro de Matar", 1988),
-                ("Os Vingadores", 2012),
-                ("Gladiador", 2000),
-            ],
-            "Comédia": [
-                ("Superbad", 2007),
-                ("A Morte Lhe Cai Bem", 1992),
-                ("Os Caça-Fantasmas", 1984),
-                ("O Diário de uma Princesa", 2001),
-                ("As Branquelas", 2004),
-            ],
-            "Drama": [
-                ("Forrest Gump", 1994),
-                ("O Poderoso Chefão", 1972),
-                ("A Lista de Schindler", 1993),
-                ("Clube da Luta", 1999),
-                ("O Senhor dos Anéis: O Retorno do Rei", 2003),
-            ],
-            "Ficção Científica": [
-                ("Interestelar", 2014),
-                ("Blade Runner 2049", 2017),
-                ("A Origem", 2010),
-                ("Ex Machina", 2014),
-                ("Matrix", 1999),
-            ],
-            "Animação": [
-                ("Toy Story", 1995),
-                ("Procurando Nemo", 2003),
-                ("O Rei Leão", 1994),
-                ("Shrek", 2001),
-                ("Divertida Mente", 2015),
-            ]
-        }
-
-    def sortear_filme(self, genero):
-        if genero in self.filmes:
-            return random.choice(self.filmes[genero])
-        return None
+    def __init__(self, semente=None):
+        self.catalogo = MovieCatalog()
+        # Sem repetir filme até esgotar o gênero (uma sacola por usuário)
+        self.sacolas = SuggestionSampler(self.catalogo, semente)
+
+    def sortear_filme(self, genero, usuario=""):
+        return self.sacolas.suggest(usuario, genero)
 
 
 class FilmeApp(App):
@@ -108,7 +77,7 @@ class FilmeApp(App):
 
         # Botões de seleção de gênero
         self.genre_buttons = BoxLayout(size_hint=(1, 0.15), spacing=10)
-        self.genres = ["Ação", "Comédia", "Drama", "Ficção Científica", "Animação"]
+        self.genres = self.sorteador.catalogo.genres()
         self.toggle_buttons = {}
 
         for genre in self.genres:
@@ -189,7 +158,7 @@ class FilmeApp(App):
             self.show_popup("ERRO: Selecione um gênero!")
             return
 
-        filme_escolhido = self.sorteador.sortear_filme(genero)
+        filme_escolhido = self.sorteador.sortear_filme(genero, nome)
         if filme_escolhido:
             self.message_label.text = (
                 f"[b][color=00ff99]Olá, {nome}![/color][/b]\n"
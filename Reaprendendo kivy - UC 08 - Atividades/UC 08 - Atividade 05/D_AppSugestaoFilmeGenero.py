@@ -1,4 +1,5 @@
-import random
+import os
+import sys
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
@@ -11,6 +12,10 @@ from kivy.uix.togglebutton import ToggleButton
 from kivy.uix.popup import Popup
 from kivy.uix.scrollview import ScrollView
 
+# O pacote movie_suggestions fica na pasta das atividades, acima desta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from movie_suggestions import MovieCatalog, SuggestionSampler  # noqa: E402
+
 
 class RoundedCard(BoxLayout):
     """Widget personalizado com fundo arredondado estilo cartão."""
@@ -33,57 +38,19 @@ class RoundedCard(BoxLayout):
 
 
 class MovieSuggester:
-    """Classe responsável por gerenciar o catálogo de filmes e sugerir aleatoriamente."""
+    """Classe responsável por consultar o catálogo de filmes e sugerir aleatoriamente."""
     
-    def __init__(self):
-        self.movies = self._initialize_movie_catalog()
+    def __init__(self, seed=None):
+        self.catalog = MovieCatalog()
+        self.sampler = SuggestionSampler(self.catalog, seed)
     
-    def _initialize_movie_catalog(self):
-        """Inicializa o catálogo de filmes organizado por gênero."""
-        return {
-            "Ação": [
-                ("Mad Max: Estrada da Fúria", 2015),
-                ("John Wick", 2014),
-                ("Duro de Matar", 1988),
-                ("Os Vingadores", 2012),
-                ("Gladiador", 2000),
-            ],
-            "Comédia": [
-                ("Superbad", 2007),
-                ("A Morte Lhe Cai Bem", 1992),
-                ("Os Caça-Fantasmas", 1984),
-                ("O Diário de uma Princesa", 2001),
-                ("As Branquelas", 2004),
-            ],
-            "Drama": [
-                ("Forrest Gump", 1994),
-                ("O Poderoso Chefão", 1972),
-                ("A Lista de Schindler", 1993),
-                ("Clube da Luta", 1999),
-                ("O Senhor dos Anéis: O Retorno do Rei", 2003),
-            ],
-            "Ficção Científica": [
-                ("Interestelar", 2014),
-                ("Blade Runner 2049", 2017),
-                ("A Origem", 2010),
-                ("Ex Machina", 2014),
-                ("Matrix", 1999),
-            ],
-            "Animação": [
-                ("Toy Story", 1995),
-                ("Procurando Nemo", 2003),
-                ("O Rei Leão", 1994),
-                ("Shrek", 2001),
-                ("Divertida Mente", 2015),
-            ]
-        }
+    def genres(self):
+        """Retorna os gêneros do catálogo, na ordem do arquivo de gêneros."""
+        return self.catalog.genres()
     
-    def suggest_movie(self, genre):
-        """Sugere aleatoriamente um filme do gênero especificado."""
-        if genre in self.movies:
-            return random.choice(self.movies[genre])
-        return None
-
+    def suggest_movie(self, genre, user=""):
+        """Sugere um filme do gênero, sem repetir até esgotar o gênero."""
+        return self.sampler.suggest(user, genre)
 
 class MovieSuggestionApp(App):
     """Aplicativo principal de sugestão de filmes por gênero."""
@@ -144,7 +111,7 @@ class MovieSuggestionApp(App):
     def _create_genre_buttons(self):
         """Cria os botões de seleção de gênero cinematográfico."""
         self.genre_buttons_layout = BoxLayout(size_hint=(1, 0.15), spacing=10)
-        self.genres = ["Ação", "Comédia", "Drama", "Ficção Científica", "Animação"]
+        self.genres = self.suggester.genres()
         self.toggle_buttons = {}
         
         for genre in self.genres:
@@ -233,25 +200,23 @@ class MovieSuggestionApp(App):
         if not self._validate_input(name, selected_genre):
             return
         
-        suggested_movie = self.suggester.suggest_movie(selected_genre)
+        suggested_movie = self.suggester.suggest_movie(selected_genre, name)
         if suggested_movie:
             self._display_movie_suggestion(name, selected_genre, suggested_movie)
             self._add_to_history(name, suggested_movie)
     
     def _display_movie_suggestion(self, name, genre, movie):
         """Exibe a sugestão de filme na interface."""
-        movie_title, movie_year = movie
         self.message_label.text = (
             f"[b][color=00ff99]Olá, {name}![/color][/b]\n"
             f"Sua sugestão de filme de {genre} é:\n"
-            f"[color=ff00ff]{movie_title} ({movie_year})[/color]"
+            f"[color=ff00ff]{movie.title} ({movie.year})[/color]"
         )
     
     def _add_to_history(self, name, movie):
         """Adiciona a sugestão atual ao histórico."""
-        movie_title, movie_year = movie
         history_label = Label(
-            text=f"{name} sugeriu: {movie_title} ({movie_year})",
+            text=f"{name} sugeriu: {movie.title} ({movie.year})",
             color=(1, 1, 1, 1),
             size_hint_y=None,
             height=30
@@ -1,5 +1,5 @@
-import random
 import os
+import sys
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
@@ -9,11 +9,14 @@ from kivy.core.window import Window
 from kivy.uix.floatlayout import FloatLayout
 from kivy.graphics import Color, RoundedRectangle
 from kivy.uix.popup import Popup
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.image import Image
 from kivy.uix.togglebutton import ToggleButton
 from kivy.uix.screenmanager import ScreenManager, Screen
 
+# Catálogo compartilhado, na pasta das atividades
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from movie_suggestions import MovieCatalog, SuggestionHistory, SuggestionSampler  # noqa: E402
+from movie_suggestions.history_view import HistoryPanel, PosterFirstHistoryItem  # noqa: E402
+
 
 class Card(BoxLayout):
     def __init__(self, **kwargs):
@@ -29,56 +32,20 @@ class Card(BoxLayout):
 
 
 class FilmeSorteador:
-    def __init__(self):
-        self.filmes = {
-            "Ação": [
-                ("Mad Max: Estrada da Fúria", 2015, "mad_max.jpg"),
-                ("John Wick", 2014, "john_wick.jpg"),
-                ("Duro de Matar", 1988, "duro_de_matar.jpg"),
-                ("Os Vingadores", 2012, "vingadores.jpg"),
-                ("Gladiador", 2000, "gladiador.jpg"),
-            ],
-            "Comédia": [
-                ("Superbad", 2007, "superbad.png"),
-                ("A Morte Lhe Cai Bem", 1992, "morte_lhe_cai_bem.jpg"),
-                ("Os Caça-Fantasmas", 1984, "caca_fantasmas.jpg"),
-                ("O Diário de uma Princesa", 2001, "diario_princesa.webp"),
-                ("As Branquelas", 2004, "branquelas.jpeg"),
-            ],
-            "Drama": [
-                ("Forrest Gump", 1994, "forrest_gump.jpg"),
-                ("O Poderoso Chefão", 1972, "poderoso_chefa.jpg"),
-                ("A Lista de Schindler", 1993, "lista_schindler.jpg"),
-                ("Clube da Luta", 1999, "clube_luta.jpg"),
-                ("O Senhor dos Anéis: O Retorno do Rei", 2003, "senhor_aneis.jpg"),
-            ],
-            "Ficção Científica": [
-                ("Interestelar", 2014, "interestelar.png"),
-                ("Blade Runner 2049", 2017, "blade_runner.jpg"),
-                ("A Origem", 2010, "origem.jpg"),
-                ("Ex Machina", 2014, "ex_machina.webp"),
-                ("Matrix", 1999, "matrix.png"),
-            ],
-            "Animação": [
-                ("Toy Story", 1995, "toy_story.webp"),
-                ("Procurando Nemo", 2003, "procurando_nemo.jpg"),
-                ("O Rei Leão", 1994, "rei_leao.webp"),
-                ("Shrek", 2001, "shrek.jpg"),
-                ("Divertida Mente", 2015, "divertida_mente.webp"),
-            ]
-        }
-        self.idade_limite = {
-            "Ação": (16, 100),
-            "Comédia": (10, 100),
-            "Drama": (12, 100),
-            "Ficção Científica": (12, 100),
-            "Animação": (0, 100)
-        }
-
-    def sortear_filme(self, genero):
-        if genero in self.filmes:
-            return random.choice(self.filmes[genero])
-        return None
+    def __init__(self, semente=None):
+        self.catalogo = MovieCatalog()
+        # Sem repetir filme até esgotar o gênero (uma sacola por usuário)
+        self.sacolas = SuggestionSampler(self.catalogo, semente)
+
+    @property
+    def idade_limite(self):
+        return self.catalogo.age_limits()
+
+    def permite(self, idade, genero):
+        return self.catalogo.eligibility().allows(idade, genero)
+
+    def sortear_filme(self, genero, idade=None, usuario=""):
+        return self.sacolas.suggest(usuario, genero, idade)
 
 
 # --- Tela 1: Boas-vindas ---
@@ -114,9 +81,13 @@ class WelcomeScreen(Screen):
 
 # --- Tela 2: Teu app de sugestão completo ---
 class SuggestionScreen(Screen):
+    # Sugestões no painel; as mais antigas vão para data/historico.csv
+    history_limit = 50
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.sorteador = FilmeSorteador()
+        self.history = SuggestionHistory(self.history_limit)
         self.build_ui()
 
     def build_ui(self):
@@ -131,7 +102,7 @@ class SuggestionScreen(Screen):
 
         # Gêneros
         self.genre_buttons = BoxLayout(size_hint=(1, 0.15), spacing=10)
-        self.genres = list(self.sorteador.filmes.keys())
+        self.genres = self.sorteador.catalogo.genres()
         self.toggle_buttons = {}
         for genre in self.genres:
             btn = ToggleButton(text=genre, group='genres', size_hint=(1, 1))
@@ -152,12 +123,10 @@ class SuggestionScreen(Screen):
         self.message_label.bind(size=self.ajustar_texto)
         self.card.add_widget(self.message_label)
 
-        # Histórico com scroll
-        self.history_scroll = ScrollView(size_hint=(1, None), height=0)
-        self.history_box = BoxLayout(orientation='vertical', size_hint_y=None, spacing=10, padding=5)
-        self.history_box.bind(minimum_height=self.history_box.setter('height'))
-        self.history_scroll.add_widget(self.history_box)
-        self.card.add_widget(self.history_scroll)
+        # Histórico com scroll (linhas recicladas)
+        self.history_view = HistoryPanel(self.history, os.path.dirname(__file__),
+                                         viewclass=PosterFirstHistoryItem)
+        self.card.add_widget(self.history_view)
 
         root.add_widget(self.card)
         self.add_widget(root)
@@ -177,9 +146,11 @@ class SuggestionScreen(Screen):
         if not idade_texto.isdigit():
             self.show_popup("ERRO: Digite uma idade válida!")
             return False
-        idade = int(idade_texto)
-        min_idade, max_idade = self.sorteador.idade_limite[genero]
-        if idade < min_idade or idade > max_idade:
+        if genero is None:
+            self.show_popup("ERRO: Selecione um gênero!")
+            return False
+        if not self.sorteador.permite(int(idade_texto), genero):
+            min_idade, max_idade = self.sorteador.idade_limite[genero]
             self.show_popup(f"ERRO: Idade deve estar entre {min_idade} e {max_idade} para {genero}.")
             return False
         return True
@@ -193,19 +164,15 @@ class SuggestionScreen(Screen):
         if not self.validar_entrada(nome, idade_texto, genero):
             return
 
-        filme = self.sorteador.sortear_filme(genero)
+        filme = self.sorteador.sortear_filme(genero, int(idade_texto), nome)
         if filme:
             self.message_label.text = (
                 f"[b][color=00ff99]Olá, {nome}![/color][/b]\n"
                 f"Sua sugestão é:\n[color=ff00ff]{filme[0]} ({filme[1]})[/color]"
             )
-            img_path = os.path.join(os.path.dirname(__file__), filme[2])
-            if os.path.exists(img_path):
-                self.history_box.add_widget(Image(source=img_path, size_hint=(1,None), height=200))
-            self.history_box.add_widget(Label(text=f"{nome} sugeriu: {filme[0]} ({filme[1]})",
-                                              color=(1,1,1,1), size_hint_y=None, height=30))
-            self.history_scroll.height = min(300, self.history_box.height)
-            self.history_scroll.scroll_to(self.history_box.children[0])
+            # O histórico controla o limite: o painel só perde a primeira
+            # linha quando uma entrada vai para o log
+            self.history_view.add(nome, filme)
 
 
 # --- App principal com ScreenManager ---
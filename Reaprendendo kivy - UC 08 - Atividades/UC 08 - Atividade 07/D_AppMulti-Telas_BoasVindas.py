@@ -1,5 +1,5 @@
-import random
 import os
+import sys
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
@@ -9,11 +9,14 @@ from kivy.core.window import Window
 from kivy.uix.floatlayout import FloatLayout
 from kivy.graphics import Color, RoundedRectangle
 from kivy.uix.popup import Popup
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.image import Image
 from kivy.uix.togglebutton import ToggleButton
 from kivy.uix.screenmanager import ScreenManager, Screen
 
+# O pacote movie_suggestions fica na pasta das atividades, acima desta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from movie_suggestions import MovieCatalog, SuggestionHistory, SuggestionSampler  # noqa: E402
+from movie_suggestions.history_view import HistoryPanel, PosterFirstHistoryItem  # noqa: E402
+
 
 class RoundedCard(BoxLayout):
     """Widget personalizado com fundo arredondado estilo cartão."""
@@ -36,72 +39,27 @@ class RoundedCard(BoxLayout):
 
 
 class MovieSuggester:
-    """Classe responsável por gerenciar o catálogo de filmes e sugerir aleatoriamente."""
+    """Classe responsável por consultar o catálogo de filmes e sugerir aleatoriamente."""
     
-    def __init__(self):
-        self.movies = self._initialize_movie_catalog()
-        self.age_limits = self._initialize_age_limits()
+    def __init__(self, seed=None):
+        self.catalog = MovieCatalog()
+        self.sampler = SuggestionSampler(self.catalog, seed)
     
-    def _initialize_movie_catalog(self):
-        """Inicializa o catálogo de filmes organizado por gênero."""
-        return {
-            "Ação": [
-                ("Mad Max: Estrada da Fúria", 2015, "mad_max.jpg"),
-                ("John Wick", 2014, "john_wick.jpg"),
-                ("Duro de Matar", 1988, "duro_de_matar.jpg"),
-                ("Os Vingadores", 2012, "vingadores.jpg"),
-                ("Gladiador", 2000, "gladiador.jpg"),
-            ],
-            "Comédia": [
-                ("Superbad", 2007, "superbad.png"),
-                ("A Morte Lhe Cai Bem", 1992, "morte_lhe_cai_bem.jpg"),
-                ("Os Caça-Fantasmas", 1984, "caca_fantasmas.jpg"),
-                ("O Diário de uma Princesa", 2001, "diario_princesa.webp"),
-                ("As Branquelas", 2004, "branquelas.jpeg"),
-            ],
-            "Drama": [
-                ("Forrest Gump", 1994, "forrest_gump.jpg"),
-                ("O Poderoso Chefão", 1972, "poderoso_chefao.jpg"),
-                ("A Lista de Schindler", 1993, "lista_schindler.jpg"),
-                ("Clube da Luta", 1999, "clube_luta.jpg"),
-                ("O Senhor dos Anéis: O Retorno do Rei", 2003, "senhor_aneis.jpg"),
-            ],
-            "Ficção Científica": [
-                ("Interestelar", 2014, "interestelar.png"),
-                ("Blade Runner 2049", 2017, "blade_runner.jpg"),
-                ("A Origem", 2010, "origem.jpg"),
-                ("Ex Machina", 2014, "ex_machina.webp"),
-                ("Matrix", 1999, "matrix.png"),
-            ],
-            "Animação": [
-                ("Toy Story", 1995, "toy_story.webp"),
-                ("Procurando Nemo", 2003, "procurando_nemo.jpg"),
-                ("O Rei Leão", 1994, "rei_leao.webp"),
-                ("Shrek", 2001, "shrek.jpg"),
-                ("Divertida Mente", 2015, "divertida_mente.webp"),
-            ]
-        }
+    def genres(self):
+        """Retorna os gêneros do catálogo, na ordem do arquivo de gêneros."""
+        return self.catalog.genres()
     
-    def _initialize_age_limits(self):
-        """Define os limites de idade para cada gênero de filme."""
-        return {
-            "Ação": (16, 100),
-            "Comédia": (10, 100),
-            "Drama": (12, 100),
-            "Ficção Científica": (12, 100),
-            "Animação": (0, 100)
-        }
+    def suggest_movie(self, genre, age=None, user=""):
+        """Sugere um filme do gênero indicado para a idade, sem repetir até esgotar o gênero."""
+        return self.sampler.suggest(user, genre, age)
     
-    def suggest_movie(self, genre):
-        """Sugere aleatoriamente um filme do gênero especificado."""
-        if genre in self.movies:
-            return random.choice(self.movies[genre])
-        return None
+    def is_allowed(self, genre, age):
+        """Indica se a idade pode assistir a algum filme do gênero (índice de elegibilidade)."""
+        return self.catalog.eligibility().allows(age, genre)
     
     def get_age_limits(self, genre):
         """Retorna os limites de idade para um gênero específico."""
-        return self.age_limits.get(genre, (0, 100))
-
+        return self.catalog.age_limits().get(genre, (0, 100))
 
 class WelcomeScreen(Screen):
     """Tela de boas-vindas para coleta de dados do usuário."""
@@ -175,9 +133,13 @@ class WelcomeScreen(Screen):
 class SuggestionScreen(Screen):
     """Tela principal de sugestão de filmes."""
     
+    # Sugestões mantidas no painel de histórico; as mais antigas vão para o arquivo de log
+    history_limit = 50
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.movie_suggester = MovieSuggester()
+        self.history = SuggestionHistory(self.history_limit)
         self._setup_ui()
     
     def _setup_ui(self):
@@ -221,7 +183,7 @@ class SuggestionScreen(Screen):
     def _create_genre_buttons(self):
         """Cria os botões de seleção de gênero."""
         self.genre_buttons_layout = BoxLayout(size_hint=(1, 0.15), spacing=10)
-        self.genres = list(self.movie_suggester.movies.keys())
+        self.genres = self.movie_suggester.genres()
         self.toggle_buttons = {}
         
         for genre in self.genres:
@@ -259,17 +221,13 @@ class SuggestionScreen(Screen):
         self.card.add_widget(self.message_label)
     
     def _create_history_section(self):
-        """Cria a seção de histórico de sugestões."""
-        self.history_scroll = ScrollView(size_hint=(1, None), height=0)
-        self.history_container = BoxLayout(
-            orientation='vertical', 
-            size_hint_y=None, 
-            spacing=10, 
-            padding=5
+        """Cria a seção de histórico de sugestões (só as linhas visíveis existem como widgets)."""
+        self.history_view = HistoryPanel(
+            self.history,
+            os.path.dirname(__file__),
+            viewclass=PosterFirstHistoryItem
         )
-        self.history_container.bind(minimum_height=self.history_container.setter('height'))
-        self.history_scroll.add_widget(self.history_container)
-        self.card.add_widget(self.history_scroll)
+        self.card.add_widget(self.history_view)
     
     def _adjust_text_wrapping(self, instance, value):
         """Ajusta o quebra-texto do rótulo de mensagem."""
@@ -286,10 +244,12 @@ class SuggestionScreen(Screen):
             self._show_popup("Erro de Validação", "Digite uma idade válida!")
             return False
         
-        age = int(age_text)
-        min_age, max_age = self.movie_suggester.get_age_limits(selected_genre)
+        if selected_genre is None:
+            self._show_popup("Erro de Validação", "Selecione um gênero!")
+            return False
         
-        if age < min_age or age > max_age:
+        if not self.movie_suggester.is_allowed(selected_genre, int(age_text)):
+            min_age, max_age = self.movie_suggester.get_age_limits(selected_genre)
             self._show_popup("Restrição de Idade", 
                            f"Idade deve estar entre {min_age} e {max_age} para {selected_genre}.")
             return False
@@ -307,47 +267,21 @@ class SuggestionScreen(Screen):
         if not self._validate_input(name, age_text, selected_genre):
             return
         
-        suggested_movie = self.movie_suggester.suggest_movie(selected_genre)
+        suggested_movie = self.movie_suggester.suggest_movie(selected_genre, int(age_text), name)
         if suggested_movie:
             self._display_movie_suggestion(name, selected_genre, suggested_movie)
             self._add_to_history(name, suggested_movie)
     
     def _display_movie_suggestion(self, name, genre, movie):
         """Exibe a sugestão de filme na interface."""
-        movie_title, movie_year, _ = movie
         self.message_label.text = (
             f"[b][color=00ff99]Olá, {name}![/color][/b]\n"
-            f"Sua sugestão é:\n[color=ff00ff]{movie_title} ({movie_year})[/color]"
+            f"Sua sugestão é:\n[color=ff00ff]{movie.title} ({movie.year})[/color]"
         )
     
     def _add_to_history(self, name, movie):
-        """Adiciona a sugestão atual ao histórico."""
-        movie_title, movie_year, image_filename = movie
-        image_path = os.path.join(os.path.dirname(__file__), image_filename)
-        
-        if os.path.exists(image_path):
-            movie_image = Image(
-                source=image_path, 
-                size_hint=(1, None), 
-                height=200
-            )
-            self.history_container.add_widget(movie_image)
-        
-        history_label = Label(
-            text=f"{name} sugeriu: {movie_title} ({movie_year})",
-            color=(1, 1, 1, 1), 
-            size_hint_y=None, 
-            height=30
-        )
-        self.history_container.add_widget(history_label)
-        
-        self._update_history_display()
-    
-    def _update_history_display(self):
-        """Atualiza a exibição do histórico."""
-        self.history_scroll.height = min(300, self.history_container.height)
-        if self.history_container.children:
-            self.history_scroll.scroll_to(self.history_container.children[0])
+        """Adiciona a sugestão ao histórico; acima do limite, a mais antiga vai para o log e sai do painel."""
+        self.history_view.add(name, movie)
 
 
 class MovieSuggestionApp(App):
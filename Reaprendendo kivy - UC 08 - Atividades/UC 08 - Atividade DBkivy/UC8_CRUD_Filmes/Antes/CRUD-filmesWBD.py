@@ -6,8 +6,25 @@ from kivy.uix.popup import Popup
 from kivy.uix.label import Label
 
 # ---------- BANCO DE DADOS ----------
+_conexao = None
+
+def obter_conexao():
+    # Uma única conexão aberta durante todo o app (WAL + cache de comandos)
+    global _conexao
+    if _conexao is None:
+        _conexao = sqlite3.connect("filmes.db", cached_statements=128)
+        _conexao.execute("PRAGMA journal_mode=WAL")
+        _conexao.execute("PRAGMA synchronous=NORMAL")
+    return _conexao
+
+def fechar_conexao():
+    global _conexao
+    if _conexao is not None:
+        _conexao.close()
+        _conexao = None
+
 def criar_banco():
-    conn = sqlite3.connect("filmes.db")
+    conn = obter_conexao()
     cursor = conn.cursor()
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS filmes (
@@ -19,38 +36,33 @@ def criar_banco():
         )
     """)
     conn.commit()
-    conn.close()
 
 def adicionar_filme(titulo, genero, ano, imagem=None):
-    conn = sqlite3.connect("filmes.db")
+    conn = obter_conexao()
     cursor = conn.cursor()
     cursor.execute("INSERT INTO filmes (titulo, genero, ano, imagem) VALUES (?, ?, ?, ?)", 
                    (titulo, genero, ano, imagem))
     conn.commit()
-    conn.close()
 
 def listar_filmes():
-    conn = sqlite3.connect("filmes.db")
+    conn = obter_conexao()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM filmes")
     filmes = cursor.fetchall()
-    conn.close()
     return filmes
 
 def editar_filme(filme_id, titulo, genero, ano, imagem):
-    conn = sqlite3.connect("filmes.db")
+    conn = obter_conexao()
     cursor = conn.cursor()
     cursor.execute("UPDATE filmes SET titulo=?, genero=?, ano=?, imagem=? WHERE id=?", 
                    (titulo, genero, ano, imagem, filme_id))
     conn.commit()
-    conn.close()
 
 def deletar_filme(filme_id):
-    conn = sqlite3.connect("filmes.db")
+    conn = obter_conexao()
     cursor = conn.cursor()
     cursor.execute("DELETE FROM filmes WHERE id=?", (filme_id,))
     conn.commit()
-    conn.close()
 
 
 # ---------- TELAS ----------
@@ -148,11 +160,9 @@ class FilmeItem(BoxLayout):
         edicao_screen = app.root.get_screen("edicao")
 
         # Busca o filme pelo ID diretamente
-        conn = sqlite3.connect("filmes.db")
-        cursor = conn.cursor()
+        cursor = obter_conexao().cursor()
         cursor.execute("SELECT * FROM filmes WHERE id=?", (self.filme_id,))
         filme = cursor.fetchone()
-        conn.close()
 
         if filme:
             # filme = (id, titulo, genero, ano, imagem)
@@ -175,6 +185,9 @@ class FilmeApp(App):
         sm.add_widget(EdicaoScreen(name="edicao"))
         return sm
 
+    def on_stop(self):
+        fechar_conexao()
+
 if __name__ == "__main__":
     FilmeApp().run()
 
@@ -18,11 +18,24 @@ Architecture Patterns:
 - Observer Pattern: Property binding and event handling
 
 Advanced Features:
-- Context manager usage for database connections
+- Persistent pooled connections for database access (see database.py)
+- Queries run on background threads, results return through the Clock
+  (see db_worker.py)
+- Repeated reads answered by an in-memory cache (see movie_cache.py)
+- Query timings and slow-query log in a debug overlay, F12
+  (see instrumentation.py)
 - Parameterized queries for SQL injection prevention
 - Professional error handling with try-catch blocks
 - Dynamic UI generation based on database content
 - Image path management and validation
+- Poster thumbnails decoded off the UI thread (see thumbnails.py)
+- Movies per genre and per decade from a trigger-maintained summary
+  table, with a consistency check (StatsScreen)
+- Posters copied into a content-addressed store, deduplicated by SHA-256
+  (see poster_store.py)
+- Fast startup: each screen and its kv tree are built on first
+  navigation (LazyScreenManager), and the schema migrations run on the
+  database thread after the first frame (benchmark.py startup)
 
 Purpose: Professional database application development
 Complexity: Advanced/Professional
@@ -30,12 +43,19 @@ Concepts: SQLite, CRUD operations, ScreenManager, professional architecture
 """
 
 # Import Python standard library modules
-import sqlite3  # SQLite database interface
+import json                              # Startup timing report
+import os                                # Thumbnail cache directory
+import time                              # Export file names, startup timing
+from collections import OrderedDict      # LRU of thumbnail textures
 
 # Import Kivy framework components
 from kivy.app import App                         # Base application class
+from kivy.clock import Clock                     # Main-loop scheduling (debounce)
+from kivy.core.image import Image as CoreImage   # Texture loading for thumbnails
+from kivy.core.window import Window              # Keyboard shortcut (F12)
 from kivy.uix.screenmanager import ScreenManager, Screen  # Multi-screen navigation
-from kivy.properties import ObjectProperty, StringProperty  # Reactive properties
+from kivy.properties import (BooleanProperty, NumericProperty,  # Reactive properties
+                             ObjectProperty, StringProperty)
 from kivy.uix.popup import Popup                 # Modal dialog windows
 from kivy.uix.label import Label                 # Text display widget
 from kivy.uix.boxlayout import BoxLayout          # Linear layout container
@@ -43,256 +63,194 @@ from kivy.uix.button import Button               # Interactive button widget
 from kivy.uix.image import Image                 # Image display widget
 from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.gridlayout import GridLayout
+from kivy.uix.progressbar import ProgressBar     # Bars of the statistics screen
 from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleview import RecycleView     # Virtualized (recycled) list
 from kivy.uix.textinput import TextInput
 
-class DatabaseManager:
+# Import the application's data access layer
+from database import (DatabaseManager, MovieConflictError,  # Repository over SQLite
+                      YEAR_RANGE, parse_year, validate_movie_fields)
+from db_worker import DatabaseWorker                        # Background queries
+from instrumentation import QueryStats                      # Query timings
+from movie_cache import MovieCache                          # Cached reads
+from poster_store import PosterStore                        # Posters by content hash
+from thumbnails import ThumbnailStore                       # Background poster downscaling
+
+
+class ThumbnailCache:
     """
-    Professional Database Access Layer using Repository Pattern
-    
-    This class encapsulates all database operations following professional
-    software development practices:
-    - Separation of concerns between data access and business logic
-    - Context manager usage for proper resource management
-    - Parameterized queries for security (SQL injection prevention)
-    - Error handling with proper exception management
-    - Static methods for utility functions
-    
-    The Repository Pattern provides:
-    - Clean abstraction over data storage
-    - Easy testing with mock implementations
-    - Centralized database logic
-    - Consistent error handling
-    - Professional transaction management
-    
-    Technical Implementation:
-        - Uses SQLite for lightweight, embedded database
-        - Context managers ensure proper connection cleanup
-        - Parameterized queries prevent SQL injection attacks
-        - Static methods enable usage without instantiation
-        - Professional error handling with meaningful messages
+    Cache em memória das texturas das miniaturas de pôster.
+    
+    As miniaturas são geradas em segundo plano pelo ThumbnailStore; aqui
+    ficam apenas as texturas já carregadas, num LRU limitado pelo tamanho
+    em bytes, para que rolar a lista não acumule memória de vídeo.
+    
+    A thread da interface não acessa o disco para decidir se há textura:
+    o LRU é indexado pela origem do pôster e guarda também o arquivo da
+    miniatura de onde a textura veio. A chave do cache em disco (caminho,
+    data de modificação e tamanho, ou o hash do pôster no acervo) é
+    calculada pelos workers; para pôsteres fora do acervo, cada acerto
+    pede uma revalidação em segundo plano, e um pôster trocado no disco
+    gera uma miniatura nova que substitui a textura antiga.
     """
     
-    # Database configuration
-    DATABASE_NAME = "filmes.db"  # SQLite database file name
+    # Limite de memória das texturas (RGBA, 4 bytes por pixel)
+    MAX_BYTES = 32 * 1024 * 1024
     
-    @staticmethod
-    def create_database():
-        """
-        Initialize the database schema with proper table structure.
-        
-        Creates the movies table if it doesn't exist, ensuring the application
-        can start cleanly on first run. Uses proper SQL data types and
-        constraints for data integrity.
-        
-        Database Schema:
-            - id: Primary key with auto-increment
-            - titulo: Movie title (required)
-            - genero: Movie genre (required)
-            - ano: Release year (required integer)
-            - imagem: Image file path (optional)
-        
-        Technical Features:
-            - Uses context manager for automatic connection cleanup
-            - IF NOT EXISTS prevents errors on multiple calls
-            - Proper data types for each field
-            - Primary key auto-increment for unique IDs
-        """
-        # Use context manager for automatic connection management
-        with sqlite3.connect(DatabaseManager.DATABASE_NAME) as conn:
-            cursor = conn.cursor()
-            
-            # Create movies table with proper schema
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS filmes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,  -- Unique identifier
-                    titulo TEXT NOT NULL,                   -- Movie title (required)
-                    genero TEXT NOT NULL,                   -- Movie genre (required)
-                    ano INTEGER NOT NULL,                   -- Release year (required)
-                    imagem TEXT                             -- Image path (optional)
-                )
-            """)
-            
-            # Commit changes to database
-            conn.commit()
+    def __init__(self, store, max_bytes=MAX_BYTES):
+        self.store = store
+        self.max_bytes = max_bytes
+        self._textures = OrderedDict()  # origem -> (miniatura, textura), da menos à mais usada
+        self._bytes = 0
     
-    @staticmethod
-    def add_movie(title, genre, year, image_path=None):
+    def get(self, source, callback):
         """
-        Add a new movie to the database with proper validation.
-        
-        Inserts a new movie record using parameterized queries for security.
-        The method handles optional image paths gracefully.
+        Retorna a textura da miniatura, se já estiver carregada.
         
-        Args:
-            title (str): Movie title
-            genre (str): Movie genre
-            year (int): Release year
-            image_path (str, optional): Path to movie poster image
-        
-        Security Features:
-            - Parameterized queries prevent SQL injection
-            - Input validation through database constraints
-            - Proper error handling for constraint violations
+        Caso contrário agenda a geração e retorna None; callback(source,
+        texture) é chamado depois na thread da interface, com None se o
+        pôster não puder ser lido.
         """
-        with sqlite3.connect(DatabaseManager.DATABASE_NAME) as conn:
-            cursor = conn.cursor()
-            
-            # Use parameterized query for security
-            cursor.execute(
-                "INSERT INTO filmes (titulo, genero, ano, imagem) VALUES (?, ?, ?, ?)", 
-                (title, genre, year, image_path)
-            )
-            
-            # Commit the transaction
-            conn.commit()
+        entry = self._textures.get(source)
+        if entry is not None:
+            self._textures.move_to_end(source)
+            if not source.startswith(ThumbnailStore.CONTENT_PREFIX):
+                self._request(source, callback)  # O arquivo pode ter mudado
+            return entry[1]
+        self._request(source, callback)
+        return None
     
-    @staticmethod
-    def get_all_movies():
-        """
-        Retrieve all movies from the database.
-        
-        Returns a list of tuples containing all movie records.
-        Each tuple represents one movie with all fields.
+    def _request(self, source, callback):
+        """Pede a miniatura aos workers e a carrega quando ficar pronta."""
+        def ready(source, path):
+            Clock.schedule_once(lambda dt: self._load(source, path, callback))
         
-        Returns:
-            list: List of tuples (id, title, genre, year, image_path)
-        
-        Technical Note:
-            Uses fetchall() to retrieve all records in memory.
-            For large datasets, consider pagination with LIMIT/OFFSET.
-        """
-        with sqlite3.connect(DatabaseManager.DATABASE_NAME) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM filmes")
-            return cursor.fetchall()
+        self.store.request(source, ready)
     
-    @staticmethod
-    def get_movie_by_id(movie_id):
+    def _load(self, source, path, callback):
         """
-        Retrieve a specific movie by its unique ID.
-        
-        Args:
-            movie_id (int): Unique movie identifier
+        Cria a textura da miniatura pronta (thread da interface).
         
-        Returns:
-            tuple or None: Movie data tuple or None if not found
-        
-        Security Features:
-            - Parameterized query prevents SQL injection
-            - Returns None for non-existent records
+        Só decodifica o arquivo pequeno gerado pelo ThumbnailStore; sem
+        Pillow não há miniatura (path None) e a linha mantém o espaço
+        reservado.
         """
-        with sqlite3.connect(DatabaseManager.DATABASE_NAME) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM filmes WHERE id=?", (movie_id,))
-            return cursor.fetchone()
+        entry = self._textures.get(source)
+        if entry is not None and path and entry[0] == path:
+            callback(source, entry[1])
+            return
+        self._discard(source)  # Pôster trocado ou que deixou de existir
+        texture = None
+        if path:
+            try:
+                texture = CoreImage(path, nocache=True).texture
+            except Exception:
+                texture = None
+            if texture is not None:
+                self._add(source, path, texture)
+        callback(source, texture)
     
-    @staticmethod
-    def update_movie(movie_id, title, genre, year, image_path):
-        """
-        Update an existing movie record with new information.
-        
-        Args:
-            movie_id (int): Unique movie identifier
-            title (str): Updated movie title
-            genre (str): Updated movie genre
-            year (int): Updated release year
-            image_path (str): Updated image path
-        
-        Technical Features:
-            - Parameterized query for security
-            - Updates all fields in single operation
-            - Automatic transaction commit
-        """
-        with sqlite3.connect(DatabaseManager.DATABASE_NAME) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE filmes SET titulo=?, genero=?, ano=?, imagem=? WHERE id=?", 
-                (title, genre, year, image_path, movie_id)
-            )
-            conn.commit()
+    def _discard(self, source):
+        """Remove a textura de uma origem, se estiver no cache."""
+        entry = self._textures.pop(source, None)
+        if entry is not None:
+            self._bytes -= entry[1].width * entry[1].height * 4
     
-    @staticmethod
-    def delete_movie(movie_id):
-        """
-        Remove a movie from the database.
-        
-        Args:
-            movie_id (int): Unique movie identifier to delete
-        
-        Security Features:
-            - Parameterized query prevents SQL injection
-            - Permanent deletion with proper transaction handling
-        """
-        with sqlite3.connect(DatabaseManager.DATABASE_NAME) as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM filmes WHERE id=?", (movie_id,))
-            conn.commit()
+    def _add(self, source, path, texture):
+        """Guarda a textura e descarta as menos usadas acima do limite."""
+        self._textures[source] = (path, texture)
+        self._bytes += texture.width * texture.height * 4
+        while self._bytes > self.max_bytes and len(self._textures) > 1:
+            _, (_, oldest) = self._textures.popitem(last=False)
+            self._bytes -= oldest.width * oldest.height * 4
+    
+    def close(self):
+        """Libera as texturas e encerra os workers."""
+        self._textures.clear()
+        self._bytes = 0
+        self.store.shutdown()
+
+
+def poster_source(movie):
+    """
+    Origem do pôster de uma linha para o ThumbnailStore.
+    
+    Filmes com pôster no acervo usam "sha256:<hash>"; os mais antigos,
+    ainda não importados (manage.py posters ingest), usam o caminho salvo.
+    """
+    if movie[5]:
+        return ThumbnailStore.CONTENT_PREFIX + movie[5]
+    return movie[4] or ""
+
+
+def store_poster(image_path, callback, errback):
+    """
+    Copia o pôster para o acervo e só então chama callback(poster).
+    
+    A cópia e o hash do arquivo rodam numa thread de leitura do
+    DatabaseWorker, antes de a gravação entrar na fila: a thread de escrita
+    não segura a trava do SQLite esperando o disco. Sem imagem, callback
+    recebe None na hora. Um caminho inexistente ou que não seja imagem
+    chega ao errback como OSError ou ValueError.
+    """
+    if not image_path:
+        callback(None)
+        return
+    app = App.get_running_app()
+    app.db.read(app.posters.put, image_path, callback=callback, errback=errback)
 
 
 class MovieItem(BoxLayout):
-    """Widget personalizado para exibir cada filme na lista."""
+    """
+    Linha reciclável da lista de filmes.
+    
+    O RecycleView da ListScreen cria apenas as linhas visíveis na tela e as
+    reutiliza durante a rolagem, preenchendo as propriedades abaixo a partir
+    de cada dicionário de dados. O layout da linha fica em MovieApp.kv.
+    
+    O pôster não é decodificado aqui: a linha pede a miniatura ao
+    ThumbnailCache do aplicativo e mostra um espaço reservado até ela ficar
+    pronta.
+    
+    Na ListScreen a linha também tem uma caixa de seleção; o estado fica
+    nos dados do RecycleView (e não no widget), para sobreviver à
+    reciclagem das linhas.
+    """
     
     movie_id = StringProperty()
     title = StringProperty()
     genre = StringProperty()
     year = StringProperty()
     image_path = StringProperty()
+    thumbnail = ObjectProperty(None, allownone=True)
+    selectable = BooleanProperty(False)
+    selected = BooleanProperty(False)
     
-    def __init__(self, movie_id, title, genre, year, image_path=None, **kwargs):
-        super().__init__(**kwargs)
-        self.movie_id = str(movie_id)
-        self.title = title
-        self.genre = genre
-        self.year = str(year)
-        self.image_path = image_path or ""
-        self._setup_ui()
-    
-    def _setup_ui(self):
-        """Configura a interface do item de filme."""
-        self.orientation = "horizontal"
-        self.size_hint_y = None
-        self.height = 100
-        self.spacing = 10
-        self.padding = 5
-        
-        # Imagem do filme (se existir)
-        if self.image_path:
-            movie_image = Image(
-                source=self.image_path, 
-                size_hint_x=0.3,
-                allow_stretch=True
-            )
-            self.add_widget(movie_image)
-        
-        # Movie information label with proper text alignment
-        info_label = Label(
-            text=f"{self.title} ({self.year}) - {self.genre}",
-            size_hint_x=0.6,
-            halign="left",
-            valign="middle"
-        )
-        # Set text_size for proper alignment (avoiding linter issues)
-        def update_text_size(instance, size):
-            instance.text_size = size
-        info_label.bind(size=update_text_size)
-        self.add_widget(info_label)
-        
-        # Botão Editar
-        edit_button = Button(
-            text="Editar", 
-            size_hint_x=0.1,
-            on_release=self._edit_movie
-        )
-        self.add_widget(edit_button)
-        
-        # Botão Excluir
-        delete_button = Button(
-            text="Excluir", 
-            size_hint_x=0.1,
-            on_release=self._delete_movie
-        )
-        self.add_widget(delete_button)
+    @staticmethod
+    def row_to_data(movie, selectable=False, selected=False):
+        """Converte uma linha do banco no dicionário de dados do RecycleView."""
+        return {
+            "movie_id": str(movie[0]),
+            "title": movie[1],
+            "genre": movie[2],
+            "year": str(movie[3]),
+            "image_path": poster_source(movie),
+            "selectable": selectable,
+            "selected": selected,
+        }
+    
+    def on_image_path(self, instance, value):
+        """Troca a miniatura quando a linha é reciclada para outro filme."""
+        self.thumbnail = None
+        if value:
+            cache = App.get_running_app().thumbnails
+            self.thumbnail = cache.get(value, self._on_thumbnail_ready)
+    
+    def _on_thumbnail_ready(self, source, texture):
+        """Aplica a miniatura se a linha ainda exibir o mesmo pôster."""
+        if source == self.image_path:
+            self.thumbnail = texture
     
     def _edit_movie(self, instance):
         """Navega para a tela de edição do filme."""
@@ -302,10 +260,78 @@ class MovieItem(BoxLayout):
         app.root.current = "edit"
     
     def _delete_movie(self, instance):
-        """Exclui o filme e atualiza a lista."""
-        DatabaseManager.delete_movie(int(self.movie_id))
-        app = App.get_running_app()
-        app.root.get_screen("list").update_movie_list()
+        """Exclui o filme (a ListScreen remove a linha ao receber o evento)."""
+        App.get_running_app().db.write(DatabaseManager.delete_movie, int(self.movie_id))
+    
+    def _on_select(self, active):
+        """Marca ou desmarca o filme na seleção da ListScreen."""
+        if active == self.selected:
+            return  # Mudança vinda dos dados (reciclagem), não do usuário
+        self.selected = active
+        list_screen = App.get_running_app().root.get_screen("list")
+        list_screen.set_selected(int(self.movie_id), active)
+
+
+class BatchEditPopup(Popup):
+    """
+    Edição em lote do gênero e/ou ano dos filmes selecionados.
+    
+    Campos deixados em branco mantêm o valor atual de cada filme.
+    """
+    
+    def __init__(self, movie_ids, **kwargs):
+        super().__init__(
+            title=f"Editar {len(movie_ids)} filmes",
+            size_hint=(0.7, 0.5),
+            **kwargs
+        )
+        self.movie_ids = movie_ids
+        
+        layout = BoxLayout(orientation="vertical", spacing=10, padding=10)
+        self.genre_input = TextInput(hint_text="Novo gênero (em branco: manter)", multiline=False)
+        self.year_input = TextInput(hint_text="Novo ano (em branco: manter)",
+                                    input_filter="int", multiline=False)
+        self.message = Label(text="")
+        layout.add_widget(self.genre_input)
+        layout.add_widget(self.year_input)
+        layout.add_widget(self.message)
+        
+        buttons = BoxLayout(orientation="horizontal", spacing=10)
+        apply_button = Button(text="Aplicar")
+        apply_button.bind(on_release=lambda instance: self.apply())
+        cancel_button = Button(text="Cancelar")
+        cancel_button.bind(on_release=lambda instance: self.dismiss())
+        buttons.add_widget(apply_button)
+        buttons.add_widget(cancel_button)
+        layout.add_widget(buttons)
+        
+        self.content = layout
+    
+    def apply(self):
+        """Grava as alterações numa única transação."""
+        genre = self.genre_input.text.strip() or None
+        year = self.year_input.text.strip()
+        if genre is None and not year:
+            self.message.text = "Informe o gênero, o ano ou ambos."
+            return
+        if year and parse_year(year) is None:
+            # input_filter="int" ainda aceita "-" e números fora da faixa
+            self.message.text = (f"Ano inválido: use de {YEAR_RANGE.start} "
+                                 f"a {YEAR_RANGE.stop - 1}.")
+            return
+        
+        App.get_running_app().db.write(
+            DatabaseManager.update_movies,
+            self.movie_ids,
+            genre,
+            parse_year(year) if year else None,
+            callback=lambda count: self.dismiss(),
+            errback=self._on_apply_failed
+        )
+    
+    def _on_apply_failed(self, error):
+        """Mantém o popup aberto com o motivo (ex.: título e ano repetidos)."""
+        self.message.text = f"Nada foi alterado: {error}"
 
 
 class RegistrationScreen(Screen):
@@ -317,24 +343,40 @@ class RegistrationScreen(Screen):
     image_input = ObjectProperty(None)
     
     def save_movie(self):
-        """Salva um novo filme no banco de dados."""
+        """Salva um novo filme no banco de dados (em segundo plano)."""
         if self._validate_input():
-            DatabaseManager.add_movie(
-                self.title_input.text.strip(),
-                self.genre_input.text.strip(),
-                int(self.year_input.text),
-                self.image_input.text.strip() or None
-            )
-            self._clear_fields()
-            self._show_popup("Sucesso", "Filme salvo com sucesso!")
+            title = self.title_input.text.strip()
+            genre = self.genre_input.text.strip()
+            year = int(self.year_input.text)
+            image_path = self.image_input.text.strip() or None
+            
+            def write(poster):
+                App.get_running_app().db.write(
+                    DatabaseManager.add_movie, title, genre, year, image_path, poster,
+                    callback=self._on_movie_saved,
+                    errback=self._on_save_failed
+                )
+            
+            store_poster(image_path, write, self._on_save_failed)
         else:
             self._show_popup("Erro", "Preencha todos os campos corretamente!")
     
+    def _on_movie_saved(self, movie_id):
+        """Confirma o cadastro depois que o banco gravou o filme (só então limpa o formulário)."""
+        self._clear_fields()
+        self._show_popup("Sucesso", "Filme salvo com sucesso!")
+    
+    def _on_save_failed(self, error):
+        """Informa que o filme não pôde ser gravado; os campos ficam preenchidos para corrigir."""
+        self._show_popup("Erro", f"Não foi possível salvar o filme: {error}")
+    
     def _validate_input(self):
         """Valida os dados de entrada do usuário."""
-        return (self.title_input.text.strip() and 
-                self.genre_input.text.strip() and 
-                self.year_input.text.isdigit())
+        return validate_movie_fields(
+            self.title_input.text,
+            self.genre_input.text,
+            self.year_input.text
+        )
     
     def _clear_fields(self):
         """Limpa todos os campos de entrada."""
@@ -354,28 +396,359 @@ class RegistrationScreen(Screen):
 
 
 class ListScreen(Screen):
-    """Tela de listagem de filmes cadastrados."""
+    """
+    Tela de listagem de filmes cadastrados.
+    
+    A lista é um RecycleView: só existem widgets para as linhas visíveis,
+    e os filmes são carregados do banco página a página (paginação por
+    chave, WHERE id > ?) conforme o usuário se aproxima do fim da rolagem.
+    Abrir a tela custa uma única página, qualquer que seja o tamanho do
+    catálogo. As páginas são lidas em segundo plano pelo DatabaseWorker e
+    anexadas quando chegam; sair da tela descarta a página pendente.
+    
+    Depois da primeira carga a lista não é mais recriada: a tela assina os
+    eventos de alteração do DatabaseManager e corrige apenas as linhas
+    afetadas. Como os dados estão ordenados por id, cada linha é localizada
+    por busca binária. Uma página ainda em leitura quando chega um evento é
+    pedida de novo, para não trazer de volta linhas excluídas ou antigas.
+    
+    Filmes marcados nas caixas de seleção podem ser excluídos ou editados
+    (gênero/ano) em lote, numa única transação.
+    """
     
     movie_list = ObjectProperty(None)
+    selection_count = NumericProperty(0)
+    
+    # Filmes buscados por página
+    PAGE_SIZE = 50
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._last_id = 0          # Último id já carregado (chave da próxima página)
+        self._exhausted = False    # True quando não há mais páginas no banco
+        self._loaded = False       # True depois da primeira carga da lista
+        self._page_request = None  # Leitura de página em andamento
+        self._selected = set()     # Ids marcados para ações em lote
+        self._db = App.get_running_app().db
+        self._cache = App.get_running_app().cache
+        self._db.subscribe(self._on_movies_changed)
     
     def on_pre_enter(self, *args):
         """Executado antes da tela ser exibida."""
-        self.update_movie_list()
+        if not self._loaded:
+            self.update_movie_list()
+        else:
+            # Retoma a página que pode ter sido descartada em on_leave
+            self.on_movie_list_scroll(self.movie_list.scroll_y)
+    
+    def on_leave(self, *args):
+        """Descarta a página pendente ao sair da tela."""
+        self._cancel_page_request()
     
     def update_movie_list(self):
-        """Atualiza a lista de filmes exibida."""
-        self.movie_list.clear_widgets()
-        movies = DatabaseManager.get_all_movies()
+        """Recarrega a lista a partir da primeira página."""
+        self._cancel_page_request()
+        self._last_id = 0
+        self._exhausted = False
+        self._loaded = True
+        self.clear_selection()
+        self.movie_list.data = []
+        self.movie_list.scroll_y = 1
+        self.load_next_page()
+    
+    def load_next_page(self):
+        """Pede a próxima página de filmes ao DatabaseWorker."""
+        if self._exhausted or self._page_request is not None:
+            return
+        
+        self._page_request = self._db.read(
+            self._cache.get_movies_page, self._last_id, self.PAGE_SIZE,
+            callback=self._on_page_loaded,
+            errback=lambda error: self._cancel_page_request()
+        )
+    
+    def _on_page_loaded(self, movies):
+        """Anexa a página recebida aos dados da lista."""
+        self._page_request = None
+        if len(movies) < self.PAGE_SIZE:
+            self._exhausted = True
+        if movies:
+            self._last_id = movies[-1][0]
+            self.movie_list.data.extend(
+                MovieItem.row_to_data(movie, selectable=True) for movie in movies)
+    
+    def _cancel_page_request(self):
+        """Cancela a leitura de página em andamento, se houver."""
+        if self._page_request is not None:
+            self._page_request.cancel()
+            self._page_request = None
+    
+    def on_movie_list_scroll(self, scroll_y):
+        """Carrega mais filmes quando falta menos de uma tela para o fim."""
+        layout = self.movie_list.layout_manager
+        if self._exhausted or layout is None:
+            return
+        
+        hidden_below = scroll_y * max(layout.height - self.movie_list.height, 0)
+        if hidden_below < self.movie_list.height:
+            self.load_next_page()
+    
+    def _on_movies_changed(self, event, movie_ids):
+        """Aplica na lista apenas as alterações publicadas pelo banco."""
+        if not self._loaded:
+            return
+        
+        if self._page_request is not None:
+            # A página em andamento pode ter sido lida antes desta alteração
+            # (linhas excluídas, dados antigos ou sem os ids novos): ela é
+            # descartada e pedida de novo, agora depois do commit.
+            self._cancel_page_request()
+            self.load_next_page()
         
+        if event == DatabaseManager.MOVIES_INSERTED:
+            # Ids novos são sempre maiores que os já carregados: se a lista
+            # já chegou ao fim, basta buscar a continuação.
+            if self._exhausted:
+                self._exhausted = False
+                self.load_next_page()
+            return
+        
+        data = self.movie_list.data
+        if event == DatabaseManager.MOVIES_DELETED:
+            self._selected.difference_update(movie_ids)
+            self.selection_count = len(self._selected)
+            if len(movie_ids) == 1:
+                index = self._find_row(movie_ids[0])
+                if index is not None:
+                    del data[index]
+            else:
+                # Lote: uma única troca dos dados em vez de uma por linha
+                deleted = set(movie_ids)
+                self.movie_list.data = [row for row in data
+                                        if int(row["movie_id"]) not in deleted]
+        elif event == DatabaseManager.MOVIES_UPDATED:
+            loaded = [movie_id for movie_id in movie_ids
+                      if self._find_row(movie_id) is not None]
+            if loaded:
+                self._db.read(self._fetch_movies, loaded, callback=self._patch_rows)
+    
+    def _fetch_movies(self, movie_ids):
+        """Lê os filmes alterados (executado numa thread de leitura)."""
+        return [self._cache.get_movie_by_id(movie_id) for movie_id in movie_ids]
+    
+    def _patch_rows(self, movies):
+        """Substitui as linhas dos filmes alterados que ainda estão na lista."""
+        data = self.movie_list.data
         for movie in movies:
-            movie_item = MovieItem(
-                movie_id=movie[0],
-                title=movie[1],
-                genre=movie[2],
-                year=movie[3],
-                image_path=movie[4]
-            )
-            self.movie_list.add_widget(movie_item)
+            if movie is None:
+                continue
+            index = self._find_row(movie[0])
+            if index is not None:
+                data[index] = MovieItem.row_to_data(
+                    movie, selectable=True, selected=movie[0] in self._selected)
+    
+    def set_selected(self, movie_id, selected):
+        """Marca ou desmarca um filme para as ações em lote."""
+        if selected:
+            self._selected.add(movie_id)
+        else:
+            self._selected.discard(movie_id)
+        index = self._find_row(movie_id)
+        if index is not None:
+            # Altera o dicionário no lugar: a linha já mostra o novo estado
+            self.movie_list.data[index]["selected"] = selected
+        self.selection_count = len(self._selected)
+    
+    def clear_selection(self):
+        """Desmarca todos os filmes."""
+        data = self.movie_list.data
+        for movie_id in self._selected:
+            index = self._find_row(movie_id)
+            if index is not None:
+                data[index]["selected"] = False
+        self._selected.clear()
+        self.selection_count = 0
+        self.movie_list.refresh_from_data()
+    
+    def delete_selected(self):
+        """Exclui os filmes selecionados numa única transação."""
+        if self._selected:
+            self._db.write(DatabaseManager.delete_movies, sorted(self._selected))
+    
+    def edit_selected(self):
+        """Abre a edição em lote de gênero/ano dos filmes selecionados."""
+        if self._selected:
+            BatchEditPopup(sorted(self._selected)).open()
+    
+    def _find_row(self, movie_id):
+        """Retorna a posição do filme nos dados da lista (busca binária)."""
+        data = self.movie_list.data
+        low, high = 0, len(data)
+        while low < high:
+            middle = (low + high) // 2
+            if int(data[middle]["movie_id"]) < movie_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(data) and int(data[low]["movie_id"]) == movie_id:
+            return low
+        return None
+    
+
+
+class SearchScreen(Screen):
+    """
+    Tela de busca por título e gênero enquanto o usuário digita.
+    
+    Cada tecla reinicia um temporizador (debounce); a consulta FTS5 só é
+    disparada quando a digitação pausa e roda numa thread de leitura do
+    DatabaseWorker, para que o teclado nunca trave. Uma nova consulta
+    cancela a anterior, então respostas antigas nunca são exibidas.
+    """
+    
+    search_input = ObjectProperty(None)
+    results_list = ObjectProperty(None)
+    
+    # Pausa na digitação (segundos) antes de consultar o banco
+    DEBOUNCE_DELAY = 0.25
+    
+    # Máximo de resultados exibidos
+    MAX_RESULTS = 50
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._query = ""
+        self._search_request = None  # Consulta em andamento
+        self._search_trigger = Clock.create_trigger(self._start_search, self.DEBOUNCE_DELAY)
+        self._db = App.get_running_app().db
+        self._db.subscribe(self._on_movies_changed)
+    
+    def on_query_text(self, text):
+        """Agenda a busca para quando o usuário parar de digitar."""
+        self._query = text.strip()
+        self._search_trigger()
+    
+    def on_leave(self, *args):
+        """Descarta a busca pendente ao sair da tela."""
+        self._search_trigger.cancel()
+        self._cancel_search()
+    
+    def _start_search(self, dt):
+        """Executa a consulta fora da thread da interface."""
+        self._cancel_search()
+        if not self._query:
+            self.results_list.data = []
+            return
+        
+        self._search_request = self._db.read(
+            App.get_running_app().cache.search_movies, self._query, self.MAX_RESULTS,
+            callback=self._show_results
+        )
+    
+    def _cancel_search(self):
+        """Cancela a consulta em andamento, se houver."""
+        if self._search_request is not None:
+            self._search_request.cancel()
+            self._search_request = None
+    
+    def _show_results(self, movies):
+        """Exibe os resultados da última consulta."""
+        self._search_request = None
+        self.results_list.data = [MovieItem.row_to_data(movie) for movie in movies]
+    
+    def _on_movies_changed(self, event, movie_ids):
+        """Refaz a busca atual quando o catálogo muda."""
+        if self._query:
+            self._search_trigger()
+
+
+class StatsScreen(Screen):
+    """
+    Painel com a quantidade de filmes por gênero e por década.
+    
+    Os números vêm da tabela filmes_estatisticas, mantida por triggers a
+    cada inserção, alteração e exclusão; a leitura custa proporcional ao
+    número de pares gênero/ano, não ao de filmes. Com a tela aberta, o
+    painel se atualiza quando o catálogo muda.
+    """
+    
+    genre_grid = ObjectProperty(None)
+    decade_grid = ObjectProperty(None)
+    status_label = ObjectProperty(None)
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._request = None
+        self._refresh_trigger = Clock.create_trigger(lambda dt: self.refresh(), 0.5)
+        self._db = App.get_running_app().db
+        self._db.subscribe(self._on_movies_changed)
+    
+    @staticmethod
+    def _read_statistics():
+        """Lê as duas visões do resumo (thread de leitura)."""
+        return (DatabaseManager.get_genre_statistics(),
+                DatabaseManager.get_decade_statistics())
+    
+    def on_enter(self, *args):
+        """Atualiza o painel ao abrir a tela."""
+        self.refresh()
+    
+    def on_leave(self, *args):
+        """Descarta a leitura pendente ao sair da tela."""
+        self._refresh_trigger.cancel()
+        if self._request is not None:
+            self._request.cancel()
+            self._request = None
+    
+    def refresh(self):
+        """Lê o resumo em segundo plano."""
+        if self._request is not None:
+            self._request.cancel()
+        self._request = self._db.read(self._read_statistics, callback=self._show)
+    
+    def _on_movies_changed(self, event, movie_ids):
+        """Agrupa as mudanças do catálogo numa única releitura."""
+        if self.manager is not None and self.manager.current == self.name:
+            self._refresh_trigger()
+    
+    def _show(self, statistics):
+        """Preenche as duas tabelas com os totais lidos."""
+        self._request = None
+        genres, decades = statistics
+        self._fill(self.genre_grid, genres)
+        self._fill(self.decade_grid, [(f"{decade}s", total) for decade, total in decades])
+        total = sum(count for _, count in genres)
+        self.status_label.text = f"{total} filmes em {len(genres)} gêneros"
+    
+    @staticmethod
+    def _fill(grid, rows):
+        """Uma linha por item: nome, barra proporcional e total."""
+        grid.clear_widgets()
+        largest = max((count for _, count in rows), default=1)
+        for name, count in rows:
+            grid.add_widget(Label(text=str(name), size_hint_x=0.35))
+            grid.add_widget(ProgressBar(max=largest, value=count, size_hint_x=0.5))
+            grid.add_widget(Label(text=str(count), size_hint_x=0.15))
+    
+    def check_consistency(self):
+        """Reconta os filmes do zero e corrige o resumo se divergir."""
+        self.status_label.text = "Verificando..."
+        self._db.write(DatabaseManager.check_statistics, True,
+                       callback=self._on_checked)
+    
+    def _on_checked(self, differences):
+        """Informa o resultado da verificação."""
+        if not differences:
+            self.status_label.text = "Resumo consistente com a tabela de filmes"
+            return
+        lines = [f"{genre} ({year}): contados {counted}, registrados {recorded}"
+                 for genre, year, counted, recorded in differences[:10]]
+        Popup(
+            title=f"{len(differences)} divergência(s) corrigida(s)",
+            content=Label(text="\n".join(lines)),
+            size_hint=(0.8, 0.6)
+        ).open()
+        self.refresh()
 
 
 class EditScreen(Screen):
@@ -387,38 +760,108 @@ class EditScreen(Screen):
     image_input = ObjectProperty(None)
     
     current_movie_id = None
+    current_version = None  # Versão do filme quando foi carregado no formulário
+    current_image = None    # Imagem do filme quando foi carregado no formulário
+    _load_request = None
+    loading = BooleanProperty(False)  # Desabilita "Salvar" até o filme chegar
     
     def load_movie_data(self, movie_id):
-        """Carrega os dados do filme para edição."""
+        """Carrega os dados do filme para edição (em segundo plano)."""
         self.current_movie_id = movie_id
-        movie = DatabaseManager.get_movie_by_id(int(movie_id))
-        
+        self._cancel_load()
+        app = App.get_running_app()
+        self._load_request = app.db.read(
+            app.cache.get_movie_by_id, int(movie_id),
+            callback=self._fill_fields
+        )
+        self.loading = True
+    
+    def _fill_fields(self, movie):
+        """Preenche o formulário com o filme lido do banco."""
+        self._load_request = None
+        self.loading = False
         if movie:
+            self.current_version = movie[DatabaseManager.VERSION_COLUMN]
+            self.current_image = movie[4]
             self.title_input.text = movie[1]
             self.genre_input.text = movie[2]
             self.year_input.text = str(movie[3])
             self.image_input.text = movie[4] if movie[4] else ""
     
+    def on_leave(self, *args):
+        """Descarta a leitura pendente ao sair da tela."""
+        self._cancel_load()
+    
+    def _cancel_load(self):
+        """Cancela a leitura do filme em andamento, se houver."""
+        if self._load_request is not None:
+            self._load_request.cancel()
+            self._load_request = None
+            self.loading = False
+    
     def save_edits(self):
-        """Salva as alterações do filme editado."""
+        """
+        Salva as alterações do filme editado (em segundo plano).
+        
+        A gravação só vale se o filme ainda estiver na versão carregada no
+        formulário: se outra instância do aplicativo o alterou nesse meio
+        tempo, nada é sobrescrito e o formulário mostra a versão atual.
+        
+        Com a imagem inalterada o pôster já guardado no acervo é mantido:
+        o arquivo original não é lido de novo (pode até ter sido movido).
+        """
+        if self._load_request is not None:
+            self._show_popup("Aguarde", "O filme ainda está sendo carregado.")
+            return
         if self._validate_input() and self.current_movie_id:
-            DatabaseManager.update_movie(
-                int(self.current_movie_id),
-                self.title_input.text.strip(),
-                self.genre_input.text.strip(),
-                int(self.year_input.text),
-                self.image_input.text.strip() or None
-            )
-            self._show_popup("Sucesso", "Filme atualizado com sucesso!")
-            self._navigate_to_list()
+            movie_id = int(self.current_movie_id)
+            title = self.title_input.text.strip()
+            genre = self.genre_input.text.strip()
+            year = int(self.year_input.text)
+            image_path = self.image_input.text.strip() or None
+            version = self.current_version
+            
+            def write(poster):
+                App.get_running_app().db.write(
+                    DatabaseManager.update_movie,
+                    movie_id, title, genre, year, image_path, poster, version,
+                    callback=self._on_movie_saved,
+                    errback=self._on_save_failed
+                )
+            
+            if image_path is not None and image_path == self.current_image:
+                write(DatabaseManager.KEEP_POSTER)
+            else:
+                store_poster(image_path, write, self._on_save_failed)
         else:
             self._show_popup("Erro", "Preencha todos os campos corretamente!")
     
+    def _on_movie_saved(self, found):
+        """Confirma a gravação e volta para a lista."""
+        if found:
+            self._show_popup("Sucesso", "Filme atualizado com sucesso!")
+        else:
+            self._show_popup("Erro", "O filme foi excluído enquanto era editado.")
+        self._navigate_to_list()
+    
+    def _on_save_failed(self, error):
+        """Informa que a alteração não pôde ser gravada."""
+        if isinstance(error, MovieConflictError):
+            # O cache deste processo ainda guarda a versão antiga
+            App.get_running_app().cache.invalidate([error.current[0]])
+            self._fill_fields(error.current)
+            self._show_popup("Conflito", f"{error}.\nO formulário mostra agora a versão "
+                                         "atual; refaça a alteração e salve de novo.")
+            return
+        self._show_popup("Erro", f"Não foi possível atualizar o filme: {error}")
+    
     def _validate_input(self):
         """Valida os dados de entrada do usuário."""
-        return (self.title_input.text.strip() and 
-                self.genre_input.text.strip() and 
-                self.year_input.text.isdigit())
+        return validate_movie_fields(
+            self.title_input.text,
+            self.genre_input.text,
+            self.year_input.text
+        )
     
     def _navigate_to_list(self):
         """Navega de volta para a tela de listagem."""
@@ -434,19 +877,230 @@ class EditScreen(Screen):
         popup.open()
 
 
+class QueryStatsPopup(Popup):
+    """
+    Sobreposição de diagnóstico do banco de dados (tecla F12).
+    
+    Mostra as instruções SQL que mais consumiram tempo, com percentis de
+    latência e linhas retornadas, o tempo para obter uma conexão e as
+    consultas lentas com o plano de execução. Os números são atualizados a
+    cada segundo enquanto a janela está aberta e podem ser exportados em
+    JSON para análise.
+    """
+    
+    # Instruções exibidas (as mais caras primeiro)
+    TOP_STATEMENTS = 15
+    
+    def __init__(self, stats, export_dir, **kwargs):
+        super().__init__(title="Diagnóstico do banco (F12)", size_hint=(0.95, 0.9), **kwargs)
+        self.stats = stats
+        self.export_dir = export_dir
+        self._refresh_event = None
+        
+        layout = BoxLayout(orientation="vertical", spacing=10)
+        
+        self.report = Label(
+            font_name="RobotoMono-Regular",
+            font_size=12,
+            size_hint_y=None,
+            halign="left",
+            valign="top"
+        )
+        self.report.bind(
+            width=lambda label, width: setattr(label, "text_size", (width, None)),
+            texture_size=lambda label, size: setattr(label, "height", size[1])
+        )
+        scroll = ScrollView()
+        scroll.add_widget(self.report)
+        layout.add_widget(scroll)
+        
+        buttons = BoxLayout(orientation="horizontal", spacing=10, size_hint_y=0.1)
+        for text, action in (("Atualizar", self.refresh),
+                             ("Exportar JSON", self.export),
+                             ("Zerar", self.reset),
+                             ("Fechar", self.dismiss)):
+            button = Button(text=text)
+            button.bind(on_release=lambda instance, action=action: action())
+            buttons.add_widget(button)
+        layout.add_widget(buttons)
+        
+        self.content = layout
+    
+    def on_open(self):
+        """Começa a atualizar o relatório periodicamente."""
+        self.refresh()
+        self._refresh_event = Clock.schedule_interval(lambda dt: self.refresh(), 1)
+    
+    def on_dismiss(self):
+        """Para a atualização periódica."""
+        if self._refresh_event is not None:
+            self._refresh_event.cancel()
+            self._refresh_event = None
+    
+    def refresh(self):
+        """Reescreve o relatório com os números atuais."""
+        snapshot = self.stats.snapshot()
+        acquire = snapshot["connection_acquire"]
+        lines = [
+            f"Últimos {snapshot['seconds']:.0f}s   "
+            f"conexões: {acquire['count']} aquisições, "
+            f"p95 {acquire['p95_ms']} ms, máx {acquire['max_ms']} ms",
+            "",
+            f"{'n':>7} {'total ms':>10} {'p50':>7} {'p95':>7} {'máx':>9} {'linhas':>9}  instrução",
+        ]
+        for statement in snapshot["statements"][:self.TOP_STATEMENTS]:
+            lines.append(
+                f"{statement['count']:>7} {statement['total_ms']:>10.1f} "
+                f"{statement['p50_ms']:>7} {statement['p95_ms']:>7} "
+                f"{statement['max_ms']:>9.2f} {statement['rows']:>9}  {statement['sql'][:90]}"
+            )
+        
+        lines += ["", f"Consultas lentas (>= {snapshot['slow_ms']:.0f} ms):"]
+        for query in reversed(snapshot["slow_queries"][-20:]):
+            lines.append(f"[{query['time']}] {query['ms']:.1f} ms  {query['sql'][:100]}")
+            for step in query["plan"]:
+                lines.append(f"    plano: {step}")
+        if not snapshot["slow_queries"]:
+            lines.append("nenhuma")
+        
+        self.report.text = "\n".join(lines)
+    
+    def export(self):
+        """Grava os números em JSON na pasta de dados do aplicativo."""
+        name = time.strftime("query_stats_%Y%m%d_%H%M%S.json")
+        path = self.stats.export(os.path.join(self.export_dir, name))
+        self.title = f"Diagnóstico do banco (F12) - exportado para {path}"
+    
+    def reset(self):
+        """Zera os contadores."""
+        self.stats.reset()
+        self.refresh()
+
+
+class LazyScreenManager(ScreenManager):
+    """
+    ScreenManager que só constrói cada tela na primeira navegação.
+    
+    Instanciar uma tela aplica sua regra kv e cria toda a árvore de
+    widgets; feito para todas as telas em build(), isso atrasava o primeiro
+    quadro. Aqui as telas são registradas como fábricas (nome -> classe) e
+    get_screen(), usado pelo ScreenManager ao trocar current e pelo código
+    que prepara uma tela antes de abri-la, cria a tela na primeira vez.
+    """
+    
+    def __init__(self, factories, **kwargs):
+        self._factories = dict(factories)  # Telas ainda não construídas
+        super().__init__(**kwargs)
+    
+    def get_screen(self, name):
+        """Devolve a tela, construindo-a se for o primeiro acesso."""
+        factory = self._factories.pop(name, None)
+        if factory is not None:
+            self.add_widget(factory(name=name))
+        return super().get_screen(name)
+    
+    def has_screen(self, name):
+        """Telas registradas contam, mesmo antes de construídas."""
+        return name in self._factories or super().has_screen(name)
+
+
 class MovieApp(App):
     """Aplicativo principal de gerenciamento de filmes."""
     
+    # Pelo nome da classe o Kivy procuraria "movie.kv"; as regras estão em
+    # MovieApp.kv, ao lado deste arquivo
+    kv_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "MovieApp.kv")
+    
     def build(self):
-        """Constrói a interface do aplicativo."""
-        DatabaseManager.create_database()
+        """
+        Constrói a interface do aplicativo.
+        
+        Só o necessário para o primeiro quadro: a tela de cadastro e os
+        objetos de acesso a dados. As migrações do banco rodam na thread de
+        escrita do DatabaseWorker, e leituras e gravações pedidas antes disso
+        aguardam o banco ficar pronto.
+        """
+        self.query_stats = DatabaseManager.instrument(QueryStats())
+        self.cache = MovieCache()
+        self.db = DatabaseWorker(
+            dispatcher=lambda function: Clock.schedule_once(lambda dt: function()),
+            initializer=DatabaseManager.create_database
+        )
+        self.db.when_ready(errback=self._on_database_failed)
+        self.posters = PosterStore.for_database(DatabaseManager.DATABASE_NAME)
+        self.thumbnails = ThumbnailCache(
+            ThumbnailStore(os.path.join(self.user_data_dir, "thumbnails"),
+                           posters=self.posters)
+        )
+        
+        screen_manager = LazyScreenManager({
+            "register": RegistrationScreen,
+            "list": ListScreen,
+            "search": SearchScreen,
+            "edit": EditScreen,
+            "stats": StatsScreen,
+        })
+        screen_manager.current = "register"
         
-        screen_manager = ScreenManager()
-        screen_manager.add_widget(RegistrationScreen(name="register"))
-        screen_manager.add_widget(ListScreen(name="list"))
-        screen_manager.add_widget(EditScreen(name="edit"))
+        self._stats_popup = None
+        Window.bind(on_keyboard=self._on_keyboard)
+        
+        report = os.environ.get("MOVIEAPP_STARTUP_REPORT")
+        if report:
+            self._report_startup(report, float(os.environ["MOVIEAPP_STARTUP_T0"]))
         
         return screen_manager
+    
+    def _on_database_failed(self, error):
+        """O banco não pôde ser aberto ou migrado."""
+        Popup(
+            title="Erro",
+            content=Label(text=f"Não foi possível abrir o banco de dados:\n{error}"),
+            size_hint=(0.8, 0.4)
+        ).open()
+    
+    def _report_startup(self, path, started):
+        """
+        Mede o tempo até o primeiro quadro e até o banco ficar pronto.
+        
+        Usado por benchmark.py startup: started é o time.time() de quando o
+        processo foi lançado. Com as duas medidas, grava o JSON e fecha.
+        """
+        times = {}
+        
+        def record(name):
+            times.setdefault(name, round((time.time() - started) * 1000, 1))
+            if len(times) == 2:
+                with open(path, "w", encoding="utf-8") as file:
+                    json.dump(times, file)
+                self.stop()
+        
+        def on_flip(window):
+            Window.unbind(on_flip=on_flip)
+            record("first_frame_ms")
+        
+        Window.bind(on_flip=on_flip)
+        self.db.when_ready(callback=lambda result: record("database_ready_ms"),
+                           errback=lambda error: record("database_ready_ms"))
+    
+    def _on_keyboard(self, window, key, *args):
+        """F12 abre ou fecha o diagnóstico do banco de dados."""
+        if key != 293:  # F12
+            return False
+        if self._stats_popup is None:
+            self._stats_popup = QueryStatsPopup(self.query_stats, self.user_data_dir)
+        if self._stats_popup.parent:
+            self._stats_popup.dismiss()
+        else:
+            self._stats_popup.open()
+        return True
+    
+    def on_stop(self):
+        """Grava as escritas pendentes e fecha o banco e o cache de miniaturas."""
+        self.thumbnails.close()
+        self.db.close()
+        self.cache.close()
+        DatabaseManager.close()
 
 
 if __name__ == "__main__":
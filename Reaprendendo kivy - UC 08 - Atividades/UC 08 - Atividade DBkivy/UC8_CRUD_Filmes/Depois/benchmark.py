@@ -0,0 +1,616 @@
+"""
+Benchmarks for the movie database layer.
+
+Each scenario builds its own temporary database, so running the benchmarks
+never touches the application's filmes.db. Kivy is only required by the
+startup scenario, which launches the application itself.
+
+Usage:
+    python benchmark.py connections [--rows 100000] [--ops 2000]
+    python benchmark.py queries [--rows 100000] [--ops 200]
+    python benchmark.py worker [--ops 2000]
+    python benchmark.py cache [--rows 100000] [--ops 20000] [--max-mb 8]
+    python benchmark.py repositories [--sizes 10000 100000 1000000] [--ops 2000]
+    python benchmark.py batch [--rows 50000] [--ops 10000]
+    python benchmark.py stats [--rows 200000] [--ops 200]
+    python benchmark.py sync [--sizes 10000 100000] [--changes 10 100 1000]
+    python benchmark.py startup [--sizes 0 100000] [--runs 5]
+    python benchmark.py versions [--writers 4] [--ops 500] [--hot 10]
+"""
+
+# Import Python standard library modules
+import argparse         # Command line parsing
+import importlib.util   # Is Kivy installed (startup scenario)
+import json             # Startup timings written by the application
+import multiprocessing  # Concurrent writers on one database file
+import os               # File path operations
+import random           # Random movie ids for the workloads
+import shutil           # Fresh copy of the startup database for each run
+import sqlite3          # Baseline (connect-per-call) implementation
+import statistics       # Median of the startup runs
+import subprocess       # Launching the application
+import sys              # Interpreter running the application
+import tempfile         # Throwaway benchmark databases
+import time             # High resolution timers
+
+import sync
+from database import DatabaseManager, MovieConflictError
+from db_worker import DatabaseWorker
+from movie_cache import MovieCache
+from repositories import (AppendOnlyMovieRepository, InMemoryMovieRepository,
+                          SQLiteMovieRepository)
+
+GENRES = ["Ação", "Comédia", "Drama", "Ficção Científica", "Animação"]
+
+
+def check(condition, message):
+    """
+    Stop the benchmark with exit status 1 when a correctness check fails.
+
+    Plain assert statements are removed by python -O, which would let a
+    benchmark report timings for a broken query plan or summary table.
+    """
+    if not condition:
+        raise SystemExit(f"check failed: {message}")
+
+
+def movie_queries():
+    """
+    MovieQuery filters the screens use, by name.
+
+    Shared with test_database.py, which asserts that none of them scans
+    the whole filmes table.
+    """
+    return {
+        "genre": lambda: DatabaseManager.query().genre("Drama").limit(50),
+        "genre+years": lambda: DatabaseManager.query().genre("Drama")
+            .year_between(1990, 1999).order_by("ano").limit(50),
+        "years": lambda: DatabaseManager.query().year_between(2000, 2005).limit(50),
+        "title prefix": lambda: DatabaseManager.query().title_prefix("filme 99")
+            .order_by("titulo").limit(50),
+        "all filters": lambda: DatabaseManager.query().genre("Ação")
+            .year_between(1960, 2020).title_prefix("FILME 1").limit(50),
+        "sorted page": lambda: DatabaseManager.query().order_by("titulo").limit(50),
+    }
+
+
+def populate(path, rows):
+    """Create a filmes table at path with the given number of rows."""
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE filmes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            titulo TEXT NOT NULL,
+            genero TEXT NOT NULL,
+            ano INTEGER NOT NULL,
+            imagem TEXT
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO filmes (titulo, genero, ano, imagem) VALUES (?, ?, ?, ?)",
+        ((f"Filme {i}", GENRES[i % len(GENRES)], 1950 + i % 75, None)
+         for i in range(rows))
+    )
+    conn.commit()
+    conn.close()
+
+
+def measure(operation, ops):
+    """Run operation(i) ops times and return operations per second."""
+    start = time.perf_counter()
+    for i in range(ops):
+        operation(i)
+    return ops / (time.perf_counter() - start)
+
+
+def report(title, results):
+    """Print a table of ops/sec for the before and after implementations."""
+    print(f"\n{title}")
+    print(f"{'operation':<12}{'before':>14}{'after':>14}{'speedup':>10}")
+    for name, before, after in results:
+        print(f"{name:<12}{before:>14,.0f}{after:>14,.0f}{after / before:>9.1f}x")
+
+
+def bench_connections(args):
+    """Compare connect-per-call access with the pooled DatabaseManager."""
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.db")
+        pooled_path = os.path.join(tmp, "pooled.db")
+        populate(legacy_path, args.rows)
+        populate(pooled_path, args.rows)
+        ids = [random.randint(1, args.rows) for _ in range(args.ops)]
+
+        # Baseline: the previous implementation opened a connection per call
+        def legacy_get(i):
+            with sqlite3.connect(legacy_path) as conn:
+                conn.execute("SELECT * FROM filmes WHERE id=?", (ids[i],)).fetchone()
+            conn.close()
+
+        def legacy_update(i):
+            with sqlite3.connect(legacy_path) as conn:
+                conn.execute(
+                    "UPDATE filmes SET titulo=?, genero=?, ano=?, imagem=? WHERE id=?",
+                    (f"Editado {i}", "Drama", 2000, None, ids[i])
+                )
+                conn.commit()
+            conn.close()
+
+        def legacy_insert(i):
+            with sqlite3.connect(legacy_path) as conn:
+                conn.execute(
+                    "INSERT INTO filmes (titulo, genero, ano, imagem) VALUES (?, ?, ?, ?)",
+                    (f"Novo {i}", "Drama", 2000, None)
+                )
+                conn.commit()
+            conn.close()
+
+        DatabaseManager.use_database(pooled_path)
+        try:
+            DatabaseManager.create_database()  # Migrate the legacy table
+            results = [
+                ("get_by_id",
+                 measure(legacy_get, args.ops),
+                 measure(lambda i: DatabaseManager.get_movie_by_id(ids[i]), args.ops)),
+                ("update",
+                 measure(legacy_update, args.ops),
+                 measure(lambda i: DatabaseManager.update_movie(
+                     ids[i], f"Editado {i}", "Drama", 2000, None), args.ops)),
+                ("insert",
+                 measure(legacy_insert, args.ops),
+                 measure(lambda i: DatabaseManager.add_movie(
+                     f"Novo {i}", "Drama", 2000), args.ops)),
+            ]
+        finally:
+            DatabaseManager.close()
+
+    report(f"Connection layer, {args.rows:,} rows, {args.ops:,} ops each (ops/sec)", results)
+
+
+def bench_queries(args):
+    """Check that MovieQuery filters never fall back to a full table scan."""
+    with tempfile.TemporaryDirectory() as tmp:
+        DatabaseManager.use_database(os.path.join(tmp, "queries.db"))
+        try:
+            DatabaseManager.create_database()
+            DatabaseManager.import_movies(
+                (f"Filme {i}", GENRES[i % len(GENRES)], 1950 + i % 75, None)
+                for i in range(args.rows)
+            )
+
+            queries = movie_queries()
+
+            print(f"\nMovieQuery plans, {args.rows:,} rows")
+            print(f"{'query':<14}{'ms/query':>10}  plan")
+            for name, build in queries.items():
+                query = build()
+                plan = query.explain()
+                check(not query.uses_full_scan(), f"{name}: full scan {plan}")
+                start = time.perf_counter()
+                for _ in range(args.ops):
+                    query.fetch()
+                elapsed = (time.perf_counter() - start) / args.ops * 1000
+                print(f"{name:<14}{elapsed:>10.3f}  {'; '.join(plan)}")
+        finally:
+            DatabaseManager.close()
+
+
+def bench_worker(args):
+    """Compare one transaction per save with the coalescing DatabaseWorker."""
+    with tempfile.TemporaryDirectory() as tmp:
+        DatabaseManager.use_database(os.path.join(tmp, "worker.db"))
+        try:
+            DatabaseManager.create_database()
+
+            def direct():
+                for i in range(args.ops):
+                    DatabaseManager.add_movie(f"Direto {i}", "Drama", 2000)
+
+            def queued():
+                worker = DatabaseWorker()
+                futures = [worker.write(DatabaseManager.add_movie, f"Fila {i}", "Drama", 2000)
+                           for i in range(args.ops)]
+                for future in futures:
+                    future.result()
+                worker.close()
+
+            results = [("add_movie",
+                        measure(lambda i: direct(), 1) * args.ops,
+                        measure(lambda i: queued(), 1) * args.ops)]
+        finally:
+            DatabaseManager.close()
+
+    report(f"Burst of {args.ops:,} saves, synchronous vs DatabaseWorker (saves/sec)", results)
+
+
+def bench_cache(args):
+    """Compare direct reads with MovieCache on a skewed read/write workload."""
+    with tempfile.TemporaryDirectory() as tmp:
+        DatabaseManager.use_database(os.path.join(tmp, "cache.db"))
+        cache = MovieCache(max_bytes=args.max_mb * 1024 * 1024)
+        try:
+            DatabaseManager.create_database()
+            DatabaseManager.import_movies(
+                (f"Filme {i}", GENRES[i % len(GENRES)], 1950 + i % 75, None)
+                for i in range(args.rows)
+            )
+            # Most visits hit the first pages and a few popular movies
+            ids = [min(int(random.paretovariate(1.2)), args.rows) for _ in range(args.ops)]
+            pages = [(min(int(random.paretovariate(1.5)), 100) - 1) * 50
+                     for _ in range(args.ops)]
+
+            def workload(source):
+                def operation(i):
+                    if i % 100 == 99:
+                        DatabaseManager.update_movie(ids[i], f"Editado {i}", "Drama", 2000, None)
+                    elif i % 2:
+                        source.get_movie_by_id(ids[i])
+                    else:
+                        source.get_movies_page(pages[i], 50)
+                return operation
+
+            results = [("mixed",
+                        measure(workload(DatabaseManager), args.ops),
+                        measure(workload(cache), args.ops))]
+        finally:
+            cache.close()
+            DatabaseManager.close()
+
+    report(f"Reads through MovieCache, {args.rows:,} rows, 1% writes (ops/sec)", results)
+    stats = cache.stats()
+    print(f"hit rate {stats['hit_rate']:.1%}, {stats['evictions']:,} evictions, "
+          f"{stats['invalidations']:,} invalidations")
+
+
+def bench_repositories(args):
+    """Run the same CRUD workload against every MovieRepository backend."""
+    backends = {
+        "sqlite": lambda tmp: SQLiteMovieRepository(os.path.join(tmp, "repo.db")),
+        "memory": lambda tmp: InMemoryMovieRepository(),
+        "append-only": lambda tmp: AppendOnlyMovieRepository(os.path.join(tmp, "repo.jsonl")),
+    }
+    columns = ("bulk insert", "add", "get", "update", "delete", "list")
+
+    print(f"\nMovieRepository backends, {args.ops:,} ops each "
+          "(ops/sec; bulk insert and list in rows/sec)")
+    print(f"{'backend':<13}{'rows':>10}" + "".join(f"{name:>13}" for name in columns))
+    for rows in args.sizes:
+        ids = [random.randint(1, rows) for _ in range(args.ops)]
+        for name, create in backends.items():
+            with tempfile.TemporaryDirectory() as tmp:
+                repository = create(tmp)
+                try:
+                    start = time.perf_counter()
+                    repository.add_many(
+                        (f"Filme {i}", GENRES[i % len(GENRES)], 1950 + i % 75, None)
+                        for i in range(rows))
+                    bulk = rows / (time.perf_counter() - start)
+
+                    add = measure(lambda i: repository.add(f"Novo {i}", "Drama", 2000), args.ops)
+                    get = measure(lambda i: repository.get(ids[i]), args.ops)
+                    update = measure(lambda i: repository.update(
+                        ids[i], f"Editado {i}", "Drama", 2000, None), args.ops)
+                    delete = measure(lambda i: repository.delete(ids[i]), args.ops)
+
+                    start, listed, page = time.perf_counter(), 0, [(0,)]
+                    while page:
+                        page = repository.list(page[-1][0], 1_000)
+                        listed += len(page)
+                    listing = listed / (time.perf_counter() - start)
+                finally:
+                    repository.close()
+
+            results = (bulk, add, get, update, delete, listing)
+            print(f"{name:<13}{rows:>10,}" + "".join(f"{value:>13,.0f}" for value in results))
+
+
+def bench_batch(args):
+    """Compare one transaction per movie with the batch delete and edit."""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {name: os.path.join(tmp, f"{name}.db") for name in ("single", "batch")}
+        ids = random.sample(range(1, args.rows + 1), args.ops)
+        timings = {}
+        for name, path in paths.items():
+            DatabaseManager.use_database(path)
+            try:
+                DatabaseManager.create_database()
+                DatabaseManager.import_movies(
+                    (f"Filme {i}", GENRES[i % len(GENRES)], 1950 + i % 75, None)
+                    for i in range(args.rows)
+                )
+                start = time.perf_counter()
+                if name == "single":
+                    for movie_id in ids:
+                        movie = DatabaseManager.get_movie_by_id(movie_id)
+                        DatabaseManager.update_movie(movie_id, movie[1], "Drama", 2000, movie[4])
+                else:
+                    DatabaseManager.update_movies(ids, "Drama", 2000)
+                edit = time.perf_counter() - start
+
+                start = time.perf_counter()
+                if name == "single":
+                    for movie_id in ids:
+                        DatabaseManager.delete_movie(movie_id)
+                else:
+                    DatabaseManager.delete_movies(ids)
+                timings[name] = (edit, time.perf_counter() - start)
+            finally:
+                DatabaseManager.close()
+
+    results = [(operation, args.ops / timings["single"][index], args.ops / timings["batch"][index])
+               for index, operation in enumerate(("edit", "delete"))]
+    report(f"{args.ops:,} of {args.rows:,} movies, one transaction each vs one batch (movies/sec)",
+           results)
+
+
+def bench_stats(args):
+    """Compare GROUP BY over filmes with the trigger-maintained summary."""
+    with tempfile.TemporaryDirectory() as tmp:
+        DatabaseManager.use_database(os.path.join(tmp, "stats.db"))
+        try:
+            DatabaseManager.create_database()
+            DatabaseManager.import_movies(
+                (f"Filme {i}", GENRES[i % len(GENRES)], 1950 + i % 75, None)
+                for i in range(args.rows)
+            )
+            conn = DatabaseManager.get_pool().connection()
+            scan_genres = lambda i: conn.execute(
+                "SELECT genero, COUNT(*) FROM filmes GROUP BY genero").fetchall()
+            scan_decades = lambda i: conn.execute(
+                "SELECT ano - ano % 10, COUNT(*) FROM filmes GROUP BY 1").fetchall()
+            check(sorted(scan_genres(0)) == sorted(DatabaseManager.get_genre_statistics()),
+                  "genre summary differs from GROUP BY")
+
+            results = [
+                ("per genre", measure(scan_genres, args.ops),
+                 measure(lambda i: DatabaseManager.get_genre_statistics(), args.ops)),
+                ("per decade", measure(scan_decades, args.ops),
+                 measure(lambda i: DatabaseManager.get_decade_statistics(), args.ops)),
+            ]
+            report(f"Catalog statistics, {args.rows:,} rows, {args.ops:,} reads each "
+                   f"(GROUP BY scan vs summary table, reads/sec)", results)
+
+            # Mixed writes, single and batched, must leave the summary exact
+            ids = random.sample(range(1, args.rows + 1), 2_000)
+            for movie_id in ids[:500]:
+                DatabaseManager.update_movie(movie_id, f"Editado {movie_id}", random.choice(GENRES),
+                                             random.randint(1900, 2030), None)
+            DatabaseManager.update_movies(ids[500:1000], genre="Documentário")
+            DatabaseManager.update_movies(ids[1000:1500], year=1899)
+            DatabaseManager.delete_movies(ids[1500:])
+            for i in range(500):
+                DatabaseManager.add_movie(f"Novo {i}", "Terror", 2024)
+            differences = DatabaseManager.check_statistics()
+            check(not differences, f"summary differences {differences[:5]}")
+            print("consistency check after 3,000 mixed writes: ok")
+        finally:
+            DatabaseManager.close()
+
+
+def bench_sync(args):
+    """Show that an incremental sync costs per change, not per movie."""
+    print("\nIncremental sync after the initial copy (ms)")
+    print(f"{'rows':>10}{'initial':>12}" + "".join(f"{f'{n} changes':>15}" for n in args.changes))
+    for rows in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            peer = os.path.join(tmp, "peer.db")
+            DatabaseManager.use_database(peer)
+            DatabaseManager.create_database()
+            DatabaseManager.close()
+            DatabaseManager.use_database(os.path.join(tmp, "local.db"))
+            try:
+                DatabaseManager.create_database()
+                DatabaseManager.import_movies(
+                    (f"Filme {i}", GENRES[i % len(GENRES)], 1950 + i % 75, None)
+                    for i in range(rows)
+                )
+                pool = DatabaseManager.get_pool()
+                start = time.perf_counter()
+                sync.sync(pool, peer)
+                timings = [(time.perf_counter() - start) * 1000]
+
+                # Each round edits and deletes movies not touched before
+                untouched = random.sample(range(1, rows + 1), min(rows, sum(args.changes)))
+                for changes in args.changes:
+                    ids, untouched = untouched[:changes], untouched[changes:]
+                    DatabaseManager.update_movies(ids[:changes // 2], genre="Drama")
+                    DatabaseManager.delete_movies(ids[changes // 2:])
+                    start = time.perf_counter()
+                    pulled, pushed = sync.sync(pool, peer)
+                    timings.append((time.perf_counter() - start) * 1000)
+                    check(pushed.applied == changes, f"pushed {pushed}, expected {changes}")
+            finally:
+                DatabaseManager.close()
+        print(f"{rows:>10,}" + "".join(f"{value:>12.1f}" if index == 0 else f"{value:>15.1f}"
+                                      for index, value in enumerate(timings)))
+
+
+def edit_counters(path, hot, ops, versioned, results):
+    """
+    One writer process of bench_versions.
+
+    Each edit reads a movie and saves it with its year plus one, the way
+    EditScreen reads a row and saves the form. With versioned=True a
+    conflicting save is retried on a fresh read.
+    """
+    DatabaseManager.use_database(path)
+    conflicts = 0
+    start = time.perf_counter()
+    for _ in range(ops):
+        movie_id = random.randint(1, hot)
+        while True:
+            movie = DatabaseManager.get_movie_by_id(movie_id)
+            version = movie[DatabaseManager.VERSION_COLUMN] if versioned else None
+            try:
+                DatabaseManager.update_movie(movie_id, movie[1], movie[2], movie[3] + 1,
+                                             movie[4], version=version)
+                break
+            except MovieConflictError:
+                conflicts += 1
+    results.put((time.perf_counter() - start, conflicts))
+    DatabaseManager.close()
+
+
+def bench_versions(args):
+    """
+    Read-modify-write from several processes on one filmes.db.
+
+    Without a version every process overwrites the others and increments
+    are lost; with "WHERE id=? AND versao=?" every edit lands (after
+    retries) and the throughput shows what the check costs.
+    """
+    print(f"\n{args.writers} processes x {args.ops:,} edits of {args.hot} movies "
+          f"on one file")
+    print(f"{'mode':<12}{'edits/sec':>12}{'conflicts':>12}{'lost':>8}")
+    for versioned in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "filmes.db")
+            DatabaseManager.use_database(path)
+            DatabaseManager.create_database()
+            DatabaseManager.import_movies((f"Contador {i}", "Drama", 1000, None)
+                                          for i in range(args.hot))
+            DatabaseManager.close()
+
+            results = multiprocessing.Queue()
+            writers = [multiprocessing.Process(target=edit_counters,
+                                               args=(path, args.hot, args.ops, versioned, results))
+                       for _ in range(args.writers)]
+            for writer in writers:
+                writer.start()
+            outcomes = [results.get() for _ in writers]
+            for writer in writers:
+                writer.join()
+
+            DatabaseManager.use_database(path)
+            counted = sum(movie[3] - 1000 for movie in DatabaseManager.get_all_movies())
+            DatabaseManager.close()
+        edits = args.writers * args.ops
+        seconds = max(elapsed for elapsed, _ in outcomes)
+        print(f"{'versao' if versioned else 'blind':<12}{edits / seconds:>12,.0f}"
+              f"{sum(conflicts for _, conflicts in outcomes):>12,}{edits - counted:>8,}")
+
+
+def launch_app(database, report):
+    """
+    Start the Kivy application on database and wait until it exits.
+
+    The application writes its timings to report and stops by itself
+    (MovieApp._report_startup).
+
+    Returns:
+        dict: first_frame_ms and database_ready_ms since the launch
+    """
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "CRUD-filmesWBD.py")
+    env = dict(os.environ, KIVY_NO_ARGS="1", KIVY_NO_CONSOLELOG="1",
+               MOVIEAPP_STARTUP_REPORT=report, MOVIEAPP_STARTUP_T0=repr(time.time()))
+    # The application opens filmes.db in its working directory
+    subprocess.run([sys.executable, script], cwd=os.path.dirname(database),
+                   env=env, check=True, timeout=300)
+    with open(report, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def bench_startup(args):
+    """
+    Time to first frame of the application, and until its database is ready.
+
+    "legacy" starts from a file with the original filmes table, so every
+    migration runs during startup; "current" is an already migrated file.
+    Migrations run on the database thread, so they should move the
+    database column, not the first frame.
+    """
+    if importlib.util.find_spec("kivy") is None:
+        print("The startup scenario needs Kivy installed")
+        return
+
+    print(f"\nApplication startup, median of {args.runs} runs (ms since launch)")
+    print(f"{'rows':>10}{'database':>10}{'first frame':>14}{'db ready':>12}")
+    for rows in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy = os.path.join(tmp, "legacy.db")
+            populate(legacy, rows)
+            database = os.path.join(tmp, "filmes.db")
+            report = os.path.join(tmp, "startup.json")
+            for state in ("legacy", "current"):
+                timings = []
+                for _ in range(args.runs):
+                    if state == "legacy":
+                        shutil.copyfile(legacy, database)
+                    timings.append(launch_app(database, report))
+                print(f"{rows:>10,}{state:>10}"
+                      f"{statistics.median(t['first_frame_ms'] for t in timings):>14.1f}"
+                      f"{statistics.median(t['database_ready_ms'] for t in timings):>12.1f}")
+
+
+def main():
+    """Parse the command line and run the selected benchmark."""
+    parser = argparse.ArgumentParser(description="Movie database benchmarks")
+    subparsers = parser.add_subparsers(dest="scenario", required=True)
+
+    connections = subparsers.add_parser(
+        "connections", help="connect-per-call vs pooled connections")
+    connections.add_argument("--rows", type=int, default=100_000)
+    connections.add_argument("--ops", type=int, default=2_000)
+    connections.set_defaults(func=bench_connections)
+
+    queries = subparsers.add_parser(
+        "queries", help="MovieQuery latency and EXPLAIN QUERY PLAN checks")
+    queries.add_argument("--rows", type=int, default=100_000)
+    queries.add_argument("--ops", type=int, default=200)
+    queries.set_defaults(func=bench_queries)
+
+    worker = subparsers.add_parser(
+        "worker", help="synchronous saves vs coalesced background writes")
+    worker.add_argument("--ops", type=int, default=2_000)
+    worker.set_defaults(func=bench_worker)
+
+    cache = subparsers.add_parser(
+        "cache", help="direct reads vs MovieCache, with hit/miss counters")
+    cache.add_argument("--rows", type=int, default=100_000)
+    cache.add_argument("--ops", type=int, default=20_000)
+    cache.add_argument("--max-mb", type=int, default=8)
+    cache.set_defaults(func=bench_cache)
+
+    repositories = subparsers.add_parser(
+        "repositories", help="CRUD throughput of each MovieRepository backend")
+    repositories.add_argument("--sizes", type=int, nargs="+",
+                              default=[10_000, 100_000, 1_000_000])
+    repositories.add_argument("--ops", type=int, default=2_000)
+    repositories.set_defaults(func=bench_repositories)
+
+    batch = subparsers.add_parser(
+        "batch", help="one-row edit/delete vs executemany batches")
+    batch.add_argument("--rows", type=int, default=50_000)
+    batch.add_argument("--ops", type=int, default=10_000)
+    batch.set_defaults(func=bench_batch)
+
+    stats = subparsers.add_parser(
+        "stats", help="GROUP BY scans vs the trigger-maintained summary table")
+    stats.add_argument("--rows", type=int, default=200_000)
+    stats.add_argument("--ops", type=int, default=200)
+    stats.set_defaults(func=bench_stats)
+
+    syncing = subparsers.add_parser(
+        "sync", help="incremental sync time by catalog size and number of changes")
+    syncing.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    syncing.add_argument("--changes", type=int, nargs="+", default=[10, 100, 1_000])
+    syncing.set_defaults(func=bench_sync)
+
+    startup = subparsers.add_parser(
+        "startup", help="application time to first frame and to database ready")
+    startup.add_argument("--sizes", type=int, nargs="+", default=[0, 100_000])
+    startup.add_argument("--runs", type=int, default=5)
+    startup.set_defaults(func=bench_startup)
+
+    versions = subparsers.add_parser(
+        "versions", help="concurrent read-modify-write with and without row versions")
+    versions.add_argument("--writers", type=int, default=4)
+    versions.add_argument("--ops", type=int, default=500)
+    versions.add_argument("--hot", type=int, default=10)
+    versions.set_defaults(func=bench_versions)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
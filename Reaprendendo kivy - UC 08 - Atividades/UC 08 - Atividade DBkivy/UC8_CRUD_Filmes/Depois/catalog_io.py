@@ -0,0 +1,200 @@
+"""
+Streaming Import and Export of the Movie Catalog
+
+Reads and writes the filmes table as CSV or JSON Lines without loading the
+whole file or the whole table in memory:
+- Import parses the file lazily, validates each row with the same rule used
+  by the screens (validate_movie_fields) and hands the valid rows to
+  DatabaseManager.import_movies(), which writes them with executemany in
+  chunked transactions
+- Export streams rows from DatabaseManager.iter_movies() straight to disk
+
+Both formats use the database column names: titulo, genero, ano, imagem.
+The module does not import Kivy; manage.py exposes it on the command line.
+"""
+
+# Import Python standard library modules
+import csv   # CSV reader/writer
+import json  # JSON Lines encoding
+import os    # File extension detection
+
+from database import DatabaseManager, parse_year, validate_movie_fields
+
+# Column order used by both formats
+FIELDS = ("titulo", "genero", "ano", "imagem")
+
+# File extensions recognised for each format
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+class ImportResult:
+    """
+    Summary of a bulk import.
+
+    Attributes:
+        imported (int): Rows written to the database
+        valid (int): Rows that passed validation
+        rejected (int): Rows that failed validation or parsing
+        rejected_lines (list): First line numbers that were rejected
+    """
+
+    # How many rejected line numbers are kept for the report
+    MAX_REJECTED_LINES = 20
+
+    def __init__(self):
+        self.imported = 0
+        self.valid = 0
+        self.rejected = 0
+        self.rejected_lines = []
+
+    def reject(self, line_number):
+        """Record a rejected line without growing memory unboundedly."""
+        self.rejected += 1
+        if len(self.rejected_lines) < self.MAX_REJECTED_LINES:
+            self.rejected_lines.append(line_number)
+
+    @property
+    def duplicates(self):
+        """Valid rows skipped because the movie (normalized title and year) exists."""
+        return self.valid - self.imported
+
+
+def detect_format(path, fmt=None):
+    """
+    Resolve the file format from an explicit name or the file extension.
+
+    Args:
+        path (str): File path
+        fmt (str, optional): "csv" or "jsonl"; overrides the extension
+
+    Returns:
+        str: "csv" or "jsonl"
+
+    Raises:
+        ValueError: If the format cannot be determined
+    """
+    if fmt:
+        if fmt not in FORMATS.values():
+            raise ValueError(f"Formato desconhecido: {fmt}")
+        return fmt
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Não foi possível detectar o formato de {path}")
+    return FORMATS[extension]
+
+
+def _read_records(file, fmt):
+    """
+    Yield (line_number, record) pairs from the source file.
+
+    Each record is a (titulo, genero, ano, imagem) tuple, or None when the
+    line cannot be parsed. CSV rows are mapped through the header once
+    instead of building a dict per row, which dominates import time on
+    large files.
+    """
+    if fmt == "csv":
+        reader = csv.reader(file)
+        header = next(reader, [])
+        missing = [field for field in FIELDS[:3] if field not in header]
+        if missing:
+            raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(missing)}")
+
+        title_column, genre_column, year_column = (header.index(field) for field in FIELDS[:3])
+        image_column = header.index("imagem") if "imagem" in header else None
+        for row in reader:
+            try:
+                record = (
+                    row[title_column],
+                    row[genre_column],
+                    row[year_column],
+                    row[image_column] if image_column is not None else None,
+                )
+            except IndexError:
+                record = None
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        if isinstance(record, dict):
+            yield line_number, tuple(record.get(field) for field in FIELDS)
+        else:
+            yield line_number, None
+
+
+def _valid_movies(records, result):
+    """Filter records through validate_movie_fields and convert them to rows."""
+    for line_number, record in records:
+        if record is None:
+            result.reject(line_number)
+            continue
+
+        title, genre, year, image_path = record
+        if not validate_movie_fields(title, genre, year):
+            result.reject(line_number)
+            continue
+
+        image_path = image_path or ""
+        if not isinstance(image_path, str):
+            result.reject(line_number)
+            continue
+
+        result.valid += 1
+        yield title.strip(), genre.strip(), parse_year(year), image_path.strip() or None
+
+
+def import_catalog(path, fmt=None, chunk_size=50_000):
+    """
+    Import movies from a CSV or JSON Lines file.
+
+    Args:
+        path (str): Source file
+        fmt (str, optional): "csv" or "jsonl"; detected from the extension
+        chunk_size (int): Rows written per transaction
+
+    Returns:
+        ImportResult: Imported, duplicate and rejected counts
+    """
+    fmt = detect_format(path, fmt)
+    result = ImportResult()
+    with open(path, encoding="utf-8-sig", newline="") as file:
+        movies = _valid_movies(_read_records(file, fmt), result)
+        result.imported = DatabaseManager.import_movies(movies, chunk_size)
+    return result
+
+
+def export_catalog(path, fmt=None):
+    """
+    Export every movie to a CSV or JSON Lines file.
+
+    Args:
+        path (str): Destination file (overwritten)
+        fmt (str, optional): "csv" or "jsonl"; detected from the extension
+
+    Returns:
+        int: Number of exported movies
+    """
+    fmt = detect_format(path, fmt)
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        if fmt == "csv":
+            writer = csv.writer(file)
+            writer.writerow(FIELDS)
+            for movie in DatabaseManager.iter_movies():
+                writer.writerow(movie[1:5])
+                count += 1
+        else:
+            for movie in DatabaseManager.iter_movies():
+                file.write(json.dumps(dict(zip(FIELDS, movie[1:5])), ensure_ascii=False))
+                file.write("\n")
+                count += 1
+    return count
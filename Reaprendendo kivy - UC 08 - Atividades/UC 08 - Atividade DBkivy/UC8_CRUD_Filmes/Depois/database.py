@@ -0,0 +1,1162 @@
+"""
+Movie Database Access Layer
+
+This module holds everything the movie CRUD application needs to talk to
+SQLite, and it deliberately does not import Kivy, so command line tools and
+benchmarks can reuse it without starting the UI.
+
+Components:
+- ConnectionPool: long-lived, per-thread SQLite connections with tuned pragmas
+- DatabaseManager: Repository Pattern facade used by the screens, which
+  also publishes change events (inserted, updated or deleted ids)
+- MovieQuery: filter/sort query builder executed entirely in SQL
+
+Performance Notes:
+    Opening a SQLite file is not free: every connect() opens the file, reads
+    and parses the schema and, for write statements, fsyncs the rollback
+    journal. The pool keeps one connection per thread open for the whole
+    application lifetime, runs the database in WAL journal mode and relies on
+    the sqlite3 statement cache so repeated queries skip the SQL compiler.
+"""
+
+# Import Python standard library modules
+import re           # Search query tokenization
+import sqlite3      # SQLite database interface
+import threading    # Per-thread connection storage
+import time         # Connection acquire timing
+import unicodedata  # Accent folding for duplicate detection
+from contextlib import contextmanager
+from itertools import islice
+
+import migrations  # Versioned schema (PRAGMA user_version)
+from migrations import LOCAL_NODE, NEW_UID, NOW_MS
+from instrumentation import InstrumentedConnection
+
+
+# Accepted release years: anything SQLite stores as a small INTEGER
+YEAR_RANGE = range(1, 10_000)
+
+
+def parse_year(year):
+    """
+    Convert a year as typed or parsed to an int.
+
+    Only decimal digits are accepted (str.isdigit() also accepts characters
+    such as "²", which int() rejects), and the value must be in YEAR_RANGE,
+    so a huge number never reaches SQLite as an OverflowError.
+
+    Args:
+        year (str or int): Release year
+
+    Returns:
+        int or None: The year, or None if it is not valid
+    """
+    if isinstance(year, bool):
+        return None
+    if isinstance(year, str):
+        if not year.isdecimal():
+            return None
+        year = int(year)
+    if not isinstance(year, int) or year not in YEAR_RANGE:
+        return None
+    return year
+
+
+def validate_movie_fields(title, genre, year):
+    """
+    Check the fields of a movie before it is written to the database.
+
+    This is the single validation rule shared by the registration and edit
+    screens, the bulk importer and the HTTP API: title and genre must not be
+    blank and the year must be accepted by parse_year().
+
+    Args:
+        title (str): Movie title
+        genre (str): Movie genre
+        year (str or int): Release year as typed or parsed
+
+    Returns:
+        bool: True if the movie can be saved
+    """
+    return bool(
+        isinstance(title, str) and title.strip() and
+        isinstance(genre, str) and genre.strip() and
+        parse_year(year) is not None
+    )
+
+
+def normalize_title(title):
+    """
+    Return the duplicate-detection form of a title.
+
+    Accents are removed, case is folded and runs of whitespace become a
+    single space, so "Ação  Total", "acao total" and "AÇÃO TOTAL" collide.
+    Together with the year this is the unique key of a movie.
+
+    The result is stored in filmes.titulo_normalizado: changing this
+    function requires a migration that recomputes the column.
+    """
+    decomposed = unicodedata.normalize("NFKD", title)
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(folded.casefold().split())
+
+
+class DuplicateMovieError(ValueError):
+    """A write would give two movies the same normalized title and year."""
+
+    def __init__(self, title=None, year=None):
+        if title is None:
+            message = "A alteração deixaria dois filmes com o mesmo título e ano"
+        else:
+            message = f"Já existe um filme \"{title}\" de {year}"
+        super().__init__(message)
+        self.title = title
+        self.year = year
+
+
+class MovieConflictError(Exception):
+    """
+    An edit was based on an outdated version of the movie.
+
+    Attributes:
+        current (tuple): The movie as it is now in the database
+    """
+
+    def __init__(self, current):
+        super().__init__(
+            f"O filme \"{current[1]}\" foi alterado em outro lugar depois de aberto "
+            "para edição")
+        self.current = current
+
+
+class ConnectionPool:
+    """
+    Per-thread pool of persistent SQLite connections.
+
+    Each thread that asks for a connection receives its own sqlite3
+    connection, created on first use and reused afterwards. Connections are
+    opened in autocommit mode (isolation_level=None) so reads never hold a
+    transaction open; writes go through transaction(), which issues an
+    explicit BEGIN IMMEDIATE and supports nesting.
+
+    Technical Implementation:
+        - threading.local keeps connections thread-confined
+        - WAL journal mode lets readers run while a writer commits
+        - synchronous=NORMAL is durable in WAL mode and avoids an fsync
+          per commit
+        - cached_statements keeps prepared statements per connection
+        - after_commit() defers side effects until the data is durable
+        - nested transaction() blocks become savepoints
+
+    Note:
+        ":memory:" databases are private to each connection, so every thread
+        would see a different database. Use a file path for shared data.
+    """
+
+    # Pragmas applied to every new connection
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",       # Readers do not block the writer
+        "PRAGMA synchronous=NORMAL",     # Safe with WAL, no fsync per commit
+        "PRAGMA temp_store=MEMORY",      # Temporary b-trees stay in RAM
+        "PRAGMA cache_size=-16000",      # 16 MB page cache per connection
+        "PRAGMA mmap_size=134217728",    # Memory-map up to 128 MB of the file
+        "PRAGMA foreign_keys=ON",        # Enforce declared relationships
+    )
+
+    # Number of prepared statements cached by each connection
+    CACHED_STATEMENTS = 256
+
+    # Seconds to wait for a lock held by another connection
+    BUSY_TIMEOUT = 5.0
+
+    def __init__(self, database, stats=None):
+        """
+        Create an empty pool for the given database file.
+
+        Args:
+            database (str): Path to the SQLite database file
+            stats (QueryStats, optional): Record statement timings and
+                connection acquire time (see instrumentation.py)
+        """
+        self.database = database
+        self.stats = stats
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Open and configure a new connection for the calling thread."""
+        conn = sqlite3.connect(
+            self.database,
+            timeout=self.BUSY_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.CACHED_STATEMENTS,
+            factory=InstrumentedConnection if self.stats else sqlite3.Connection,
+        )
+        if self.stats:
+            conn.stats = self.stats
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def connection(self):
+        """
+        Return the calling thread's connection, opening it on first use.
+
+        Returns:
+            sqlite3.Connection: Connection owned by the current thread
+        """
+        start = time.perf_counter() if self.stats else None
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.depth = 0
+            self._local.pending = []
+            with self._lock:
+                self._connections.append(conn)
+        if start is not None:
+            self.stats.record_acquire((time.perf_counter() - start) * 1000)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run a block of statements inside a single write transaction.
+
+        The outermost call issues BEGIN IMMEDIATE and commits (or rolls back
+        on error) when the block exits. Nested calls join the transaction
+        that is already open on this thread through a SAVEPOINT, so a nested
+        block that fails undoes only its own statements and its after_commit
+        callbacks; the exception still propagates to the caller.
+
+        Yields:
+            sqlite3.Connection: Connection owned by the current thread
+        """
+        conn = self.connection()
+        if self._local.depth:
+            savepoint = f"nested_{self._local.depth}"
+            queued = len(self._local.pending)
+            conn.execute(f"SAVEPOINT {savepoint}")
+            self._local.depth += 1
+            try:
+                yield conn
+            except BaseException:
+                # Some errors (disk full, I/O) already aborted the whole
+                # transaction, leaving no savepoint to roll back to
+                if conn.in_transaction:
+                    conn.execute(f"ROLLBACK TO {savepoint}")
+                del self._local.pending[queued:]
+                raise
+            finally:
+                self._local.depth -= 1
+                if conn.in_transaction:
+                    conn.execute(f"RELEASE {savepoint}")
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth = 0
+            self._local.pending = []
+            conn.rollback()
+            raise
+        self._local.depth = 0
+        conn.commit()
+
+        pending, self._local.pending = self._local.pending, []
+        for callback in pending:
+            callback()
+
+    def after_commit(self, callback):
+        """
+        Run callback once the current thread's transaction commits.
+
+        Outside a transaction the callback runs immediately. Inside one it
+        is queued and runs after the outermost commit, or is discarded if
+        the transaction rolls back.
+
+        Args:
+            callback (callable): Function called without arguments
+        """
+        self.connection()
+        if self._local.depth:
+            self._local.pending.append(callback)
+        else:
+            callback()
+
+    def close_all(self):
+        """Close every connection opened by the pool."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                # Refresh planner statistics for the indexes that were used
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            conn.close()
+        self._local = threading.local()
+
+
+class DatabaseManager:
+    """
+    Professional Database Access Layer using Repository Pattern
+
+    This class encapsulates all database operations following professional
+    software development practices:
+    - Separation of concerns between data access and business logic
+    - Persistent pooled connections for low-latency access
+    - Parameterized queries for security (SQL injection prevention)
+    - Error handling with proper exception management
+    - Static methods for utility functions
+
+    The Repository Pattern provides:
+    - Clean abstraction over data storage
+    - Easy testing with mock implementations
+    - Centralized database logic
+    - Consistent error handling
+    - Professional transaction management
+
+    Technical Implementation:
+        - Uses SQLite for lightweight, embedded database
+        - A shared ConnectionPool keeps one open connection per thread
+        - Write methods run inside explicit transactions
+        - Parameterized queries prevent SQL injection attacks
+        - Static methods enable usage without instantiation
+    """
+
+    # Database configuration
+    DATABASE_NAME = "filmes.db"  # SQLite database file name
+
+    # Inserts stamp the sync version themselves (see migration 6), sparing
+    # the trigger that would otherwise stamp each row with a second UPDATE
+    INSERT_COLUMNS = ("(titulo, genero, ano, imagem, poster, titulo_normalizado, "
+                      "uid, atualizado_em, origem)")
+    INSERT_STAMP = f"{NEW_UID}, {NOW_MS}, {LOCAL_NODE}"
+
+    # Position of versao (migration 8) in the rows returned by SELECT *
+    VERSION_COLUMN = 10
+
+    # update_movie(poster=KEEP_POSTER) leaves the stored poster reference as
+    # it is (the image path did not change, so there is nothing to store)
+    KEEP_POSTER = object()
+
+    # Change event types passed to subscribers
+    MOVIES_INSERTED = "inserted"
+    MOVIES_UPDATED = "updated"
+    MOVIES_DELETED = "deleted"
+
+    # Full-text matches ranked per search (bounds latency on broad queries)
+    SEARCH_CANDIDATES = 500
+
+    # Shared connection pool, created on first use
+    _pool = None
+    _pool_lock = threading.Lock()
+
+    # Callbacks notified after every committed change
+    _listeners = []
+
+    # QueryStats receiving statement timings (None = not instrumented)
+    _stats = None
+
+    @staticmethod
+    def get_pool():
+        """
+        Return the shared connection pool, creating it on first use.
+
+        Returns:
+            ConnectionPool: Pool bound to DATABASE_NAME
+        """
+        if DatabaseManager._pool is None:
+            with DatabaseManager._pool_lock:
+                if DatabaseManager._pool is None:
+                    DatabaseManager._pool = ConnectionPool(
+                        DatabaseManager.DATABASE_NAME, DatabaseManager._stats)
+        return DatabaseManager._pool
+
+    @staticmethod
+    def instrument(stats):
+        """
+        Record statement timings of every pooled connection.
+
+        Call before the first query (the current pool is closed so new
+        connections are opened instrumented). Pass None to turn it off.
+
+        Args:
+            stats (QueryStats or None): Collector from instrumentation.py
+
+        Returns:
+            QueryStats or None: The collector, for chaining
+        """
+        DatabaseManager.close()
+        DatabaseManager._stats = stats
+        return stats
+
+    @staticmethod
+    def use_database(database):
+        """
+        Point the manager at another database file.
+
+        Closes the current pool so the next call opens connections to the
+        new file. Useful for command line tools and benchmarks.
+
+        Args:
+            database (str): Path to the SQLite database file
+        """
+        DatabaseManager.close()
+        DatabaseManager.DATABASE_NAME = database
+
+    @staticmethod
+    def close():
+        """Close every pooled connection (called when the app stops)."""
+        with DatabaseManager._pool_lock:
+            pool, DatabaseManager._pool = DatabaseManager._pool, None
+        if pool is not None:
+            pool.close_all()
+
+    @staticmethod
+    def subscribe(callback):
+        """
+        Register a callback for movie change events.
+
+        The callback receives (event, movie_ids), where event is one of
+        MOVIES_INSERTED, MOVIES_UPDATED or MOVIES_DELETED and movie_ids is a
+        list of affected IDs. It runs after the change is committed, on the
+        thread that made the change.
+
+        Args:
+            callback (callable): Function called as callback(event, movie_ids)
+        """
+        if callback not in DatabaseManager._listeners:
+            DatabaseManager._listeners.append(callback)
+
+    @staticmethod
+    def unsubscribe(callback):
+        """Remove a callback registered with subscribe()."""
+        if callback in DatabaseManager._listeners:
+            DatabaseManager._listeners.remove(callback)
+
+    @staticmethod
+    def _publish(event, movie_ids):
+        """Notify subscribers of a change once the transaction commits."""
+        def notify():
+            for callback in list(DatabaseManager._listeners):
+                callback(event, movie_ids)
+
+        DatabaseManager.get_pool().after_commit(notify)
+
+    @staticmethod
+    def create_database():
+        """
+        Create or upgrade the database schema.
+
+        Applies the pending migrations from migrations.py, so a new file
+        gets the whole schema and an existing one (including files created
+        before migrations existed) is upgraded in place without losing rows.
+        When the file is already current this costs a single
+        PRAGMA user_version read.
+
+        Database Schema:
+            - id: Primary key with auto-increment
+            - titulo: Movie title (required)
+            - genero: Movie genre (required)
+            - ano: Release year (required integer)
+            - imagem: Image file path (optional)
+            - poster: SHA-256 of the stored poster (optional, references
+              posters.sha256; see poster_store.py)
+            - uid, atualizado_em, origem: global id and last-writer-wins
+              version used by sync.py, filled in by inserts and triggers
+            - titulo_normalizado: accent- and case-folded title; unique
+              together with ano (see normalize_title())
+            - versao: row version, incremented by every update, for
+              optimistic concurrency (see update_movie())
+
+        Secondary Indexes:
+            - (genero, ano): genre filter, optionally with a year range
+            - (ano): year range without a genre
+            - (titulo COLLATE NOCASE): case-insensitive title prefix and
+              alphabetical ordering
+
+        Full-Text Search:
+            filmes_fts is an external-content FTS5 index over titulo and
+            genero, kept in sync with filmes by triggers.
+
+        Statistics:
+            filmes_estatisticas holds the movie count of each (genero, ano)
+            pair, kept up to date by triggers on insert, update and delete.
+
+        Change Feed:
+            alteracoes holds the latest change of every uid (tombstones
+            included) under an increasing seq; sync.py reads it to exchange
+            deltas with other database files.
+
+        Returns:
+            list: Schema versions applied by this call
+        """
+        return migrations.migrate(DatabaseManager.get_pool())
+
+    @staticmethod
+    def add_movie(title, genre, year, image_path=None, poster=None):
+        """
+        Add a new movie, or update it if it is already registered.
+
+        A movie with the same normalized title and year (see
+        normalize_title()) is the same movie: INSERT ... ON CONFLICT turns
+        the insert into an update that only fills the image and poster the
+        stored movie lacks, so re-running an import or double-clicking
+        Salvar never creates a duplicate. The stored title keeps the
+        spelling it was registered with (a later "AÇÃO  total" does not
+        rewrite "Ação Total") and its genre is left alone; changing them is
+        update_movie()'s job. When
+        nothing is filled in, nothing changes and no event is published.
+
+        Args:
+            title (str): Movie title
+            genre (str): Movie genre
+            year (int): Release year
+            image_path (str, optional): Path to movie poster image
+            poster (PosterInfo, optional): Poster already added to the
+                PosterStore; the row references its hash
+
+        Returns:
+            int: ID of the new or existing movie
+
+        Security Features:
+            - Parameterized queries prevent SQL injection
+            - Input validation through database constraints
+            - Proper error handling for constraint violations
+        """
+        key = normalize_title(title)
+        with DatabaseManager.get_pool().transaction() as conn:
+            existing = conn.execute(
+                "SELECT id FROM filmes WHERE titulo_normalizado = ? AND ano = ?", (key, year)
+            ).fetchone()
+            # Use parameterized query for security; the WHERE clause skips
+            # the update (and its triggers) when nothing would change
+            row = conn.execute(
+                f"INSERT INTO filmes {DatabaseManager.INSERT_COLUMNS} VALUES (?, ?, ?, ?, ?, ?, "
+                f"{DatabaseManager.INSERT_STAMP}) "
+                "ON CONFLICT (titulo_normalizado, ano) DO UPDATE SET "
+                "imagem = COALESCE(NULLIF(imagem, ''), excluded.imagem), "
+                "poster = COALESCE(poster, excluded.poster), versao = versao + 1 "
+                "WHERE (NULLIF(imagem, '') IS NULL AND excluded.imagem IS NOT NULL) "
+                "OR (poster IS NULL AND excluded.poster IS NOT NULL) "
+                "RETURNING id",
+                (title, genre, year, image_path,
+                 DatabaseManager._register_poster(conn, poster), key)
+            ).fetchone()
+            if existing is None:
+                DatabaseManager._publish(DatabaseManager.MOVIES_INSERTED, [row[0]])
+                return row[0]
+            if row is not None:
+                DatabaseManager._publish(DatabaseManager.MOVIES_UPDATED, [existing[0]])
+            return existing[0]
+
+    @staticmethod
+    def _register_poster(conn, poster):
+        """Record a PosterInfo in the posters table and return its hash."""
+        if poster is None:
+            return None
+        conn.execute(
+            "INSERT OR IGNORE INTO posters (sha256, extensao, bytes) VALUES (?, ?, ?)",
+            poster
+        )
+        return poster.sha256
+
+    @staticmethod
+    def set_movie_poster(movie_id, poster):
+        """
+        Point a movie at a stored poster without touching its other fields.
+
+        Used by manage.py posters ingest to move legacy image paths into
+        the store.
+
+        Returns:
+            bool: True if the movie existed
+        """
+        with DatabaseManager.get_pool().transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE filmes SET poster=?, versao=versao+1 WHERE id=?",
+                (DatabaseManager._register_poster(conn, poster), movie_id)
+            )
+            if cursor.rowcount:
+                DatabaseManager._publish(DatabaseManager.MOVIES_UPDATED, [movie_id])
+            return cursor.rowcount > 0
+
+    @staticmethod
+    def get_poster_hashes():
+        """Return the set of poster hashes referenced by some movie."""
+        conn = DatabaseManager.get_pool().connection()
+        return {row[0] for row in conn.execute(
+            "SELECT DISTINCT poster FROM filmes WHERE poster IS NOT NULL")}
+
+    @staticmethod
+    def prune_posters():
+        """
+        Drop posters rows no movie references any more.
+
+        Returns:
+            set: Hashes still referenced, i.e. the files the store must keep
+        """
+        with DatabaseManager.get_pool().transaction() as conn:
+            conn.execute(
+                "DELETE FROM posters WHERE sha256 NOT IN "
+                "(SELECT poster FROM filmes WHERE poster IS NOT NULL)")
+            return {row[0] for row in conn.execute("SELECT sha256 FROM posters")}
+
+    @staticmethod
+    def get_movies_without_poster():
+        """Return (id, imagem) of movies with an image path but no stored poster."""
+        conn = DatabaseManager.get_pool().connection()
+        return conn.execute(
+            "SELECT id, imagem FROM filmes WHERE poster IS NULL AND imagem IS NOT NULL "
+            "AND imagem != '' ORDER BY id"
+        ).fetchall()
+
+    @staticmethod
+    def import_movies(movies, chunk_size=50_000):
+        """
+        Bulk insert movies using executemany in chunked transactions.
+
+        The iterable is consumed lazily, chunk_size rows at a time, and each
+        chunk is written in its own transaction. Memory use is bounded by the
+        chunk size, however many rows the source produces, and the cost of a
+        commit is shared by the whole chunk instead of paid per movie.
+
+        Movies already registered (same normalized title and year), in the
+        database or earlier in the same file, are skipped with
+        ON CONFLICT DO NOTHING, so importing a file twice adds nothing.
+
+        Args:
+            movies (iterable): Tuples (title, genre, year, image_path), already
+                validated with validate_movie_fields()
+            chunk_size (int): Rows written per transaction
+
+        Returns:
+            int: Number of inserted movies (duplicates excluded)
+        """
+        movies = iter(movies)
+        total = 0
+        while True:
+            chunk = list(islice(movies, chunk_size))
+            if not chunk:
+                return total
+            with DatabaseManager.get_pool().transaction() as conn:
+                first_id = DatabaseManager._last_movie_id(conn) + 1
+                inserted = conn.executemany(
+                    f"INSERT INTO filmes {DatabaseManager.INSERT_COLUMNS} VALUES (?, ?, ?, ?, NULL, ?, "
+                    f"{DatabaseManager.INSERT_STAMP}) ON CONFLICT (titulo_normalizado, ano) DO NOTHING",
+                    ((title, genre, year, image_path, normalize_title(title))
+                     for title, genre, year, image_path in chunk)
+                ).rowcount
+                # A single writer holds the transaction, so every new id of the
+                # chunk lies in this range; a range keeps the event small. Ids
+                # of skipped duplicates are used up without a row, so it may
+                # also name ids that do not exist.
+                if inserted:
+                    DatabaseManager._publish(
+                        DatabaseManager.MOVIES_INSERTED,
+                        range(first_id, DatabaseManager._last_movie_id(conn) + 1))
+            total += inserted
+
+    @staticmethod
+    def _last_movie_id(conn):
+        """Return the last AUTOINCREMENT id handed out for filmes."""
+        row = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'filmes'"
+        ).fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def iter_movies(batch_size=10_000):
+        """
+        Stream every movie ordered by ID without loading the table in memory.
+
+        Args:
+            batch_size (int): Rows fetched from SQLite per round trip
+
+        Yields:
+            tuple: (id, title, genre, year, image_path)
+        """
+        conn = DatabaseManager.get_pool().connection()
+        cursor = conn.execute("SELECT * FROM filmes ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
+    @staticmethod
+    def get_all_movies():
+        """
+        Retrieve all movies from the database.
+
+        Returns a list of tuples containing all movie records.
+        Each tuple represents one movie with all fields.
+
+        Returns:
+            list: List of tuples (id, title, genre, year, image_path)
+
+        Technical Note:
+            Uses fetchall() to retrieve all records in memory.
+            For large datasets, use get_movies_page() instead.
+        """
+        conn = DatabaseManager.get_pool().connection()
+        return conn.execute("SELECT * FROM filmes").fetchall()
+
+    @staticmethod
+    def get_movies_page(after_id=0, limit=50):
+        """
+        Retrieve one page of movies ordered by ID (keyset pagination).
+
+        Instead of LIMIT/OFFSET, which makes SQLite walk and discard every
+        skipped row, the page starts right after the last ID the caller has
+        already seen. The primary key index jumps straight to that position,
+        so every page costs the same no matter how deep the user scrolls.
+
+        Args:
+            after_id (int): Last movie ID of the previous page (0 for the first)
+            limit (int): Maximum number of movies to return
+
+        Returns:
+            list: List of tuples (id, title, genre, year, image_path)
+        """
+        conn = DatabaseManager.get_pool().connection()
+        return conn.execute(
+            "SELECT * FROM filmes WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id, limit)
+        ).fetchall()
+
+    @staticmethod
+    def get_movie_by_id(movie_id):
+        """
+        Retrieve a specific movie by its unique ID.
+
+        Args:
+            movie_id (int): Unique movie identifier
+
+        Returns:
+            tuple or None: Movie data tuple or None if not found
+
+        Security Features:
+            - Parameterized query prevents SQL injection
+            - Returns None for non-existent records
+        """
+        conn = DatabaseManager.get_pool().connection()
+        return conn.execute("SELECT * FROM filmes WHERE id=?", (movie_id,)).fetchone()
+
+    @staticmethod
+    def get_genre_statistics():
+        """
+        Count movies per genre from the trigger-maintained summary table.
+
+        Reads filmes_estatisticas, so the cost depends on the number of
+        distinct (genero, ano) pairs, not on the number of movies.
+
+        Returns:
+            list: Tuples (genero, total), the largest genres first
+        """
+        conn = DatabaseManager.get_pool().connection()
+        return conn.execute(
+            "SELECT genero, SUM(total) FROM filmes_estatisticas "
+            "GROUP BY genero ORDER BY SUM(total) DESC, genero"
+        ).fetchall()
+
+    @staticmethod
+    def get_decade_statistics():
+        """
+        Count movies per decade from the summary table.
+
+        Returns:
+            list: Tuples (first year of the decade, total), oldest first
+        """
+        conn = DatabaseManager.get_pool().connection()
+        return conn.execute(
+            "SELECT ano - ano % 10 AS decada, SUM(total) FROM filmes_estatisticas "
+            "GROUP BY decada ORDER BY decada"
+        ).fetchall()
+
+    @staticmethod
+    def check_statistics(repair=False):
+        """
+        Recount filmes from scratch and compare with filmes_estatisticas.
+
+        Both sides are read by a single statement, so they come from the
+        same snapshot even while other threads write.
+
+        Args:
+            repair (bool): Rebuild the summary table when it differs
+
+        Returns:
+            list: Tuples (genero, ano, counted, recorded) for every pair
+            whose recorded total is wrong (empty when consistent)
+        """
+        sql = """
+            SELECT genero, ano, SUM(contado), SUM(registrado) FROM (
+                SELECT genero, ano, COUNT(*) AS contado, 0 AS registrado
+                FROM filmes GROUP BY genero, ano
+                UNION ALL
+                SELECT genero, ano, 0, total FROM filmes_estatisticas
+            )
+            GROUP BY genero, ano
+            HAVING SUM(contado) != SUM(registrado)
+            ORDER BY genero, ano
+        """
+        differences = DatabaseManager.get_pool().connection().execute(sql).fetchall()
+        if differences and repair:
+            with DatabaseManager.get_pool().transaction() as conn:
+                conn.execute("DELETE FROM filmes_estatisticas")
+                conn.execute(
+                    "INSERT INTO filmes_estatisticas (genero, ano, total) "
+                    "SELECT genero, ano, COUNT(*) FROM filmes GROUP BY genero, ano")
+        return differences
+
+    @staticmethod
+    def query():
+        """
+        Start a filtered/sorted movie query.
+
+        Example:
+            DatabaseManager.query().genre("Drama").year_between(1990, 1999) \
+                .order_by("ano", descending=True).limit(20).fetch()
+
+        Returns:
+            MovieQuery: Empty query over the filmes table
+        """
+        return MovieQuery()
+
+    @staticmethod
+    def search_movies(text, limit=50):
+        """
+        Full-text search over titles and genres, best matches first.
+
+        Every word typed is matched as a prefix ("mat" finds "Matrix") and
+        all words must match. Accents and case are ignored on both sides,
+        so "acao" and "AÇÃO" find "Ação". Results are ranked with bm25,
+        weighting title hits ten times more than genre hits.
+
+        Performance Note:
+            bm25 has to score every matching row before sorting, and a one
+            or two letter prefix can match most of the catalog. Only the
+            first SEARCH_CANDIDATES matches are scored, which keeps each
+            keystroke in the low milliseconds at 500k rows; as the user
+            types more letters the match set shrinks below the cap and the
+            ranking covers every hit.
+
+        Args:
+            text (str): Free text typed by the user
+            limit (int): Maximum number of movies to return
+
+        Returns:
+            list: List of tuples (id, title, genre, year, image_path)
+        """
+        match = DatabaseManager._fts_query(text)
+        if not match:
+            return []
+
+        conn = DatabaseManager.get_pool().connection()
+        return conn.execute("""
+            SELECT filmes.*
+            FROM (
+                SELECT rowid AS id, bm25(filmes_fts, 10.0, 1.0) AS score
+                FROM filmes_fts
+                WHERE filmes_fts MATCH ?
+                LIMIT ?
+            ) AS hits
+            JOIN filmes ON filmes.id = hits.id
+            ORDER BY hits.score
+            LIMIT ?
+        """, (match, DatabaseManager.SEARCH_CANDIDATES, limit)).fetchall()
+
+    @staticmethod
+    def _fts_query(text):
+        """
+        Turn free text into an FTS5 query of quoted terms.
+
+        Words become quoted prefix terms, so user input can never inject
+        FTS5 operators. Single letters are matched as whole words: the
+        prefix indexes start at two characters and a one letter prefix
+        would expand to a large part of the vocabulary.
+        """
+        words = re.findall(r"\w+", text or "")
+        return " ".join(f'"{word}"' if len(word) == 1 else f'"{word}"*' for word in words)
+
+    @staticmethod
+    def update_movie(movie_id, title, genre, year, image_path, poster=None, version=None):
+        """
+        Update an existing movie record with new information.
+
+        With version, the update is optimistic: it only applies if the row
+        still has the version the caller read (row[VERSION_COLUMN]), so of
+        two people editing the same movie the second one to save gets a
+        MovieConflictError instead of silently overwriting the first. The
+        condition rides on the primary key lookup ("id=? AND versao=?") and
+        the current row is only read when the check fails.
+
+        Args:
+            movie_id (int): Unique movie identifier
+            title (str): Updated movie title
+            genre (str): Updated movie genre
+            year (int): Updated release year
+            image_path (str): Updated image path
+            poster (PosterInfo, optional): Stored poster for the new image;
+                None clears the reference and KEEP_POSTER keeps it
+            version (int, optional): Version the edit is based on; None
+                overwrites whatever is stored
+
+        Returns:
+            bool: True if the movie existed
+
+        Raises:
+            DuplicateMovieError: If another movie has the same normalized
+                title and year
+            MovieConflictError: If the movie changed since version
+
+        Technical Features:
+            - Parameterized query for security
+            - Updates all fields in single operation
+            - Automatic transaction commit
+        """
+        keep = poster is DatabaseManager.KEEP_POSTER
+        with DatabaseManager.get_pool().transaction() as conn:
+            try:
+                cursor = conn.execute(
+                    "UPDATE filmes SET titulo=?, genero=?, ano=?, imagem=?, "
+                    "poster=CASE WHEN ? THEN poster ELSE ? END, "
+                    "titulo_normalizado=?, versao=versao+1 "
+                    "WHERE id=? AND versao=COALESCE(?, versao)",
+                    (title, genre, year, image_path, keep,
+                     None if keep else DatabaseManager._register_poster(conn, poster),
+                     normalize_title(title), movie_id, version)
+                )
+            except sqlite3.IntegrityError:
+                raise DuplicateMovieError(title, year) from None
+            if not cursor.rowcount:
+                if version is not None:
+                    current = conn.execute(
+                        "SELECT * FROM filmes WHERE id=?", (movie_id,)).fetchone()
+                    if current is not None:
+                        raise MovieConflictError(current)
+                return False
+            DatabaseManager._publish(DatabaseManager.MOVIES_UPDATED, [movie_id])
+            return True
+
+    @staticmethod
+    def update_movies(movie_ids, genre=None, year=None):
+        """
+        Set the genre and/or year of many movies in one transaction.
+
+        Fields passed as None keep their current value in each row, so the
+        same call can change only the genre, only the year, or both.
+
+        Args:
+            movie_ids (iterable): Ids of the movies to edit
+            genre (str, optional): New genre
+            year (int, optional): New release year
+
+        Returns:
+            int: Number of updated movies
+
+        Raises:
+            ValueError: If the year is not accepted by parse_year() or the
+                genre is blank; nothing is changed
+            DuplicateMovieError: If the new year would make two movies
+                identical; nothing is changed
+        """
+        if year is not None:
+            checked = parse_year(year)
+            if checked is None:
+                raise ValueError(f"Ano inválido: {year!r} (use {YEAR_RANGE.start} a "
+                                 f"{YEAR_RANGE.stop - 1})")
+            year = checked
+        if genre is not None and not (isinstance(genre, str) and genre.strip()):
+            raise ValueError("Gênero em branco")
+        movie_ids = list(dict.fromkeys(movie_ids))
+        if not movie_ids or (genre is None and year is None):
+            return 0
+        with DatabaseManager.get_pool().transaction() as conn:
+            try:
+                cursor = conn.executemany(
+                    "UPDATE filmes SET genero=COALESCE(?, genero), ano=COALESCE(?, ano), "
+                    "versao=versao+1 WHERE id=?",
+                    ((genre, year, movie_id) for movie_id in movie_ids)
+                )
+            except sqlite3.IntegrityError:
+                raise DuplicateMovieError() from None
+            if cursor.rowcount:
+                DatabaseManager._publish(DatabaseManager.MOVIES_UPDATED, movie_ids)
+            return cursor.rowcount
+
+    @staticmethod
+    def delete_movie(movie_id):
+        """
+        Remove a movie from the database.
+
+        Args:
+            movie_id (int): Unique movie identifier to delete
+
+        Returns:
+            bool: True if the movie existed
+
+        Security Features:
+            - Parameterized query prevents SQL injection
+            - Permanent deletion with proper transaction handling
+        """
+        with DatabaseManager.get_pool().transaction() as conn:
+            cursor = conn.execute("DELETE FROM filmes WHERE id=?", (movie_id,))
+            if cursor.rowcount:
+                DatabaseManager._publish(DatabaseManager.MOVIES_DELETED, [movie_id])
+            return cursor.rowcount > 0
+
+    @staticmethod
+    def delete_movies(movie_ids):
+        """
+        Remove many movies with executemany in a single transaction.
+
+        One commit and one change event cover the whole batch, instead of
+        one of each per movie. The event lists every requested id;
+        subscribers ignore ids they do not hold.
+
+        Args:
+            movie_ids (iterable): Ids of the movies to delete
+
+        Returns:
+            int: Number of deleted movies
+        """
+        movie_ids = list(dict.fromkeys(movie_ids))
+        if not movie_ids:
+            return 0
+        with DatabaseManager.get_pool().transaction() as conn:
+            cursor = conn.executemany(
+                "DELETE FROM filmes WHERE id=?", ((movie_id,) for movie_id in movie_ids)
+            )
+            if cursor.rowcount:
+                DatabaseManager._publish(DatabaseManager.MOVIES_DELETED, movie_ids)
+            return cursor.rowcount
+
+
+class MovieQuery:
+    """
+    Fluent builder for filtered and sorted movie queries.
+
+    Every filter becomes a parameterized WHERE clause and sorting and
+    limiting happen in SQL, so only the requested rows ever reach Python.
+    The predicates are written in the exact shape the secondary indexes
+    created by create_database() can serve:
+    - genre() is an equality on genero, the leading column of (genero, ano)
+    - year_between() is a range on ano, served by (genero, ano) together
+      with genre() or by (ano) on its own
+    - title_prefix() is a range on titulo COLLATE NOCASE instead of LIKE,
+      so it always matches the NOCASE index regardless of how the
+      statement is prepared
+
+    explain() returns the EXPLAIN QUERY PLAN output for checking that a
+    query is answered by an index search instead of a full table scan.
+    """
+
+    # Columns accepted by order_by() and the SQL used to sort them
+    SORT_COLUMNS = {
+        "id": "id",
+        "titulo": "titulo COLLATE NOCASE",
+        "genero": "genero",
+        "ano": "ano",
+    }
+
+    # Sorts after every string that starts with a given prefix
+    _PREFIX_END = "\U0010ffff"
+
+    def __init__(self):
+        self._conditions = []
+        self._params = []
+        self._order = []
+        self._limit = None
+
+    def genre(self, genre):
+        """Keep only movies of the given genre (exact match)."""
+        self._conditions.append("genero = ?")
+        self._params.append(genre)
+        return self
+
+    def year_between(self, start=None, end=None):
+        """Keep only movies released between start and end (inclusive)."""
+        if start is not None:
+            self._conditions.append("ano >= ?")
+            self._params.append(int(start))
+        if end is not None:
+            self._conditions.append("ano <= ?")
+            self._params.append(int(end))
+        return self
+
+    def title_prefix(self, prefix):
+        """Keep only movies whose title starts with prefix (ASCII case-insensitive)."""
+        if prefix:
+            self._conditions.append(
+                "titulo >= ? COLLATE NOCASE AND titulo < ? COLLATE NOCASE")
+            self._params.extend((prefix, prefix + self._PREFIX_END))
+        return self
+
+    def order_by(self, column, descending=False):
+        """
+        Sort by one of SORT_COLUMNS; call again to add tie-breakers.
+
+        Raises:
+            ValueError: If the column is not sortable
+        """
+        if column not in self.SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {column!r}")
+        direction = "DESC" if descending else "ASC"
+        self._order.append(f"{self.SORT_COLUMNS[column]} {direction}")
+        return self
+
+    def limit(self, count):
+        """Return at most count movies."""
+        self._limit = int(count)
+        return self
+
+    def to_sql(self):
+        """
+        Build the SQL statement and its parameters.
+
+        Returns:
+            tuple: (sql, params)
+        """
+        sql = "SELECT * FROM filmes"
+        params = list(self._params)
+        if self._conditions:
+            sql += " WHERE " + " AND ".join(self._conditions)
+        if self._order:
+            sql += " ORDER BY " + ", ".join(self._order)
+        if self._limit is not None:
+            sql += " LIMIT ?"
+            params.append(self._limit)
+        return sql, params
+
+    def fetch(self):
+        """
+        Run the query.
+
+        Returns:
+            list: List of tuples (id, title, genre, year, image_path)
+        """
+        sql, params = self.to_sql()
+        conn = DatabaseManager.get_pool().connection()
+        return conn.execute(sql, params).fetchall()
+
+    def explain(self):
+        """
+        Return the query plan SQLite chose for this query.
+
+        Returns:
+            list: Plan step descriptions, e.g. "SEARCH filmes USING INDEX ..."
+        """
+        sql, params = self.to_sql()
+        conn = DatabaseManager.get_pool().connection()
+        return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+    def uses_full_scan(self):
+        """True if the plan reads the whole filmes table without an index."""
+        return any(step == "SCAN filmes" for step in self.explain())
@@ -0,0 +1,240 @@
+"""
+Background Database Worker
+
+Runs DatabaseManager calls away from the UI thread so a slow disk never
+freezes rendering:
+- Writes go to a single writer thread. Writes that queue up while a
+  transaction is running are drained together and executed inside one
+  BEGIN IMMEDIATE ... COMMIT, each in its own savepoint, so a burst of
+  saves costs one commit instead of one per save and a failing write does
+  not undo its neighbours
+- Reads run on a small thread pool; in WAL mode they proceed while the
+  writer holds its transaction
+- Every call returns a DatabaseFuture. Its callback and errback are handed
+  to a dispatcher (Clock.schedule_once in the application) so they run on
+  the UI thread, and cancelling the future guarantees they never run
+- An optional initializer (DatabaseManager.create_database in the
+  application) runs first on the writer thread. Reads and writes queued
+  meanwhile wait for it, so the UI can start before the schema is ready
+
+The module does not import Kivy; without a dispatcher, callbacks run on the
+worker thread that finished the job.
+"""
+
+# Import Python standard library modules
+import queue                                              # Writer job queue
+import threading                                          # Writer thread
+from concurrent.futures import Future, ThreadPoolExecutor  # Results and reader pool
+
+from database import DatabaseManager
+
+
+class DatabaseFuture(Future):
+    """
+    Future of a background database call.
+
+    cancel() works like concurrent.futures.Future.cancel() (it returns False
+    once the job has started), but in every case it also marks the future
+    as abandoned, so callbacks registered through the worker are dropped.
+    Screens cancel their pending futures when the user leaves them.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.abandoned = False
+
+    def cancel(self):
+        """Cancel the job if it has not started and drop its callbacks."""
+        self.abandoned = True
+        return super().cancel()
+
+
+class DatabaseWorker:
+    """
+    Asynchronous front end for DatabaseManager.
+
+    Attributes:
+        dispatcher (callable): Receives a no-argument function and runs it
+            on the UI thread
+        ready (DatabaseFuture): Resolves with the initializer's result (or
+            its exception) once the database can be used
+    """
+
+    # Reader threads
+    DEFAULT_READERS = 2
+
+    # Most queued writes committed in a single transaction
+    MAX_BATCH = 128
+
+    def __init__(self, readers=DEFAULT_READERS, dispatcher=None, initializer=None):
+        self.dispatcher = dispatcher or (lambda function: function())
+        self.ready = DatabaseFuture()
+        self._initializer = initializer
+        self._writes = queue.Queue()
+        self._readers = ThreadPoolExecutor(max_workers=readers,
+                                           thread_name_prefix="db-reader")
+        self._listeners = {}
+        self._writer = threading.Thread(target=self._write_loop,
+                                        name="db-writer", daemon=True)
+        self._writer.start()
+
+    def read(self, function, *args, callback=None, errback=None):
+        """
+        Run a read-only DatabaseManager call on the reader pool.
+
+        Args:
+            function (callable): e.g. DatabaseManager.get_movies_page
+            *args: Arguments for function
+            callback (callable, optional): callback(result) on the UI thread
+            errback (callable, optional): errback(exception) on the UI thread
+
+        Returns:
+            DatabaseFuture: Result of function(*args)
+        """
+        future = self._track(DatabaseFuture(), callback, errback)
+
+        def job():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                self.ready.result()  # Waits for (or re-raises) the initializer
+                future.set_result(function(*args))
+            except Exception as error:
+                future.set_exception(error)
+
+        self._readers.submit(job)
+        return future
+
+    def write(self, function, *args, callback=None, errback=None):
+        """
+        Queue a DatabaseManager call that modifies the database.
+
+        The future resolves only after the transaction holding the call has
+        committed. Arguments and return value are the same as read().
+        """
+        future = self._track(DatabaseFuture(), callback, errback)
+        self._writes.put((future, function, args))
+        return future
+
+    def when_ready(self, callback=None, errback=None):
+        """
+        Call callback(result) or errback(exception) on the UI thread once
+        the initializer has finished (right away if it already has).
+        """
+        self._track(self.ready, callback, errback)
+
+    def subscribe(self, listener):
+        """
+        Register listener(event, movie_ids) for DatabaseManager changes.
+
+        Change events are published by whichever thread committed the write,
+        which is now the writer thread; the listener is called through the
+        dispatcher instead.
+        """
+        def relay(event, movie_ids):
+            self.dispatcher(lambda: listener(event, movie_ids))
+
+        self._listeners[listener] = relay
+        DatabaseManager.subscribe(relay)
+
+    def unsubscribe(self, listener):
+        """Remove a listener registered with subscribe()."""
+        relay = self._listeners.pop(listener, None)
+        if relay is not None:
+            DatabaseManager.unsubscribe(relay)
+
+    def close(self):
+        """Finish the queued writes, stop the threads and drop pending reads."""
+        self._writes.put(None)
+        self._writer.join()
+        self._readers.shutdown(wait=True, cancel_futures=True)
+        for relay in self._listeners.values():
+            DatabaseManager.unsubscribe(relay)
+        self._listeners.clear()
+
+    def _track(self, future, callback, errback):
+        """Deliver the outcome of future through the dispatcher."""
+        if callback is None and errback is None:
+            return future
+
+        def deliver():
+            if future.abandoned:
+                return
+            error = future.exception()
+            if error is None:
+                if callback is not None:
+                    callback(future.result())
+            elif errback is not None:
+                errback(error)
+
+        def done(finished):
+            if not finished.cancelled():
+                self.dispatcher(deliver)
+
+        future.add_done_callback(done)
+        return future
+
+    def _next_batch(self):
+        """
+        Block for the next write and drain the ones queued behind it.
+
+        Returns:
+            tuple: (jobs, stop) where stop is True once close() was called
+        """
+        job = self._writes.get()
+        if job is None:
+            return [], True
+
+        jobs = [job]
+        while len(jobs) < self.MAX_BATCH:
+            try:
+                job = self._writes.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                return jobs, True
+            jobs.append(job)
+        return jobs, False
+
+    def _initialize(self):
+        """Run the initializer and resolve the ready future."""
+        self.ready.set_running_or_notify_cancel()
+        try:
+            self.ready.set_result(self._initializer() if self._initializer else None)
+        except Exception as error:
+            self.ready.set_exception(error)
+
+    def _write_loop(self):
+        """Writer thread: execute queued writes in coalesced transactions."""
+        self._initialize()
+        stop = False
+        while not stop:
+            jobs, stop = self._next_batch()
+            jobs = [job for job in jobs if job[0].set_running_or_notify_cancel()]
+            if not jobs:
+                continue
+            if self.ready.exception() is not None:
+                # Without a usable database every write fails the same way
+                for future, _, _ in jobs:
+                    future.set_exception(self.ready.exception())
+                continue
+
+            outcomes = []
+            try:
+                with DatabaseManager.get_pool().transaction():
+                    for future, function, args in jobs:
+                        try:
+                            # Nested transaction = savepoint for this job only
+                            with DatabaseManager.get_pool().transaction():
+                                outcomes.append((future, function(*args), None))
+                        except Exception as error:
+                            outcomes.append((future, None, error))
+            except Exception as error:
+                # The commit itself failed: nothing in the batch was saved
+                outcomes = [(future, None, error) for future, _, _ in jobs]
+
+            for future, result, error in outcomes:
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
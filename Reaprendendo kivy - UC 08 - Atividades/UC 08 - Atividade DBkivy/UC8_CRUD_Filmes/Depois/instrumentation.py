@@ -0,0 +1,305 @@
+"""
+Query Instrumentation for the Movie Database
+
+Answers "which DatabaseManager call is slow?" without a profiler:
+- Latency histogram, call count, total/max time and rows per SQL statement
+  (execute plus fetching the rows; COMMIT and ROLLBACK included)
+- Time spent acquiring a pooled connection
+- A slow-query log with the EXPLAIN QUERY PLAN of every statement above
+  a threshold
+
+Instrumentation is opt-in: DatabaseManager.instrument(QueryStats()) makes
+the pool open InstrumentedConnection objects, whose cursors report to the
+QueryStats. snapshot() returns plain data and export() writes it as JSON
+for offline analysis; the application shows it in a debug overlay (F12).
+
+The module does not import Kivy.
+"""
+
+# Import Python standard library modules
+import json                     # Export format
+import re                       # SQL normalization
+import sqlite3                  # Connection and cursor subclasses
+import threading                # Stats are shared by every pooled thread
+import time                     # Timers and timestamps
+from collections import deque   # Bounded slow-query log
+from functools import lru_cache # Normalized SQL per statement text
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram in milliseconds.
+
+    Buckets grow roughly 2.5x, so a handful of integers covers everything
+    from a cached point lookup to a multi-second import.
+    """
+
+    # Upper bound (ms) of each bucket; the last bucket is unbounded
+    BOUNDS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        """Record one measurement."""
+        index = 0
+        while index < len(self.BOUNDS) and ms > self.BOUNDS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction):
+        """Return the bucket bound containing the given fraction (0-1)."""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.BOUNDS[index] if index < len(self.BOUNDS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self):
+        """Return the histogram as plain data."""
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip([str(bound) for bound in self.BOUNDS] + ["inf"], self.counts)),
+        }
+
+
+class QueryStats:
+    """
+    Thread-safe collector of statement timings and slow queries.
+
+    Attributes:
+        slow_ms (float): Statements taking longer are logged with their plan
+    """
+
+    # Statements slower than this (ms) go to the slow-query log
+    SLOW_MS = 50.0
+
+    # Slow queries kept in memory (oldest are dropped)
+    SLOW_LOG_SIZE = 200
+
+    # Distinct statements tracked; dynamic SQL beyond this is grouped
+    MAX_STATEMENTS = 500
+
+    def __init__(self, slow_ms=SLOW_MS):
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._statements = {}  # normalized SQL -> {"latency": histogram, "rows": int}
+        self._acquire = LatencyHistogram()
+        self._slow = deque(maxlen=self.SLOW_LOG_SIZE)
+        self._started = time.time()
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def normalize(sql):
+        """Collapse whitespace so the same statement always has one key."""
+        return re.sub(r"\s+", " ", sql).strip()
+
+    def record(self, sql, ms, rows):
+        """Record one statement execution."""
+        key = self.normalize(sql)
+        with self._lock:
+            entry = self._statements.get(key)
+            if entry is None:
+                if len(self._statements) >= self.MAX_STATEMENTS:
+                    key = "(outras instruções)"
+                    entry = self._statements.get(key)
+                if entry is None:
+                    entry = self._statements[key] = {"latency": LatencyHistogram(), "rows": 0}
+            entry["latency"].add(ms)
+            entry["rows"] += max(rows, 0)
+
+    def record_acquire(self, ms):
+        """Record the time taken to hand out a pooled connection."""
+        with self._lock:
+            self._acquire.add(ms)
+
+    def record_slow(self, sql, parameters, ms, plan):
+        """Add a statement to the slow-query log."""
+        with self._lock:
+            self._slow.append({
+                "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "thread": threading.current_thread().name,
+                "ms": round(ms, 3),
+                "sql": self.normalize(sql),
+                "parameters": repr(parameters)[:200],
+                "plan": plan,
+            })
+
+    def reset(self):
+        """Discard everything recorded so far."""
+        with self._lock:
+            self._statements.clear()
+            self._acquire = LatencyHistogram()
+            self._slow.clear()
+            self._started = time.time()
+
+    def snapshot(self):
+        """
+        Return the collected data as JSON-compatible structures.
+
+        Statements are sorted by total time, the most expensive first.
+        """
+        with self._lock:
+            statements = [
+                {"sql": sql, "rows": entry["rows"], **entry["latency"].to_dict()}
+                for sql, entry in self._statements.items()
+            ]
+            statements.sort(key=lambda statement: statement["total_ms"], reverse=True)
+            return {
+                "seconds": round(time.time() - self._started, 1),
+                "slow_ms": self.slow_ms,
+                "connection_acquire": self._acquire.to_dict(),
+                "statements": statements,
+                "slow_queries": list(self._slow),
+            }
+
+    def export(self, path):
+        """Write snapshot() to a JSON file and return the path."""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file, ensure_ascii=False, indent=2)
+        return path
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Cursor that times each statement from execute() until its rows have
+    been fetched (or the cursor is reused, closed or garbage collected).
+    """
+
+    _sql = None
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        self._sql, self._parameters, self._rows = sql, parameters, 0
+        self._elapsed = 0.0
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._elapsed += time.perf_counter() - start
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        self._sql, self._parameters, self._rows = sql, None, 0
+        self._elapsed = 0.0
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._elapsed += time.perf_counter() - start
+            self._finish()
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        if self._sql is not None:
+            self._elapsed += time.perf_counter() - start
+            if row is None:
+                self._finish()
+            else:
+                self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        if self._sql is not None:
+            self._elapsed += time.perf_counter() - start
+            self._rows += len(rows)
+            if not rows:
+                self._finish()
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        if self._sql is not None:
+            self._elapsed += time.perf_counter() - start
+            self._rows += len(rows)
+            self._finish()
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish()
+
+    def _finish(self):
+        """Report the statement in progress to the connection's QueryStats."""
+        sql = self._sql
+        if sql is None:
+            return
+        self._sql = None
+        stats = self.connection.stats
+        ms = self._elapsed * 1000
+        rows = self._rows if self._rows or self.rowcount < 0 else self.rowcount
+        stats.record(sql, ms, rows)
+        if ms >= stats.slow_ms:
+            stats.record_slow(sql, self._parameters, ms, self._plan(sql, self._parameters))
+
+    def _plan(self, sql, parameters):
+        """Return the EXPLAIN QUERY PLAN lines of a statement, if it has one."""
+        if parameters is None or not re.match(r"\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b",
+                                              sql, re.IGNORECASE):
+            return []
+        try:
+            cursor = self.connection.cursor(sqlite3.Cursor)
+            return [row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)]
+        except sqlite3.Error:
+            return []
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """
+    Connection whose statements are recorded in a QueryStats.
+
+    sqlite3.Connection.execute() bypasses cursor(), so execute() and
+    executemany() are routed through InstrumentedCursor explicitly, and
+    commit()/rollback() are timed as COMMIT and ROLLBACK.
+    """
+
+    stats = None
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        self._timed("COMMIT", super().commit)
+
+    def rollback(self):
+        self._timed("ROLLBACK", super().rollback)
+
+    def _timed(self, name, method):
+        """Run commit/rollback and record how long it took."""
+        start = time.perf_counter()
+        try:
+            method()
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            self.stats.record(name, ms, 0)
+            if ms >= self.stats.slow_ms:
+                self.stats.record_slow(name, (), ms, [])
@@ -0,0 +1,163 @@
+"""
+Load Test for the Movie HTTP API
+
+Opens several keep-alive connections to server.py over localhost and
+sends a mix of page, lookup, search and write requests for a fixed time,
+then reports throughput and p50/p99 latency per request type.
+
+Usage:
+    python server.py --database carga.db &
+    python load_test.py [--url http://127.0.0.1:8765] [--clients 32]
+                        [--seconds 10] [--write-ratio 0.1]
+
+Only the standard library is used, so it runs wherever server.py runs.
+"""
+
+# Import Python standard library modules
+import argparse                  # Command line parsing
+import asyncio                   # Concurrent clients
+import json                      # Request and response bodies
+import random                    # Request mix
+import time                      # Latency measurement
+from urllib.parse import urlsplit
+
+SEARCH_TERMS = ["fil", "drama", "acao", "filme 1", "com", "anim", "ficcao"]
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, body=None):
+        """Send a request and return (status, decoded JSON or None)."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        content = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(content)}\r\n\r\n"
+            .encode("latin-1") + content
+        )
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        raw = await self.reader.readexactly(length) if length else b""
+        return status, json.loads(raw) if raw else None
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def percentile(values, fraction):
+    """Return the value at the given fraction (0-1) of a sorted list."""
+    if not values:
+        return 0.0
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+async def run_client(client, deadline, args, latencies, errors):
+    """Send requests until the deadline, recording latency per type."""
+    # Ids seen in pages, used for lookups, updates and deletes
+    known_ids = [1]
+    while time.perf_counter() < deadline:
+        roll = random.random()
+        if roll < args.write_ratio:
+            kind = random.choice(("create", "update", "delete"))
+        else:
+            kind = random.choice(("page", "page", "lookup", "lookup", "search"))
+
+        movie_id = random.choice(known_ids)
+        if kind == "page":
+            request = ("GET", f"/movies?after_id={random.randint(0, 1000)}&limit=50", None)
+        elif kind == "lookup":
+            request = ("GET", f"/movies/{movie_id}", None)
+        elif kind == "search":
+            request = ("GET", f"/search?q={random.choice(SEARCH_TERMS).replace(' ', '+')}", None)
+        elif kind == "create":
+            request = ("POST", "/movies", {"titulo": f"Carga {random.random():.6f}",
+                                           "genero": "Drama", "ano": 2000})
+        elif kind == "update":
+            request = ("PUT", f"/movies/{movie_id}",
+                       {"titulo": f"Carga editado {random.random():.6f}",
+                        "genero": "Comédia", "ano": 2001})
+        else:
+            request = ("DELETE", f"/movies/{movie_id}", None)
+
+        start = time.perf_counter()
+        try:
+            status, payload = await client.request(*request)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            errors[kind] = errors.get(kind, 0) + 1
+            client.close()
+            client.writer = None
+            continue
+        latencies.setdefault(kind, []).append((time.perf_counter() - start) * 1000)
+
+        if status >= 500:
+            errors[kind] = errors.get(kind, 0) + 1
+        elif kind == "page" and payload["movies"]:
+            known_ids = [movie["id"] for movie in payload["movies"]]
+        elif kind == "create":
+            known_ids.append(payload["id"])
+
+
+async def run(args):
+    """Start the clients and print the report."""
+    url = urlsplit(args.url)
+    clients = [Client(url.hostname, url.port or 80) for _ in range(args.clients)]
+    latencies, errors = {}, {}
+    started = time.perf_counter()
+    deadline = started + args.seconds
+    try:
+        await asyncio.gather(*(run_client(client, deadline, args, latencies, errors)
+                               for client in clients))
+    finally:
+        for client in clients:
+            client.close()
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"\n{total:,} requisições em {elapsed:.1f}s com {args.clients} clientes "
+          f"({total / elapsed:,.0f} req/s)")
+    print(f"{'tipo':<10}{'n':>9}{'p50 ms':>10}{'p99 ms':>10}{'máx ms':>10}{'erros':>8}")
+    for kind in ("page", "lookup", "search", "create", "update", "delete"):
+        values = sorted(latencies.get(kind, []))
+        if not values and not errors.get(kind):
+            continue
+        print(f"{kind:<10}{len(values):>9,}{percentile(values, 0.5):>10.2f}"
+              f"{percentile(values, 0.99):>10.2f}{(values[-1] if values else 0):>10.2f}"
+              f"{errors.get(kind, 0):>8}")
+    every = sorted(value for values in latencies.values() for value in values)
+    print(f"{'total':<10}{len(every):>9,}{percentile(every, 0.5):>10.2f}"
+          f"{percentile(every, 0.99):>10.2f}{(every[-1] if every else 0):>10.2f}"
+          f"{sum(errors.values()):>8}")
+
+
+def main(argv=None):
+    """Parse the command line and run the load test."""
+    parser = argparse.ArgumentParser(description="Teste de carga da API de filmes")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.1,
+                        help="fração de escritas (padrão: %(default)s)")
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Command Line Management Tool for the Movie Database
+
+Runs maintenance tasks on filmes.db without starting the Kivy interface.
+
+Usage:
+    python manage.py migrate
+    python manage.py import catalogo.csv
+    python manage.py export catalogo.jsonl
+    python manage.py posters ingest|verify|gc
+    python manage.py stats [--check | --repair]
+    python manage.py sync outro_quiosque.db
+    python manage.py sync --new-node
+    python manage.py --database outro.db import catalogo.jsonl --chunk-size 100000
+"""
+
+# Import Python standard library modules
+import argparse  # Command line parsing
+import sqlite3   # Database errors
+import sys       # Exit codes
+import time      # Elapsed time reporting
+
+import catalog_io
+import migrations
+import sync
+from database import DatabaseManager
+from poster_store import PosterStore
+
+
+def command_migrate(args):
+    """Report the schema version (main() has already applied migrations)."""
+    for version, description, _ in migrations.MIGRATIONS:
+        status = "aplicada agora" if version in args.applied else "ok"
+        print(f"{version:>3}  {description:<40} {status}")
+    print(f"Banco {args.database} na versão {migrations.latest_version()}")
+    return 0
+
+
+def command_import(args):
+    """Import movies from a CSV or JSON Lines file."""
+    start = time.perf_counter()
+    result = catalog_io.import_catalog(args.file, args.format, args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    print(f"{result.imported:,} filmes importados em {elapsed:.2f}s "
+          f"({result.imported / max(elapsed, 1e-9):,.0f} linhas/s)")
+    if result.duplicates:
+        print(f"{result.duplicates:,} filmes já cadastrados ignorados")
+    if result.rejected:
+        lines = ", ".join(str(line) for line in result.rejected_lines)
+        print(f"{result.rejected:,} linhas rejeitadas (primeiras: {lines})")
+    return 0
+
+
+def command_export(args):
+    """Export every movie to a CSV or JSON Lines file."""
+    start = time.perf_counter()
+    count = catalog_io.export_catalog(args.file, args.format)
+    print(f"{count:,} filmes exportados em {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def command_posters(args):
+    """
+    Maintain the content-addressed poster store.
+
+    ingest  copies the image paths of older movies into the store
+    verify  recomputes every hash and lists missing referenced posters
+    gc      deletes posters no movie references (run with the app closed)
+    """
+    store = PosterStore.for_database(args.database)
+
+    if args.action == "ingest":
+        stored, failed = 0, []
+        for movie_id, image_path in DatabaseManager.get_movies_without_poster():
+            try:
+                DatabaseManager.set_movie_poster(movie_id, store.put(image_path))
+                stored += 1
+            except (OSError, ValueError) as error:
+                failed.append((movie_id, image_path, error))
+        print(f"{stored:,} pôsteres importados para {store.root}")
+        for movie_id, image_path, error in failed:
+            print(f"  filme {movie_id}: {image_path} ({error})")
+        return 0
+
+    if args.action == "verify":
+        result = store.verify_all(DatabaseManager.get_poster_hashes())
+        for sha256 in result["corrupted"]:
+            print(f"corrompido: {sha256}")
+        for sha256 in result["missing"]:
+            print(f"ausente:    {sha256}")
+        if result["corrupted"] or result["missing"]:
+            return 1
+        print("Acervo íntegro")
+        return 0
+
+    removed = store.remove_unreferenced(DatabaseManager.prune_posters())
+    print(f"{removed:,} arquivos sem referência removidos")
+    return 0
+
+
+def command_stats(args):
+    """Print movies per genre and per decade, or check the summary table."""
+    if args.check or args.repair:
+        differences = DatabaseManager.check_statistics(repair=args.repair)
+        for genre, year, counted, recorded in differences:
+            print(f"{genre} ({year}): contados {counted}, registrados {recorded}")
+        if not differences:
+            print("Resumo consistente com a tabela de filmes")
+            return 0
+        if args.repair:
+            print(f"{len(differences)} divergências corrigidas")
+            return 0
+        return 1
+
+    for genre, total in DatabaseManager.get_genre_statistics():
+        print(f"{genre:<30}{total:>10,}")
+    print()
+    for decade, total in DatabaseManager.get_decade_statistics():
+        print(f"{str(decade) + 's':<30}{total:>10,}")
+    return 0
+
+
+def command_sync(args):
+    """Exchange the changes made since the last sync with another file."""
+    pool = DatabaseManager.get_pool()
+    if args.new_node:
+        print(f"Novo identificador de nó: {sync.new_node_id(pool)}")
+        return 0
+    if not args.peer:
+        print("Informe o banco com que sincronizar", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    pulled, pushed = sync.sync(pool, args.peer)
+    print(f"Recebidas de {args.peer}: {pulled.received:,} alterações, "
+          f"{pulled.applied:,} aplicadas, {pulled.skipped:,} ignoradas")
+    print(f"Enviadas para {args.peer}: {pushed.received:,} alterações, "
+          f"{pushed.applied:,} aplicadas, {pushed.skipped:,} ignoradas")
+    print(f"Concluído em {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def build_parser():
+    """Create the argument parser with one subcommand per task."""
+    parser = argparse.ArgumentParser(description="Gerenciamento do banco de filmes")
+    parser.add_argument(
+        "--database", default=DatabaseManager.DATABASE_NAME,
+        help="arquivo SQLite (padrão: %(default)s)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrator = subparsers.add_parser("migrate", help="atualiza o esquema do banco")
+    migrator.set_defaults(func=command_migrate)
+
+    importer = subparsers.add_parser("import", help="importa filmes de CSV ou JSON Lines")
+    importer.add_argument("file")
+    importer.add_argument("--format", choices=("csv", "jsonl"))
+    importer.add_argument("--chunk-size", type=int, default=50_000,
+                          help="linhas por transação (padrão: %(default)s)")
+    importer.set_defaults(func=command_import)
+
+    exporter = subparsers.add_parser("export", help="exporta filmes para CSV ou JSON Lines")
+    exporter.add_argument("file")
+    exporter.add_argument("--format", choices=("csv", "jsonl"))
+    exporter.set_defaults(func=command_export)
+
+    posters = subparsers.add_parser("posters", help="mantém o acervo de pôsteres")
+    posters.add_argument("action", choices=("ingest", "verify", "gc"))
+    posters.set_defaults(func=command_posters)
+
+    stats = subparsers.add_parser("stats", help="filmes por gênero e por década")
+    checks = stats.add_mutually_exclusive_group()
+    checks.add_argument("--check", action="store_true",
+                        help="recontar os filmes e comparar com o resumo")
+    checks.add_argument("--repair", action="store_true",
+                        help="como --check, reconstruindo o resumo se divergir")
+    stats.set_defaults(func=command_stats)
+
+    syncer = subparsers.add_parser("sync", help="sincroniza com outro arquivo de banco")
+    syncer.add_argument("peer", nargs="?")
+    syncer.add_argument("--new-node", action="store_true",
+                        help="gera um novo identificador (depois de copiar o arquivo)")
+    syncer.set_defaults(func=command_sync)
+
+    return parser
+
+
+def main(argv=None):
+    """Entry point for the management commands."""
+    args = build_parser().parse_args(argv)
+    DatabaseManager.use_database(args.database)
+    try:
+        args.applied = DatabaseManager.create_database()
+        return args.func(args)
+    except (OSError, ValueError, RuntimeError, sqlite3.Error) as error:
+        print(f"Erro: {error}", file=sys.stderr)
+        return 1
+    finally:
+        DatabaseManager.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,463 @@
+"""
+Versioned Schema Migrations
+
+The schema version of a database file is stored in SQLite's own header
+field, PRAGMA user_version. Each migration is a function registered with
+the @migration decorator under the version it produces; migrate() applies
+the missing ones in order, inside a single transaction, and then stores the
+new version. If any step fails the whole upgrade rolls back and the file is
+left exactly as it was.
+
+On a database that is already current, migrate() reads user_version once
+and returns, so running it on every launch costs a single pragma.
+
+Databases created before this module existed report user_version 0 even
+though they may already have the filmes table, the search index or the
+secondary indexes. The first migrations therefore use IF NOT EXISTS and
+upgrade those files in place without touching their rows. Later migrations
+can assume the schema of the previous version.
+
+Adding a migration:
+
+    @migration(4, "coluna de sinopse")
+    def _add_synopsis(conn):
+        conn.execute("ALTER TABLE filmes ADD COLUMN sinopse TEXT")
+"""
+
+# Import Python standard library modules
+import hashlib  # Stable uids for rows that predate synchronization
+
+# Current time in milliseconds since the epoch, as an SQL expression
+NOW_MS = "CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)"
+
+# This database's node id (see sync.py), as an SQL expression
+LOCAL_NODE = "(SELECT valor FROM sync_local WHERE chave = 'no')"
+
+# Uid of a new movie: creation time, node and random suffix. Leading with
+# the time keeps inserts at the end of the uid index instead of scattered.
+NEW_UID = f"printf('%012x', {NOW_MS}) || {LOCAL_NODE} || lower(hex(randomblob(4)))"
+
+# Ordered list of (version, description, function)
+MIGRATIONS = []
+
+
+def migration(version, description):
+    """
+    Register a migration function for the given schema version.
+
+    Versions must be registered in increasing order without gaps.
+
+    Args:
+        version (int): Schema version after the migration runs
+        description (str): Short summary shown by manage.py migrate
+    """
+    def register(function):
+        expected = len(MIGRATIONS) + 1
+        if version != expected:
+            raise ValueError(f"Migração {version} fora de ordem (esperada {expected})")
+        MIGRATIONS.append((version, description, function))
+        return function
+    return register
+
+
+def latest_version():
+    """Return the schema version produced by the last migration."""
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def current_version(conn):
+    """Return the schema version stored in the database file."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending_migrations(conn):
+    """Return the (version, description, function) entries not yet applied."""
+    version = current_version(conn)
+    return [entry for entry in MIGRATIONS if entry[0] > version]
+
+
+def migrate(pool):
+    """
+    Bring the database up to latest_version().
+
+    Args:
+        pool (ConnectionPool): Pool bound to the database file
+
+    Returns:
+        list: Versions applied by this call (empty when already current)
+
+    Raises:
+        RuntimeError: If the file was written by a newer version of the app
+    """
+    latest = latest_version()
+    version = current_version(pool.connection())
+    if version == latest:
+        return []
+    if version > latest:
+        raise RuntimeError(
+            f"Banco na versão {version}, mais nova que a suportada ({latest})")
+
+    with pool.transaction() as conn:
+        # BEGIN IMMEDIATE holds the write lock: read the version again in
+        # case another process migrated the file in the meantime
+        applied = []
+        for version, _, function in pending_migrations(conn):
+            function(conn)
+            applied.append(version)
+        if applied:
+            # user_version is part of the transaction and rolls back with it
+            conn.execute(f"PRAGMA user_version = {latest}")
+    return applied
+
+
+@migration(1, "tabela filmes")
+def _create_movies_table(conn):
+    """Create the movies table (present in every pre-migration database)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS filmes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- Unique identifier
+            titulo TEXT NOT NULL,                   -- Movie title (required)
+            genero TEXT NOT NULL,                   -- Movie genre (required)
+            ano INTEGER NOT NULL,                   -- Release year (required)
+            imagem TEXT                             -- Image path (optional)
+        )
+    """)
+
+
+@migration(2, "busca textual FTS5")
+def _create_search_index(conn):
+    """
+    Full-text index over titles and genres (content lives in filmes).
+
+    The unicode61 tokenizer with remove_diacritics folds accents, so "acao"
+    matches "Ação". Prefix indexes speed up search-as-you-type. Triggers
+    keep the index in sync with filmes.
+    """
+    fts_exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'filmes_fts'"
+    ).fetchone()
+
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS filmes_fts USING fts5(
+            titulo,
+            genero,
+            content = 'filmes',
+            content_rowid = 'id',
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3 4 5'
+        )
+    """)
+    # executescript() would commit the open transaction, so each trigger is
+    # created with its own execute()
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS filmes_fts_insert AFTER INSERT ON filmes BEGIN
+            INSERT INTO filmes_fts (rowid, titulo, genero)
+            VALUES (new.id, new.titulo, new.genero);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS filmes_fts_delete AFTER DELETE ON filmes BEGIN
+            INSERT INTO filmes_fts (filmes_fts, rowid, titulo, genero)
+            VALUES ('delete', old.id, old.titulo, old.genero);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS filmes_fts_update AFTER UPDATE OF titulo, genero ON filmes BEGIN
+            INSERT INTO filmes_fts (filmes_fts, rowid, titulo, genero)
+            VALUES ('delete', old.id, old.titulo, old.genero);
+            INSERT INTO filmes_fts (rowid, titulo, genero)
+            VALUES (new.id, new.titulo, new.genero);
+        END
+    """)
+
+    # Index movies that existed before the search table was added
+    if not fts_exists:
+        conn.execute("INSERT INTO filmes_fts (filmes_fts) VALUES ('rebuild')")
+
+
+@migration(3, "índices de filtro e ordenação")
+def _create_query_indexes(conn):
+    """Indexes backing MovieQuery filters and sorts."""
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_filmes_genero_ano ON filmes (genero, ano)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_filmes_ano ON filmes (ano)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_filmes_titulo_nocase "
+        "ON filmes (titulo COLLATE NOCASE)")
+
+
+@migration(4, "acervo de pôsteres")
+def _create_poster_table(conn):
+    """
+    Content-addressed posters (poster_store.py).
+
+    filmes.poster holds the SHA-256 of the stored image; imagem keeps the
+    path the user typed, so older rows without a stored poster still show
+    their file. Each distinct image is registered once in posters, however
+    many movies use it.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS posters (
+            sha256 TEXT PRIMARY KEY,               -- Hex digest of the bytes
+            extensao TEXT NOT NULL,                -- Image format (png, jpg...)
+            bytes INTEGER NOT NULL                 -- Size of the original file
+        )
+    """)
+    conn.execute("ALTER TABLE filmes ADD COLUMN poster TEXT REFERENCES posters (sha256)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_filmes_poster ON filmes (poster)")
+
+
+@migration(5, "estatísticas por gênero e ano")
+def _create_statistics_table(conn):
+    """
+    Movie counts per (genero, ano), maintained by triggers.
+
+    "Movies per genre" and "movies per decade" read this table, whose size
+    is the number of distinct genre/year pairs, instead of scanning filmes.
+    Each trigger touches at most two rows, and pairs whose count drops to
+    zero are deleted so the table never grows with dead entries.
+    DatabaseManager.check_statistics() rebuilds the counts from filmes to
+    verify them.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS filmes_estatisticas (
+            genero TEXT NOT NULL,
+            ano INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            PRIMARY KEY (genero, ano)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS filmes_estatisticas_insert AFTER INSERT ON filmes BEGIN
+            INSERT INTO filmes_estatisticas (genero, ano, total) VALUES (new.genero, new.ano, 1)
+            ON CONFLICT (genero, ano) DO UPDATE SET total = total + 1;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS filmes_estatisticas_delete AFTER DELETE ON filmes BEGIN
+            UPDATE filmes_estatisticas SET total = total - 1
+            WHERE genero = old.genero AND ano = old.ano;
+            DELETE FROM filmes_estatisticas
+            WHERE genero = old.genero AND ano = old.ano AND total <= 0;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS filmes_estatisticas_update AFTER UPDATE OF genero, ano ON filmes
+        WHEN old.genero IS NOT new.genero OR old.ano IS NOT new.ano BEGIN
+            UPDATE filmes_estatisticas SET total = total - 1
+            WHERE genero = old.genero AND ano = old.ano;
+            DELETE FROM filmes_estatisticas
+            WHERE genero = old.genero AND ano = old.ano AND total <= 0;
+            INSERT INTO filmes_estatisticas (genero, ano, total) VALUES (new.genero, new.ano, 1)
+            ON CONFLICT (genero, ano) DO UPDATE SET total = total + 1;
+        END
+    """)
+    conn.execute("DELETE FROM filmes_estatisticas")
+    conn.execute("""
+        INSERT INTO filmes_estatisticas (genero, ano, total)
+        SELECT genero, ano, COUNT(*) FROM filmes GROUP BY genero, ano
+    """)
+
+
+@migration(6, "registro de alterações para sincronização")
+def _create_change_log(conn):
+    """
+    Change feed used by sync.py to exchange deltas between database files.
+
+    Row ids are local to each file, so every movie gets a global uid plus
+    the version stamp compared by last-writer-wins: atualizado_em (ms since
+    the epoch, never lower than the previous stamp of the row + 1) and
+    origem (node id of the writer, breaking ties).
+
+    alteracoes holds one entry per uid, replaced on every change, so its
+    AUTOINCREMENT seq is a monotonic feed position and the log never grows
+    beyond the number of movies ever written. Deleted movies stay as
+    tombstones (excluido = 1) carrying the stamp of the deletion.
+
+    Rows that already exist get a uid derived from their id and content,
+    so two copies of the same file made by hand before this migration
+    agree on the uid of identical rows instead of duplicating them.
+    """
+    conn.execute("ALTER TABLE filmes ADD COLUMN uid TEXT")
+    conn.execute("ALTER TABLE filmes ADD COLUMN atualizado_em INTEGER NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE filmes ADD COLUMN origem TEXT NOT NULL DEFAULT ''")
+    conn.executemany(
+        "UPDATE filmes SET uid = ? WHERE id = ?",
+        ((hashlib.sha1(f"{movie_id}|{title}|{genre}|{year}".encode("utf-8")).hexdigest()[:32],
+          movie_id)
+         for movie_id, title, genre, year in conn.execute(
+             "SELECT id, titulo, genero, ano FROM filmes").fetchall())
+    )
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_filmes_uid ON filmes (uid)")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sync_local (
+            chave TEXT PRIMARY KEY,
+            valor TEXT NOT NULL
+        )
+    """)
+    conn.execute(
+        "INSERT OR IGNORE INTO sync_local (chave, valor) "
+        "VALUES ('no', lower(hex(randomblob(8))))")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sync_estado (
+            par TEXT PRIMARY KEY,                  -- Node id of the other file
+            ultimo_seq INTEGER NOT NULL            -- Last seq received from it
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS alteracoes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            uid TEXT NOT NULL UNIQUE,
+            excluido INTEGER NOT NULL,             -- 1 for a tombstone
+            atualizado_em INTEGER NOT NULL,        -- Stamp of a deletion
+            origem TEXT NOT NULL
+        )
+    """)
+    conn.execute(
+        "INSERT OR IGNORE INTO alteracoes (uid, excluido, atualizado_em, origem) "
+        "SELECT uid, 0, atualizado_em, origem FROM filmes ORDER BY id")
+
+    # New rows: the application inserts without a uid and the trigger
+    # stamps the row; sync.py inserts remote rows with their own uid
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS filmes_sync_stamp_insert AFTER INSERT ON filmes
+        WHEN new.uid IS NULL BEGIN
+            UPDATE filmes SET uid = {NEW_UID},
+                              atualizado_em = {NOW_MS},
+                              origem = {LOCAL_NODE}
+            WHERE id = new.id;
+        END
+    """)
+    # Local edits bump the stamp; sync.py sets the remote version itself,
+    # so the trigger leaves rows whose version changed in the same statement
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS filmes_sync_stamp_update
+        AFTER UPDATE OF titulo, genero, ano, imagem, poster ON filmes
+        WHEN new.atualizado_em IS old.atualizado_em AND new.origem IS old.origem BEGIN
+            UPDATE filmes SET atualizado_em = MAX({NOW_MS}, old.atualizado_em + 1),
+                              origem = {LOCAL_NODE}
+            WHERE id = new.id;
+        END
+    """)
+    # Every stamp change ends up here, whichever statement made it
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS filmes_sync_log_insert AFTER INSERT ON filmes
+        WHEN new.uid IS NOT NULL BEGIN
+            INSERT OR REPLACE INTO alteracoes (uid, excluido, atualizado_em, origem)
+            VALUES (new.uid, 0, new.atualizado_em, new.origem);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS filmes_sync_log_update
+        AFTER UPDATE OF uid, atualizado_em ON filmes
+        WHEN new.uid IS NOT NULL BEGIN
+            INSERT OR REPLACE INTO alteracoes (uid, excluido, atualizado_em, origem)
+            VALUES (new.uid, 0, new.atualizado_em, new.origem);
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS filmes_sync_log_delete AFTER DELETE ON filmes
+        WHEN old.uid IS NOT NULL BEGIN
+            INSERT OR REPLACE INTO alteracoes (uid, excluido, atualizado_em, origem)
+            VALUES (old.uid, 1, MAX({NOW_MS}, old.atualizado_em + 1), {LOCAL_NODE});
+        END
+    """)
+
+
+@migration(7, "chave normalizada e remoção de duplicados")
+def _deduplicate_movies(conn):
+    """
+    Unique key on (normalized title, year) after merging existing duplicates.
+
+    titulo_normalizado is filled in batches by id. Duplicates are then
+    found in a single pass over an index sorted by (key, id): equal keys
+    are adjacent, so each row is compared only with the one before it,
+    O(n) after the O(n log n) index build instead of comparing every pair.
+    The oldest movie of each group is kept; it inherits an image or poster
+    from a duplicate when it has none, and the others are deleted (the
+    search, statistics and sync triggers see ordinary deletes).
+    """
+    # database.py imports this module, so the function is looked up here
+    from database import normalize_title
+
+    conn.execute("ALTER TABLE filmes ADD COLUMN titulo_normalizado TEXT")
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, titulo FROM filmes WHERE id > ? ORDER BY id LIMIT 10000", (last_id,)
+        ).fetchall()
+        if not rows:
+            break
+        conn.executemany(
+            "UPDATE filmes SET titulo_normalizado = ? WHERE id = ?",
+            ((normalize_title(title), movie_id) for movie_id, title in rows))
+        last_id = rows[-1][0]
+
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_filmes_chave_ordenada "
+        "ON filmes (titulo_normalizado, ano, id)")
+    duplicates = []
+    inherited = []
+    previous = None  # (key, year, id, imagem, poster) of the kept movie
+    for movie_id, key, year, image_path, poster in conn.execute(
+            "SELECT id, titulo_normalizado, ano, imagem, poster FROM filmes "
+            "ORDER BY titulo_normalizado, ano, id"):
+        if previous is not None and previous[:2] == (key, year):
+            duplicates.append((movie_id,))
+            if (image_path or poster) and not (previous[3] or previous[4]):
+                previous = (key, year, previous[2], image_path, poster)
+                inherited.append((image_path, poster, previous[2]))
+            continue
+        previous = (key, year, movie_id, image_path, poster)
+
+    conn.executemany("UPDATE filmes SET imagem = ?, poster = ? WHERE id = ?", inherited)
+    conn.executemany("DELETE FROM filmes WHERE id = ?", duplicates)
+    conn.execute("DROP INDEX idx_filmes_chave_ordenada")
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_filmes_chave_normalizada "
+        "ON filmes (titulo_normalizado, ano)")
+
+    # Inside a trigger, the conflict clause of the statement that fired it
+    # wins: under add_movie()'s INSERT ... ON CONFLICT DO UPDATE, the
+    # INSERT OR REPLACE of the change feed triggers fails on the uid. The
+    # entry is deleted and inserted instead, which still gives it a new seq.
+    for name, event, condition, values in (
+            ("insert", "INSERT", "new.uid IS NOT NULL",
+             "new.uid, 0, new.atualizado_em, new.origem"),
+            ("update", "UPDATE OF uid, atualizado_em", "new.uid IS NOT NULL",
+             "new.uid, 0, new.atualizado_em, new.origem"),
+            ("delete", "DELETE", "old.uid IS NOT NULL",
+             f"old.uid, 1, MAX({NOW_MS}, old.atualizado_em + 1), {LOCAL_NODE}")):
+        row = "old" if name == "delete" else "new"
+        conn.execute(f"DROP TRIGGER IF EXISTS filmes_sync_log_{name}")
+        conn.execute(f"""
+            CREATE TRIGGER filmes_sync_log_{name} AFTER {event} ON filmes
+            WHEN {condition} BEGIN
+                DELETE FROM alteracoes WHERE uid = {row}.uid;
+                INSERT INTO alteracoes (uid, excluido, atualizado_em, origem)
+                VALUES ({values});
+            END
+        """)
+
+
+@migration(8, "versão da linha para edição concorrente")
+def _add_row_version(conn):
+    """
+    Row version for optimistic concurrency.
+
+    Every UPDATE of a movie in database.py and sync.py also sets
+    versao = versao + 1. An edit made from a form sends back the version it
+    was loaded with (update_movie(version=...)), and the UPDATE matches
+    only "id = ? AND versao = ?": the primary key finds the row and the
+    version is compared on that row alone, so the check adds no index and
+    no extra query to a successful save.
+    """
+    conn.execute("ALTER TABLE filmes ADD COLUMN versao INTEGER NOT NULL DEFAULT 1")
+
+    # Create the empty planner statistics table now. Otherwise the first
+    # PRAGMA optimize (ConnectionPool.close_all) creates it, a schema change
+    # that makes statements running in other processes on the same file
+    # fail with "no such table"
+    conn.execute("ANALYZE sqlite_schema")
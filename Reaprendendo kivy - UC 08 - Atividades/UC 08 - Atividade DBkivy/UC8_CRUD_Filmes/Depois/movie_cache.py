@@ -0,0 +1,195 @@
+"""
+Read-Through Movie Cache
+
+MovieCache sits in front of DatabaseManager and answers repeated reads
+from memory:
+- Single movies by id (get_movie_by_id), e.g. opening the edit screen
+- Pages of the list (get_movies_page) and search results (search_movies)
+
+Entries live in one LRU bounded by an estimate of their memory use. The
+cache subscribes to DatabaseManager change events, which are published
+right after each commit, and drops only the entries a write can affect:
+the changed ids, the pages whose id range covers them and the searches
+that could now match differently.
+
+The cache is thread-safe, so DatabaseWorker reader threads can call it.
+hits, misses, evictions and invalidations are counted for tuning MAX_BYTES;
+see stats().
+"""
+
+# Import Python standard library modules
+import threading                     # Reader threads share the cache
+from collections import OrderedDict  # LRU order
+
+from database import DatabaseManager
+
+
+class MovieCache:
+    """
+    LRU cache of movie rows and query results with write invalidation.
+
+    Attributes:
+        max_bytes (int): Approximate memory budget of the cached entries
+        hits (int): Reads answered from memory
+        misses (int): Reads that went to the database
+        evictions (int): Entries dropped to respect max_bytes
+        invalidations (int): Entries dropped because of a write
+    """
+
+    # Default memory budget (bytes)
+    MAX_BYTES = 8 * 1024 * 1024
+
+    # Estimated overhead of one cached row (tuple, int, dict slot)
+    ROW_OVERHEAD = 200
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, cost), least recent first
+        self._bytes = 0
+        self._version = 0              # Bumped by every write event
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        DatabaseManager.subscribe(self._on_movies_changed)
+
+    def get_movie_by_id(self, movie_id):
+        """Cached DatabaseManager.get_movie_by_id()."""
+        return self._read(("movie", movie_id), DatabaseManager.get_movie_by_id, movie_id)
+
+    def get_movies_page(self, after_id=0, limit=50):
+        """Cached DatabaseManager.get_movies_page(); also caches each row."""
+        movies = self._read(("page", after_id, limit),
+                            DatabaseManager.get_movies_page, after_id, limit)
+        return list(movies)
+
+    def search_movies(self, text, limit=50):
+        """Cached DatabaseManager.search_movies()."""
+        movies = self._read(("search", text, limit),
+                            DatabaseManager.search_movies, text, limit)
+        return list(movies)
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: hits, misses, hit_rate, evictions, invalidations, entries
+            and bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def clear(self):
+        """Drop every entry (the counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._version += 1
+
+    def invalidate(self, movie_ids):
+        """
+        Drop the entries of movies changed outside this process.
+
+        Another instance writing to the same filmes.db publishes no events
+        here; a MovieConflictError is how the application finds out.
+        """
+        self._on_movies_changed(DatabaseManager.MOVIES_UPDATED, movie_ids)
+
+    def close(self):
+        """Stop listening to DatabaseManager and drop every entry."""
+        DatabaseManager.unsubscribe(self._on_movies_changed)
+        self.clear()
+
+    def _read(self, key, loader, *args):
+        """Return the cached value for key, loading it on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            version = self._version
+
+        value = loader(*args)
+        if isinstance(value, list):
+            value = tuple(value)
+
+        with self._lock:
+            # A write committed while we were reading: the value may be
+            # stale, so return it without caching it
+            if version != self._version:
+                return value
+            self._store(key, value)
+            if key[0] == "page":
+                for movie in value:
+                    if ("movie", movie[0]) not in self._entries:
+                        self._store(("movie", movie[0]), movie)
+        return value
+
+    def _cost(self, value):
+        """Estimate the memory held by a row or a tuple of rows."""
+        if value is None:
+            return self.ROW_OVERHEAD
+        if value and isinstance(value[0], tuple):
+            return sum(self._cost(movie) for movie in value)
+        return self.ROW_OVERHEAD + sum(len(field) for field in value if isinstance(field, str))
+
+    def _store(self, key, value):
+        """Insert an entry and evict the least recently used ones (lock held)."""
+        cost = self._cost(value)
+        if cost > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        self._entries[key] = (value, cost)
+        self._bytes += cost
+        while self._bytes > self.max_bytes:
+            _, (_, evicted_cost) = self._entries.popitem(last=False)
+            self._bytes -= evicted_cost
+            self.evictions += 1
+
+    def _affected(self, key, value, event, movie_ids):
+        """Tell whether a write of movie_ids can change a cached entry."""
+        kind = key[0]
+        if kind == "movie":
+            return key[1] in movie_ids
+
+        if kind == "search":
+            # New or edited titles may start matching any search
+            if event != DatabaseManager.MOVIES_DELETED:
+                return True
+            return any(movie[0] in movie_ids for movie in value)
+
+        # Page of ids in (after_id, last id]; a short page is the end of the
+        # table and also covers every id inserted after it
+        _, after_id, limit = key
+        last_id = value[-1][0] if len(value) == limit else float("inf")
+        if isinstance(movie_ids, range):
+            return bool(movie_ids) and movie_ids[-1] > after_id and movie_ids[0] <= last_id
+        return any(after_id < movie_id <= last_id for movie_id in movie_ids)
+
+    def _on_movies_changed(self, event, movie_ids):
+        """Invalidate the entries affected by a committed write."""
+        if not isinstance(movie_ids, range):  # Bulk imports publish a range
+            movie_ids = set(movie_ids)
+        with self._lock:
+            self._version += 1
+            stale = [key for key, (value, _) in self._entries.items()
+                     if self._affected(key, value, event, movie_ids)]
+            for key in stale:
+                _, cost = self._entries.pop(key)
+                self._bytes -= cost
+            self.invalidations += len(stale)
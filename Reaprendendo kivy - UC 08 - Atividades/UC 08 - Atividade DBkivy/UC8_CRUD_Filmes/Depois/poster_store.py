@@ -0,0 +1,279 @@
+"""
+Content-Addressed Poster Store
+
+Posters are copied into the store once and named after the SHA-256 of
+their bytes, so the database references content instead of free-form
+paths:
+- Saving the same image twice, from any location, stores it once
+- A movie's poster can never change or disappear behind its back: the
+  object file for a hash is immutable, and verify() recomputes the hash to
+  detect corruption
+- Size-bucketed derivatives (160, 320 and 640 px wide) are generated on
+  demand with Pillow and cached next to the originals
+
+Layout, next to the database file by default:
+
+    posters/objects/ab/ab12...ef.jpg      original bytes
+    posters/derivatives/320/ab12...ef.png downscaled copy
+
+Object files are read through mmap, both for hashing and for decoding
+derivatives, so large posters are never copied into Python memory
+wholesale; server.py sends them with sendfile(). The module does not
+import Kivy.
+"""
+
+# Import Python standard library modules
+import hashlib                    # Content addresses
+import mmap                       # Zero-copy reads of object files
+import os                         # Paths and atomic renames
+import shutil                     # Copying new posters into the store
+import tempfile                   # Unique temporary file names
+from collections import namedtuple
+
+try:
+    from PIL import Image  # Pillow (listed in requirements.txt)
+except ImportError:
+    Image = None
+
+# Registered poster: hex digest, file extension and size in bytes
+PosterInfo = namedtuple("PosterInfo", "sha256 extension size")
+
+# File signatures of the accepted image formats
+SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpg"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"BM", "bmp"),
+)
+
+
+def sniff_extension(header):
+    """
+    Return the image extension for the first bytes of a file.
+
+    Raises:
+        ValueError: If the bytes are not a supported image format
+    """
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    for signature, extension in SIGNATURES:
+        if header.startswith(signature):
+            return extension
+    raise ValueError("O arquivo não é uma imagem suportada (PNG, JPEG, GIF, BMP ou WebP)")
+
+
+def _mapped(path):
+    """Open a file read-only and return (file, mmap); empty files map to b''."""
+    file = open(path, "rb")
+    if os.fstat(file.fileno()).st_size == 0:
+        return file, b""
+    return file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _digest(path):
+    """SHA-256 of a file, hashed straight from its memory map."""
+    file, data = _mapped(path)
+    try:
+        return hashlib.sha256(data).hexdigest()
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+        file.close()
+
+
+class PosterStore:
+    """
+    Poster files addressed by SHA-256.
+
+    Attributes:
+        root (str): Store directory
+    """
+
+    # Widths of the generated derivatives, smallest first
+    BUCKETS = (160, 320, 640)
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+
+    @classmethod
+    def for_database(cls, database):
+        """Store kept in a "posters" directory beside the database file."""
+        return cls(os.path.join(os.path.dirname(os.path.abspath(database)), "posters"))
+
+    def object_path(self, sha256, extension):
+        """Path of the original bytes of a poster."""
+        return os.path.join(self.root, "objects", sha256[:2], f"{sha256}.{extension}")
+
+    def locate(self, sha256):
+        """Return the object path of a hash, whatever its extension, or None."""
+        folder = os.path.join(self.root, "objects", sha256[:2])
+        try:
+            for name in os.listdir(folder):
+                if name.split(".", 1)[0] == sha256:
+                    return os.path.join(folder, name)
+        except FileNotFoundError:
+            pass
+        return None
+
+    def put(self, path):
+        """
+        Add a poster to the store (or find the identical one already there).
+
+        Args:
+            path (str): Image file typed by the user
+
+        Returns:
+            PosterInfo: Hash, extension and size of the stored poster
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If it is not a supported image
+        """
+        with open(path, "rb") as file:
+            extension = sniff_extension(file.read(16))
+
+        # Copy first and hash the copy, so the name always matches the
+        # stored bytes even if the source file changes meanwhile
+        # mkstemp: unique even across processes (the app and manage.py may
+        # both be adding posters), unlike a name derived from the thread id
+        handle, temporary = tempfile.mkstemp(prefix="put.", suffix=".tmp",
+                                             dir=os.path.join(self.root, "objects"))
+        os.close(handle)
+        try:
+            shutil.copyfile(path, temporary)
+            sha256 = _digest(temporary)
+            size = os.path.getsize(temporary)
+            target = self.object_path(sha256, extension)
+            # Deduplication: identical bytes are already stored under this
+            # hash. A size mismatch means the stored copy is damaged.
+            if os.path.exists(target) and os.path.getsize(target) == size:
+                os.remove(temporary)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(temporary, target)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        return PosterInfo(sha256, extension, size)
+
+    def read(self, sha256):
+        """
+        Return the bytes of a poster through a memory map.
+
+        The caller must close the returned object (use it in a with block).
+
+        Raises:
+            FileNotFoundError: If the hash is not in the store
+        """
+        path = self.locate(sha256)
+        if path is None:
+            raise FileNotFoundError(f"Pôster {sha256} não está no acervo")
+        file, data = _mapped(path)
+        file.close()  # The map stays valid after the file is closed
+        if not isinstance(data, mmap.mmap):
+            raise ValueError(f"Pôster {sha256} está vazio (arquivo corrompido)")
+        return data
+
+    def verify(self, sha256):
+        """Return True if the stored bytes still hash to sha256."""
+        path = self.locate(sha256)
+        return path is not None and _digest(path) == sha256
+
+    def verify_all(self, expected=()):
+        """
+        Check the integrity of the whole store.
+
+        Args:
+            expected (iterable): Hashes referenced by the database
+
+        Returns:
+            dict: "corrupted" (hash mismatch) and "missing" (referenced but
+            absent) lists of hashes
+        """
+        corrupted = []
+        stored = set()
+        objects = os.path.join(self.root, "objects")
+        for folder in sorted(os.listdir(objects)):
+            if not os.path.isdir(os.path.join(objects, folder)):
+                continue
+            for name in sorted(os.listdir(os.path.join(objects, folder))):
+                if name.endswith(".tmp"):
+                    continue
+                sha256 = name.split(".", 1)[0]
+                stored.add(sha256)
+                if _digest(os.path.join(objects, folder, name)) != sha256:
+                    corrupted.append(sha256)
+        missing = sorted(set(expected) - stored)
+        return {"corrupted": corrupted, "missing": missing}
+
+    def remove_unreferenced(self, referenced):
+        """
+        Delete objects and derivatives whose hash is not referenced.
+
+        Temporary files (*.tmp) are skipped: they belong to a put() or a
+        derivative being written, possibly by another process.
+        """
+        referenced = set(referenced)
+        removed = 0
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                if name.split(".", 1)[0] not in referenced:
+                    os.remove(os.path.join(directory, name))
+                    removed += 1
+        return removed
+
+    @classmethod
+    def bucket(cls, width):
+        """Smallest derivative width that is at least the requested width."""
+        for bucket in cls.BUCKETS:
+            if width <= bucket:
+                return bucket
+        return cls.BUCKETS[-1]
+
+    def derivative_path(self, sha256, width):
+        """Path where the derivative of a poster for width is (or will be) kept."""
+        return os.path.join(self.root, "derivatives", str(self.bucket(width)), f"{sha256}.png")
+
+    def derivative(self, sha256, width):
+        """
+        Return the path of a downscaled copy no narrower than width.
+
+        The copy is generated once per (hash, bucket) and reused; without
+        Pillow the original object path is returned.
+
+        Raises:
+            FileNotFoundError: If the hash is not in the store
+        """
+        if Image is None:
+            source = self.locate(sha256)
+            if source is None:
+                raise FileNotFoundError(f"Pôster {sha256} não está no acervo")
+            return source
+
+        bucket = self.bucket(width)
+        target = self.derivative_path(sha256, width)
+        if os.path.exists(target):
+            return target
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        handle, temporary = tempfile.mkstemp(prefix=f"{sha256}.", suffix=".tmp",
+                                             dir=os.path.dirname(target))
+        os.close(handle)
+        try:
+            with self.read(sha256) as data, Image.open(data) as poster:
+                poster.draft("RGB", (bucket, bucket * 3))  # Faster JPEG decode
+                poster = poster.convert("RGBA")
+                poster.thumbnail((bucket, bucket * 3))
+                poster.save(temporary, "PNG")
+            os.replace(temporary, target)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        return target
+
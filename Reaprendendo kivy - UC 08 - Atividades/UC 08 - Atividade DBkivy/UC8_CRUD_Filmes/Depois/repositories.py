@@ -0,0 +1,278 @@
+"""
+Interchangeable Movie Repositories
+
+MovieRepository is the data access interface of the movie CRUD: add,
+bulk add, get, update, delete, keyset-paged listing and count. Rows have the
+same shape everywhere, (id, titulo, genero, ano, imagem), so screens,
+importers and benchmarks can switch storage without changes. SQLite rows
+carry extra trailing columns (poster hash and the sync version: uid,
+atualizado_em, origem) that the other backends do not store.
+
+Backends:
+- SQLiteMovieRepository: the application's storage, delegating to
+  DatabaseManager (pooled connections, migrations, change events)
+- InMemoryMovieRepository: a dict plus a sorted id list; nothing persists,
+  useful as a baseline and for quick experiments
+- AppendOnlyMovieRepository: a JSON Lines log where every write appends a
+  record and an in-memory index points at the latest version of each
+  movie; compact() rewrites the log without dead records
+
+The module does not import Kivy. benchmark.py compares the backends with
+the same workload (python benchmark.py repositories).
+"""
+
+# Import Python standard library modules
+import bisect                       # Sorted id list for keyset paging
+import json                         # Append-only log records
+import os                           # Atomic log replacement
+from abc import ABC, abstractmethod
+
+from database import DatabaseManager
+
+
+class MovieRepository(ABC):
+    """
+    Storage interface for movies.
+
+    Ids are assigned by the repository, increase monotonically and are
+    never reused, so list() can page by "id greater than" like
+    DatabaseManager.get_movies_page().
+    """
+
+    @abstractmethod
+    def add(self, title, genre, year, image_path=None):
+        """Store a movie and return its new id."""
+
+    def add_many(self, movies):
+        """
+        Store many (title, genre, year, image_path) tuples.
+
+        Backends override this when they can write in bulk.
+
+        Returns:
+            int: Number of stored movies
+        """
+        count = 0
+        for movie in movies:
+            self.add(*movie)
+            count += 1
+        return count
+
+    @abstractmethod
+    def get(self, movie_id):
+        """Return the movie row or None."""
+
+    @abstractmethod
+    def update(self, movie_id, title, genre, year, image_path):
+        """Replace the fields of a movie; return True if it existed."""
+
+    @abstractmethod
+    def delete(self, movie_id):
+        """Remove a movie; return True if it existed."""
+
+    @abstractmethod
+    def list(self, after_id=0, limit=50):
+        """Return up to limit movies with id > after_id, ordered by id."""
+
+    @abstractmethod
+    def count(self):
+        """Return the number of stored movies."""
+
+    def close(self):
+        """Release files or connections held by the backend."""
+
+
+class SQLiteMovieRepository(MovieRepository):
+    """
+    Repository over the application's SQLite database (DatabaseManager).
+
+    add() and add_many() treat a movie with the same normalized title and
+    year as already registered: add() returns it, only filling a missing
+    image, and add_many() skips it.
+    """
+
+    def __init__(self, database=None):
+        """
+        Args:
+            database (str, optional): File to use instead of
+                DatabaseManager.DATABASE_NAME
+        """
+        if database is not None:
+            DatabaseManager.use_database(database)
+        DatabaseManager.create_database()
+
+    def add(self, title, genre, year, image_path=None):
+        return DatabaseManager.add_movie(title, genre, year, image_path)
+
+    def add_many(self, movies):
+        return DatabaseManager.import_movies(movies)
+
+    def get(self, movie_id):
+        return DatabaseManager.get_movie_by_id(movie_id)
+
+    def update(self, movie_id, title, genre, year, image_path):
+        return DatabaseManager.update_movie(movie_id, title, genre, year, image_path)
+
+    def delete(self, movie_id):
+        return DatabaseManager.delete_movie(movie_id)
+
+    def list(self, after_id=0, limit=50):
+        return DatabaseManager.get_movies_page(after_id, limit)
+
+    def count(self):
+        conn = DatabaseManager.get_pool().connection()
+        return conn.execute("SELECT COUNT(*) FROM filmes").fetchone()[0]
+
+    def close(self):
+        DatabaseManager.close()
+
+
+class InMemoryMovieRepository(MovieRepository):
+    """Repository kept entirely in process memory."""
+
+    def __init__(self):
+        self._rows = {}    # id -> row
+        self._ids = []     # ids in increasing order, for list()
+        self._last_id = 0
+
+    def add(self, title, genre, year, image_path=None):
+        self._last_id += 1
+        self._rows[self._last_id] = (self._last_id, title, genre, year, image_path)
+        self._ids.append(self._last_id)  # ids only grow, the list stays sorted
+        return self._last_id
+
+    def get(self, movie_id):
+        return self._rows.get(movie_id)
+
+    def update(self, movie_id, title, genre, year, image_path):
+        if movie_id not in self._rows:
+            return False
+        self._rows[movie_id] = (movie_id, title, genre, year, image_path)
+        return True
+
+    def delete(self, movie_id):
+        if self._rows.pop(movie_id, None) is None:
+            return False
+        del self._ids[bisect.bisect_left(self._ids, movie_id)]
+        return True
+
+    def list(self, after_id=0, limit=50):
+        start = bisect.bisect_right(self._ids, after_id)
+        return [self._rows[movie_id] for movie_id in self._ids[start:start + limit]]
+
+    def count(self):
+        return len(self._rows)
+
+
+class AppendOnlyMovieRepository(MovieRepository):
+    """
+    Repository stored as an append-only JSON Lines log.
+
+    Each line is {"id": ..., "movie": [titulo, genero, ano, imagem]} for an
+    insert or update, or {"id": ..., "movie": null} for a delete. Writes
+    only append; the index maps each live id to the offset of its latest
+    line, so get() is one seek and one readline.
+
+    Technical Implementation:
+        - Writes are buffered and flushed before the next read, so bursts
+          of writes do not pay a system call each
+        - Opening the file replays the log once to rebuild the index
+        - compact() rewrites only the live records and swaps the file
+          atomically with os.replace()
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._offsets = {}  # id -> offset of the latest record
+        self._ids = []      # live ids in increasing order, for list()
+        self._last_id = 0
+        self._dirty = False
+        self._file = open(path, "a+b")
+        self._load()
+
+    def _load(self):
+        """Rebuild the index by replaying the log."""
+        self._file.seek(0)
+        offset = 0
+        for line in self._file:
+            record = json.loads(line)
+            movie_id = record["id"]
+            if record["movie"] is None:
+                self._offsets.pop(movie_id, None)
+            else:
+                self._offsets[movie_id] = offset
+            self._last_id = max(self._last_id, movie_id)
+            offset += len(line)
+        self._ids = sorted(self._offsets)
+
+    def _append(self, movie_id, movie):
+        """Append a record and return its offset."""
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        line = json.dumps({"id": movie_id, "movie": movie}, ensure_ascii=False)
+        self._file.write(line.encode("utf-8") + b"\n")
+        self._dirty = True
+        return offset
+
+    def _read(self, offset):
+        """Return the row stored at offset."""
+        if self._dirty:
+            self._file.flush()
+            self._dirty = False
+        self._file.seek(offset)
+        record = json.loads(self._file.readline())
+        return (record["id"], *record["movie"])
+
+    def add(self, title, genre, year, image_path=None):
+        self._last_id += 1
+        self._offsets[self._last_id] = self._append(
+            self._last_id, [title, genre, year, image_path])
+        self._ids.append(self._last_id)
+        return self._last_id
+
+    def get(self, movie_id):
+        offset = self._offsets.get(movie_id)
+        return None if offset is None else self._read(offset)
+
+    def update(self, movie_id, title, genre, year, image_path):
+        if movie_id not in self._offsets:
+            return False
+        self._offsets[movie_id] = self._append(movie_id, [title, genre, year, image_path])
+        return True
+
+    def delete(self, movie_id):
+        if self._offsets.pop(movie_id, None) is None:
+            return False
+        self._append(movie_id, None)
+        del self._ids[bisect.bisect_left(self._ids, movie_id)]
+        return True
+
+    def list(self, after_id=0, limit=50):
+        start = bisect.bisect_right(self._ids, after_id)
+        return [self._read(self._offsets[movie_id])
+                for movie_id in self._ids[start:start + limit]]
+
+    def count(self):
+        return len(self._offsets)
+
+    def compact(self):
+        """Rewrite the log keeping only the latest record of live movies."""
+        temporary = f"{self.path}.compact"
+        offsets = {}
+        with open(temporary, "wb") as output:
+            for movie_id in self._ids:
+                row = self._read(self._offsets[movie_id])
+                offsets[movie_id] = output.tell()
+                line = json.dumps({"id": movie_id, "movie": list(row[1:])}, ensure_ascii=False)
+                output.write(line.encode("utf-8") + b"\n")
+            # Keep the highest id so deleted ids are not handed out again
+            if self._last_id and self._last_id not in offsets:
+                output.write(json.dumps({"id": self._last_id, "movie": None}).encode() + b"\n")
+        self._file.close()
+        os.replace(temporary, self.path)
+        self._file = open(self.path, "a+b")
+        self._offsets = offsets
+        self._dirty = False
+
+    def close(self):
+        self._file.close()
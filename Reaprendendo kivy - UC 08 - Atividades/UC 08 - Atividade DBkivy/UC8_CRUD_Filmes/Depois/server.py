@@ -0,0 +1,353 @@
+"""
+Headless HTTP API for the Movie Database
+
+Serves the catalog managed by MovieApp to other tools without starting
+Kivy. Built only on the standard library: an asyncio server speaking a
+small subset of HTTP/1.1 (keep-alive, Content-Length bodies) with JSON
+responses.
+
+Concurrency:
+- Reads run on the DatabaseWorker reader pool, each thread with its own
+  pooled connection (WAL lets them run while a write commits), and go
+  through MovieCache so repeated requests skip SQLite
+- Writes are serialized on the worker's single writer thread, which
+  coalesces concurrent requests into one transaction
+- The event loop only parses requests and awaits the futures
+
+Endpoints:
+    GET    /movies?after_id=0&limit=50   keyset page, with next_after_id
+    GET    /movies/<id>                  one movie
+    GET    /search?q=matr&limit=20       full-text search
+    POST   /movies                       create (or update the movie with the
+                                         same normalized title and year);
+                                         body {titulo, genero, ano, imagem}
+    PUT    /movies/<id>                  replace the fields of a movie; with
+                                         "versao" in the body, only if the
+                                         movie is still at that version.
+                                         409 on a stale version, or if another
+                                         movie has that title and year
+    DELETE /movies/<id>                  delete a movie
+    GET    /posters/<sha256>?w=160       poster bytes, or a derivative at
+                                         least w pixels wide
+
+Posters are immutable (their URL is their content hash), so responses
+carry an ETag and a one-year Cache-Control and are sent with sendfile().
+
+Usage:
+    python server.py [--host 127.0.0.1] [--port 8765] [--database filmes.db]
+"""
+
+# Import Python standard library modules
+import argparse                                   # Command line parsing
+import asyncio                                    # Event loop and streams
+import json                                       # Request and response bodies
+import mimetypes                                  # Poster content types
+import os                                         # Poster file sizes
+import re                                         # Poster hash validation
+from collections import namedtuple
+from http import HTTPStatus                       # Reason phrases
+from urllib.parse import parse_qs, urlsplit       # Path and query string
+
+from database import (YEAR_RANGE, DatabaseManager, DuplicateMovieError, MovieConflictError,
+                      parse_year, validate_movie_fields)
+from db_worker import DatabaseWorker
+from movie_cache import MovieCache
+from poster_store import PosterStore
+
+# Field names of a movie in JSON, in row order
+FIELDS = ("id", "titulo", "genero", "ano", "imagem", "poster")
+
+# Largest page a client may request
+MAX_LIMIT = 500
+
+# Largest request body accepted (bytes)
+MAX_BODY = 64 * 1024
+
+
+# Response whose body is a poster file instead of JSON
+PosterFile = namedtuple("PosterFile", "path sha256")
+
+
+class HTTPError(Exception):
+    """Error returned to the client as {"erro": message}."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def movie_to_json(movie):
+    """Convert a database row to a JSON object."""
+    return dict(zip(FIELDS, movie), versao=movie[DatabaseManager.VERSION_COLUMN])
+
+
+def _int_param(query, name, default, minimum=0, maximum=None):
+    """Read an integer query-string parameter."""
+    try:
+        value = int(query.get(name, [default])[0])
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} deve ser um número inteiro")
+    if value < minimum:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} deve ser >= {minimum}")
+    return min(value, maximum) if maximum is not None else value
+
+
+def _movie_fields(body):
+    """Validate a request body and return (titulo, genero, ano, imagem)."""
+    if not isinstance(body, dict):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "o corpo deve ser um objeto JSON")
+    title, genre, year = body.get("titulo"), body.get("genero"), body.get("ano")
+    image_path = body.get("imagem")
+    if not validate_movie_fields(title, genre, year) or (
+            image_path is not None and not isinstance(image_path, str)):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "titulo, genero e ano são obrigatórios")
+    # parse_year() never raises: a year int() or SQLite would reject is a
+    # 400 here, never a 500 from the write
+    year = parse_year(year)
+    if year is None:
+        raise HTTPError(HTTPStatus.BAD_REQUEST,
+                        f"ano deve estar entre {YEAR_RANGE.start} e {YEAR_RANGE.stop - 1}")
+    return title.strip(), genre.strip(), year, (image_path or "").strip() or None
+
+
+def _version_field(body):
+    """Return the optional "versao" of a PUT body (None if absent)."""
+    version = body.get("versao")
+    if version is not None and (isinstance(version, bool) or not isinstance(version, int)):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "versao deve ser um número inteiro")
+    return version
+
+
+class MovieAPI:
+    """Routes requests to DatabaseManager through the worker and the cache."""
+
+    def __init__(self, worker, cache, posters):
+        self.worker = worker
+        self.cache = cache
+        self.posters = posters
+
+    async def read(self, function, *args):
+        """Run a read on the reader pool and await its result."""
+        return await asyncio.wrap_future(self.worker.read(function, *args))
+
+    async def write(self, function, *args):
+        """Queue a write on the writer thread and await its commit."""
+        return await asyncio.wrap_future(self.worker.write(function, *args))
+
+    async def _save_movie(self, movie_id, title, genre, year, image_path, version=None):
+        """
+        Store the poster, then write the movie.
+
+        The copy and hash of the image run on the reader pool before the
+        write is queued, so the writer thread never holds the SQLite write
+        lock while waiting for the disk.
+        """
+        poster = None
+        if image_path:
+            try:
+                poster = await self.read(self.posters.put, image_path)
+            except (OSError, ValueError) as error:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"imagem inválida: {error}")
+        return await self.write(self._write_movie, movie_id, title, genre, year, image_path,
+                                poster, version)
+
+    @staticmethod
+    def _write_movie(movie_id, title, genre, year, image_path, poster, version):
+        """Insert or update a movie (runs on the writer thread)."""
+        if movie_id is None:
+            return DatabaseManager.add_movie(title, genre, year, image_path, poster)
+        try:
+            return DatabaseManager.update_movie(movie_id, title, genre, year, image_path,
+                                                poster, version)
+        except (DuplicateMovieError, MovieConflictError) as error:
+            raise HTTPError(HTTPStatus.CONFLICT, str(error))
+
+    def _poster_path(self, sha256, width):
+        """Path of the original poster, or of its derivative when width > 0."""
+        if width:
+            return self.posters.derivative(sha256, width)
+        path = self.posters.locate(sha256)
+        if path is None:
+            raise FileNotFoundError(sha256)
+        return path
+
+    async def handle(self, method, target, body):
+        """
+        Dispatch one request.
+
+        Returns:
+            tuple: (status, JSON-compatible payload or None)
+        """
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        parts = [part for part in url.path.split("/") if part]
+
+        if parts == ["movies"]:
+            if method == "GET":
+                after_id = _int_param(query, "after_id", 0)
+                limit = _int_param(query, "limit", 50, 1, MAX_LIMIT)
+                movies = await self.read(self.cache.get_movies_page, after_id, limit)
+                next_after_id = movies[-1][0] if len(movies) == limit else None
+                return HTTPStatus.OK, {"movies": [movie_to_json(movie) for movie in movies],
+                                       "next_after_id": next_after_id}
+            if method == "POST":
+                movie_id = await self._save_movie(None, *_movie_fields(body))
+                return HTTPStatus.CREATED, {"id": movie_id}
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "use GET ou POST")
+
+        if len(parts) == 2 and parts[0] == "movies":
+            if not parts[1].isdigit():
+                raise HTTPError(HTTPStatus.NOT_FOUND, "id inválido")
+            movie_id = int(parts[1])
+            if method == "GET":
+                movie = await self.read(self.cache.get_movie_by_id, movie_id)
+                if movie is None:
+                    raise HTTPError(HTTPStatus.NOT_FOUND, "filme não encontrado")
+                return HTTPStatus.OK, movie_to_json(movie)
+            if method == "PUT":
+                found = await self._save_movie(movie_id, *_movie_fields(body),
+                                               _version_field(body))
+            elif method == "DELETE":
+                found = await self.write(DatabaseManager.delete_movie, movie_id)
+            else:
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "use GET, PUT ou DELETE")
+            if not found:
+                raise HTTPError(HTTPStatus.NOT_FOUND, "filme não encontrado")
+            return (HTTPStatus.NO_CONTENT, None) if method == "DELETE" else (HTTPStatus.OK, {"id": movie_id})
+
+        if parts == ["search"] and method == "GET":
+            text = query.get("q", [""])[0].strip()
+            limit = _int_param(query, "limit", 50, 1, MAX_LIMIT)
+            movies = await self.read(self.cache.search_movies, text, limit) if text else []
+            return HTTPStatus.OK, {"movies": [movie_to_json(movie) for movie in movies]}
+
+        if len(parts) == 2 and parts[0] == "posters" and method == "GET":
+            sha256 = parts[1].lower()
+            if not re.fullmatch(r"[0-9a-f]{64}", sha256):
+                raise HTTPError(HTTPStatus.NOT_FOUND, "hash inválido")
+            width = _int_param(query, "w", 0)
+            try:
+                path = await self.read(self._poster_path, sha256, width)
+            except FileNotFoundError:
+                raise HTTPError(HTTPStatus.NOT_FOUND, "pôster não encontrado")
+            return HTTPStatus.OK, PosterFile(path, sha256)
+
+        raise HTTPError(HTTPStatus.NOT_FOUND, "rota desconhecida")
+
+    async def serve_client(self, reader, writer):
+        """Serve the requests of one keep-alive connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                try:
+                    length = int(headers.get("content-length", 0))
+                    if length > MAX_BODY:
+                        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "corpo muito grande")
+                    raw = await reader.readexactly(length) if length else b""
+                    try:
+                        body = json.loads(raw) if raw else None
+                    except ValueError:
+                        raise HTTPError(HTTPStatus.BAD_REQUEST, "JSON inválido")
+                    status, payload = await self.handle(method, target, body)
+                except HTTPError as error:
+                    status, payload = error.status, {"erro": error.message}
+                    keep_alive = keep_alive and status != HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+                except Exception as error:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": str(error)}
+
+                if isinstance(payload, PosterFile):
+                    await self._send_file(writer, payload, keep_alive)
+                else:
+                    self._send(writer, status, payload, keep_alive)
+                    await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _send(writer, status, payload, keep_alive):
+        """Write an HTTP response with a JSON body."""
+        content = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(content)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + content)
+
+    @staticmethod
+    async def _send_file(writer, poster, keep_alive):
+        """Send a poster file with sendfile() (copying only as a fallback)."""
+        content_type = mimetypes.guess_type(poster.path)[0] or "application/octet-stream"
+        with open(poster.path, "rb") as file:
+            head = (
+                f"HTTP/1.1 200 OK\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {os.fstat(file.fileno()).st_size}\r\n"
+                f"ETag: \"{poster.sha256}\"\r\n"
+                f"Cache-Control: public, max-age=31536000, immutable\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+            )
+            writer.write(head.encode("latin-1"))
+            await writer.drain()
+            await asyncio.get_running_loop().sendfile(writer.transport, file)
+
+
+async def serve(host, port, readers):
+    """Run the API until cancelled."""
+    DatabaseManager.create_database()
+    cache = MovieCache()
+    worker = DatabaseWorker(readers=readers)
+    api = MovieAPI(worker, cache, PosterStore.for_database(DatabaseManager.DATABASE_NAME))
+    server = await asyncio.start_server(api.serve_client, host, port)
+    print(f"Servindo {DatabaseManager.DATABASE_NAME} em http://{host}:{port} "
+          f"({readers} leitores)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        worker.close()
+        cache.close()
+        DatabaseManager.close()
+
+
+def main(argv=None):
+    """Parse the command line and start the server."""
+    parser = argparse.ArgumentParser(description="API HTTP do banco de filmes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--database", default=DatabaseManager.DATABASE_NAME)
+    parser.add_argument("--readers", type=int, default=4,
+                        help="threads de leitura (padrão: %(default)s)")
+    args = parser.parse_args(argv)
+
+    DatabaseManager.use_database(args.database)
+    try:
+        asyncio.run(serve(args.host, args.port, args.readers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Incremental Synchronization Between Movie Databases
+
+Kiosks used to share filmes.db by copying the file around, which throws
+away whatever the other copy changed. sync() exchanges only the changes
+each side has not seen yet, in both directions, through the change feed
+built by migration 6:
+
+- Triggers stamp every insert, edit and delete with a version
+  (atualizado_em, origem) and replace the movie's entry in alteracoes,
+  which gets a new, ever-increasing seq
+- sync_estado remembers, per peer node, the last seq received from it, so
+  the next sync reads "WHERE seq > ?" from the peer's feed: the cost grows
+  with the number of changes, not with the size of the catalog
+- Conflicts are resolved by last-writer-wins on (atualizado_em, origem);
+  deletions travel as tombstones and win over older edits
+- Two nodes that registered the same movie (same normalized title and
+  year, see migration 7) under different uids keep the smaller uid on
+  both sides; the other becomes a tombstone
+- Posters referenced by received rows are copied between the two poster
+  stores (poster_store.py) when the files are available
+
+Each batch is applied, and the peer's position advanced, in one
+transaction, so an interrupted sync resumes where it stopped.
+
+Usage:
+    python manage.py sync outro_quiosque.db
+
+The module does not import Kivy.
+"""
+
+# Import Python standard library modules
+import os          # Poster files of the peer
+from collections import namedtuple
+
+import migrations
+from database import ConnectionPool, normalize_title
+from migrations import LOCAL_NODE, NOW_MS
+from poster_store import PosterStore
+
+# One entry of the change feed; title, genre, year, image and poster are
+# None for a tombstone
+Change = namedtuple(
+    "Change", "seq uid deleted stamp node title genre year image_path poster poster_info")
+
+# Result of one direction of a sync
+SyncResult = namedtuple("SyncResult", "received applied skipped")
+
+# Changes read and applied per transaction
+BATCH_SIZE = 1_000
+
+
+def node_id(conn):
+    """Return the node id of a database file."""
+    return conn.execute("SELECT valor FROM sync_local WHERE chave = 'no'").fetchone()[0]
+
+
+def new_node_id(pool):
+    """
+    Give a database a new node id.
+
+    Needed after a file is copied by hand to set up another kiosk: both
+    copies would otherwise sync as the same node.
+    """
+    with pool.transaction() as conn:
+        conn.execute(
+            "UPDATE sync_local SET valor = lower(hex(randomblob(8))) WHERE chave = 'no'")
+        return node_id(conn)
+
+
+def last_seq(conn, peer):
+    """Return the last seq received from a peer (0 if never synced)."""
+    row = conn.execute(
+        "SELECT ultimo_seq FROM sync_estado WHERE par = ?", (peer,)).fetchone()
+    return row[0] if row else 0
+
+
+def _feed_position(conn):
+    """Return the highest seq of the change feed."""
+    return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM alteracoes").fetchone()[0]
+
+
+def _record_position(conn, peer, seq):
+    """Remember that every change of peer up to seq has been received."""
+    conn.execute(
+        "INSERT OR REPLACE INTO sync_estado (par, ultimo_seq) VALUES (?, ?)", (peer, seq))
+
+
+def changes_since(conn, seq, limit=BATCH_SIZE):
+    """
+    Read up to limit entries of the change feed after seq.
+
+    Uses the seq primary key and the uid index only, so the cost is
+    proportional to the number of entries returned.
+
+    Returns:
+        list: Change tuples ordered by seq
+    """
+    rows = conn.execute("""
+        SELECT a.seq, a.uid, a.excluido,
+               COALESCE(f.atualizado_em, a.atualizado_em), COALESCE(f.origem, a.origem),
+               f.titulo, f.genero, f.ano, f.imagem, f.poster, p.extensao, p.bytes
+        FROM alteracoes AS a
+        LEFT JOIN filmes AS f ON f.uid = a.uid AND a.excluido = 0
+        LEFT JOIN posters AS p ON p.sha256 = f.poster
+        WHERE a.seq > ?
+        ORDER BY a.seq
+        LIMIT ?
+    """, (seq, limit)).fetchall()
+    return [
+        Change(*row[:10], (row[9], row[10], row[11]) if row[10] is not None else None)
+        for row in rows
+    ]
+
+
+def _local_version(conn, uid):
+    """Return (stamp, node) of a uid in this file, or None if unknown."""
+    row = conn.execute(
+        "SELECT atualizado_em, origem FROM filmes WHERE uid = ?", (uid,)).fetchone()
+    if row is None:
+        row = conn.execute(
+            "SELECT atualizado_em, origem FROM alteracoes WHERE uid = ? AND excluido = 1",
+            (uid,)).fetchone()
+    return tuple(row) if row else None
+
+
+def apply_change(conn, change):
+    """
+    Apply one remote change if it is newer than the local version.
+
+    Returns:
+        bool: True if the change was applied, False if the local version
+        won (or was the same)
+    """
+    local = _local_version(conn, change.uid)
+    if local is not None and local >= (change.stamp, change.node):
+        return False
+
+    if change.deleted:
+        conn.execute("DELETE FROM filmes WHERE uid = ?", (change.uid,))
+        # The delete trigger stamped the tombstone as a local deletion
+        conn.execute(
+            "INSERT OR REPLACE INTO alteracoes (uid, excluido, atualizado_em, origem) "
+            "VALUES (?, 1, ?, ?)",
+            (change.uid, change.stamp, change.node))
+        return True
+
+    key = normalize_title(change.title)
+    duplicate = conn.execute(
+        "SELECT uid FROM filmes WHERE titulo_normalizado = ? AND ano = ? AND uid != ?",
+        (key, change.year, change.uid)).fetchone()
+    if duplicate is not None:
+        if duplicate[0] < change.uid:
+            # The local movie wins: drop this uid here and send the peer a
+            # tombstone newer than its version
+            conn.execute("DELETE FROM filmes WHERE uid = ?", (change.uid,))
+            conn.execute(
+                "INSERT OR REPLACE INTO alteracoes (uid, excluido, atualizado_em, origem) "
+                f"VALUES (?, 1, MAX({NOW_MS}, ? + 1), {LOCAL_NODE})",
+                (change.uid, change.stamp))
+            return True
+        conn.execute("DELETE FROM filmes WHERE uid = ?", duplicate)
+
+    if change.poster_info is not None:
+        conn.execute(
+            "INSERT OR IGNORE INTO posters (sha256, extensao, bytes) VALUES (?, ?, ?)",
+            change.poster_info)
+    # Setting atualizado_em explicitly keeps the stamp trigger from
+    # replacing the remote version with a local one
+    cursor = conn.execute(
+        "UPDATE filmes SET titulo = ?, genero = ?, ano = ?, imagem = ?, poster = ?, "
+        "titulo_normalizado = ?, atualizado_em = ?, origem = ?, versao = versao + 1 "
+        "WHERE uid = ?",
+        (change.title, change.genre, change.year, change.image_path, change.poster,
+         key, change.stamp, change.node, change.uid))
+    if not cursor.rowcount:
+        conn.execute(
+            "INSERT INTO filmes (titulo, genero, ano, imagem, poster, titulo_normalizado, "
+            "uid, atualizado_em, origem) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (change.title, change.genre, change.year, change.image_path, change.poster,
+             key, change.uid, change.stamp, change.node))
+    return True
+
+
+def pull(pool, peer_pool, posters=None, peer_posters=None):
+    """
+    Apply to pool every change of peer_pool it has not received yet.
+
+    Changes the peer itself received from this node are skipped without a
+    lookup: this node already has that version or a newer one.
+
+    Applying a change adds an entry to this node's own feed, which would
+    come back as an echo on the peer's next pull. When the peer had
+    already received everything up to the start of a batch, its position
+    is moved past the batch, so echoes are never sent back.
+
+    Returns:
+        SyncResult: Changes read from the peer, applied and skipped
+    """
+    local_node = node_id(pool.connection())
+    peer = node_id(peer_pool.connection())
+    if peer == local_node:
+        raise ValueError(
+            "Os dois bancos têm o mesmo identificador de nó (arquivo copiado?); "
+            "rode manage.py sync --new-node em um deles")
+
+    received = applied = skipped = 0
+    seq = last_seq(pool.connection(), peer)
+    while True:
+        changes = changes_since(peer_pool.connection(), seq)
+        if not changes:
+            return SyncResult(received, applied, skipped)
+        with pool.transaction() as conn:
+            start = _feed_position(conn)
+            for change in changes:
+                if change.node != local_node and apply_change(conn, change):
+                    applied += 1
+                    if change.poster and posters is not None and peer_posters is not None:
+                        _copy_poster(change.poster, peer_posters, posters)
+                else:
+                    skipped += 1
+            seq = changes[-1].seq
+            _record_position(conn, peer, seq)
+            end = _feed_position(conn)
+        received += len(changes)
+
+        if end != start:
+            with peer_pool.transaction() as peer_conn:
+                if last_seq(peer_conn, local_node) == start:
+                    _record_position(peer_conn, local_node, end)
+
+
+def _copy_poster(sha256, source, target):
+    """Copy a poster file between stores if the target does not have it."""
+    path = source.locate(sha256)
+    if path is not None and target.locate(sha256) is None:
+        target.put(path)
+
+
+def sync(pool, peer_path):
+    """
+    Synchronize a database with another file, in both directions.
+
+    Args:
+        pool (ConnectionPool): Pool of the local database (already migrated)
+        peer_path (str): Path of the other filmes.db
+
+    Returns:
+        tuple: (SyncResult of pulling, SyncResult of pushing)
+    """
+    if not os.path.exists(peer_path):
+        raise FileNotFoundError(f"Banco {peer_path} não encontrado")
+    peer_pool = ConnectionPool(peer_path)
+    try:
+        migrations.migrate(peer_pool)
+        posters = PosterStore.for_database(pool.database)
+        peer_posters = PosterStore.for_database(peer_path)
+        pulled = pull(pool, peer_pool, posters, peer_posters)
+        pushed = pull(peer_pool, pool, peer_posters, posters)
+        return pulled, pushed
+    finally:
+        peer_pool.close_all()
@@ -0,0 +1,101 @@
+"""
+Correctness checks of the movie database layer.
+
+The benchmarks measure speed; these tests pin down the properties the
+timings rely on, on a small throwaway database:
+- No MovieQuery filter used by the screens falls back to a full scan
+  (EXPLAIN QUERY PLAN)
+- The trigger-maintained statistics stay exact after mixed writes
+- Invalid years are rejected instead of reaching int() or SQLite
+
+Run from this folder:
+    python -m pytest -q test_database.py
+"""
+
+# Import Python standard library modules
+import random  # Mixed write workload
+
+import pytest
+
+from benchmark import GENRES, movie_queries
+from database import DatabaseManager, parse_year, validate_movie_fields
+from poster_store import PosterInfo
+
+ROWS = 5_000
+
+
+@pytest.fixture
+def database(tmp_path):
+    """A fresh database with ROWS movies, closed after the test."""
+    DatabaseManager.use_database(str(tmp_path / "filmes.db"))
+    DatabaseManager.create_database()
+    DatabaseManager.import_movies(
+        (f"Filme {i}", GENRES[i % len(GENRES)], 1950 + i % 75, None) for i in range(ROWS)
+    )
+    yield DatabaseManager
+    DatabaseManager.close()
+
+
+@pytest.mark.parametrize("name", list(movie_queries()))
+def test_query_never_scans_the_table(database, name):
+    query = movie_queries()[name]()
+    assert not query.uses_full_scan(), query.explain()
+    assert query.fetch()
+
+
+def test_statistics_match_a_recount_after_mixed_writes(database):
+    rng = random.Random(6)
+    ids = rng.sample(range(1, ROWS + 1), 400)
+    for movie_id in ids[:100]:
+        database.update_movie(movie_id, f"Editado {movie_id}", rng.choice(GENRES),
+                              rng.randint(1900, 2030), None)
+    database.update_movies(ids[100:200], genre="Documentário")
+    database.update_movies(ids[200:300], year=1899)
+    database.delete_movies(ids[300:])
+    for i in range(100):
+        database.add_movie(f"Novo {i}", "Terror", 2024)
+    assert database.check_statistics() == []
+
+
+@pytest.mark.parametrize("year", ["²", "١٩٩٩x", "", "0", "99999999999999999999999",
+                                  True, 1.5, None])
+def test_invalid_years_are_rejected(year):
+    assert parse_year(year) is None
+    assert not validate_movie_fields("Título", "Drama", year)
+
+
+@pytest.mark.parametrize("year, expected", [("1999", 1999), (2024, 2024), ("٢٠٠٠", 2000)])
+def test_valid_years_are_converted(year, expected):
+    assert parse_year(year) == expected
+
+
+def test_keep_poster_leaves_the_stored_reference(database):
+    poster = PosterInfo("ab" * 32, "png", 10)
+    movie_id = database.add_movie("Com pôster", "Drama", 2001, "/tmp/capa.png", poster)
+    assert database.update_movie(movie_id, "Com pôster", "Terror", 2001, "/tmp/capa.png",
+                                 DatabaseManager.KEEP_POSTER)
+    movie = database.get_movie_by_id(movie_id)
+    assert (movie[2], movie[5]) == ("Terror", poster.sha256)
+    assert database.update_movie(movie_id, "Com pôster", "Terror", 2001, None)
+    assert database.get_movie_by_id(movie_id)[5] is None
+
+
+@pytest.mark.parametrize("year", ["-", "0", "-5", "99999", 0])
+def test_batch_update_rejects_invalid_years(database, year):
+    with pytest.raises(ValueError):
+        database.update_movies([1, 2], year=year)
+    assert database.get_movie_by_id(1)[3] == 1950
+
+
+def test_saving_a_registered_movie_keeps_its_title_and_fills_the_image(database):
+    movie_id = database.add_movie("Ação Total", "Ação", 1990)
+    version = database.get_movie_by_id(movie_id)[DatabaseManager.VERSION_COLUMN]
+    assert database.add_movie("AÇÃO   total", "Drama", 1990) == movie_id
+    movie = database.get_movie_by_id(movie_id)
+    assert (movie[1], movie[2], movie[4]) == ("Ação Total", "Ação", None)
+    assert movie[DatabaseManager.VERSION_COLUMN] == version
+
+    assert database.add_movie("acao total", "Drama", 1990, "/capas/acao.png") == movie_id
+    assert database.add_movie("acao total", "Drama", 1990, "/capas/outra.png") == movie_id
+    movie = database.get_movie_by_id(movie_id)
+    assert (movie[1], movie[4]) == ("Ação Total", "/capas/acao.png")
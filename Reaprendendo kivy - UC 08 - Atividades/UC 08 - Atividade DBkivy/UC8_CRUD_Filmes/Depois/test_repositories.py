@@ -0,0 +1,102 @@
+"""
+Contract tests of the MovieRepository backends.
+
+The same CRUD sequence runs against SQLite, in-memory and append-only
+storage; rows are compared on the five shared columns
+(id, titulo, genero, ano, imagem). Run from this folder:
+    python -m pytest -q test_repositories.py
+"""
+
+import pytest
+
+from repositories import (AppendOnlyMovieRepository, InMemoryMovieRepository,
+                          SQLiteMovieRepository)
+
+BACKENDS = {
+    "sqlite": lambda tmp_path: SQLiteMovieRepository(str(tmp_path / "filmes.db")),
+    "memory": lambda tmp_path: InMemoryMovieRepository(),
+    "append-only": lambda tmp_path: AppendOnlyMovieRepository(str(tmp_path / "filmes.jsonl")),
+}
+
+
+def shared(row):
+    """The columns every backend stores."""
+    return None if row is None else tuple(row[:5])
+
+
+@pytest.fixture(params=list(BACKENDS))
+def repository(request, tmp_path):
+    repository = BACKENDS[request.param](tmp_path)
+    yield repository
+    repository.close()
+
+
+def test_add_get_and_count(repository):
+    first = repository.add("Filme A", "Drama", 1999, "/capas/a.png")
+    second = repository.add("Filme B", "Terror", 2005)
+    assert second > first
+    assert shared(repository.get(first)) == (first, "Filme A", "Drama", 1999, "/capas/a.png")
+    assert shared(repository.get(second)) == (second, "Filme B", "Terror", 2005, None)
+    assert repository.get(second + 1) is None
+    assert repository.count() == 2
+
+
+def test_add_many_then_page_through_everything(repository):
+    movies = [(f"Filme {i}", "Drama", 1950 + i % 70, None) for i in range(130)]
+    assert repository.add_many(movies) == 130
+    rows, after_id = [], 0
+    while True:
+        page = repository.list(after_id, 50)
+        if not page:
+            break
+        assert len(page) <= 50
+        rows.extend(page)
+        after_id = page[-1][0]
+    assert [row[1] for row in rows] == [title for title, *_ in movies]
+    assert [row[0] for row in rows] == sorted(row[0] for row in rows)
+    assert repository.count() == 130
+
+
+def test_update_and_delete(repository):
+    ids = [repository.add(f"Filme {i}", "Drama", 2000) for i in range(5)]
+    assert repository.update(ids[1], "Editado", "Comédia", 2001, "/capas/e.png")
+    assert shared(repository.get(ids[1])) == (ids[1], "Editado", "Comédia", 2001, "/capas/e.png")
+    assert repository.delete(ids[2])
+    assert repository.get(ids[2]) is None
+    assert not repository.delete(ids[2])
+    assert not repository.update(ids[2], "Fantasma", "Drama", 2000, None)
+    assert [row[0] for row in repository.list(0, 10)] == [ids[0], ids[1], ids[3], ids[4]]
+    assert [row[0] for row in repository.list(ids[1], 10)] == [ids[3], ids[4]]
+    assert repository.count() == 4
+
+
+def test_ids_are_never_reused(repository):
+    ids = [repository.add(f"Filme {i}", "Drama", 2000) for i in range(3)]
+    repository.delete(ids[-1])
+    assert repository.add("Filme novo", "Drama", 2000) > ids[-1]
+
+
+def test_append_only_survives_compaction_and_reopening(tmp_path):
+    path = str(tmp_path / "filmes.jsonl")
+    repository = AppendOnlyMovieRepository(path)
+    ids = [repository.add(f"Filme {i}", "Drama", 2000) for i in range(6)]
+    repository.update(ids[0], "Editado", "Terror", 1980, None)
+    repository.delete(ids[3])
+    repository.delete(ids[5])
+    expected = [shared(row) for row in repository.list(0, 10)]
+    with open(path, "rb") as file:
+        before = sum(1 for _ in file)
+
+    repository.compact()
+    with open(path, "rb") as file:
+        after = sum(1 for _ in file)
+    assert after < before
+    assert [shared(row) for row in repository.list(0, 10)] == expected
+    repository.close()
+
+    reopened = AppendOnlyMovieRepository(path)
+    assert [shared(row) for row in reopened.list(0, 10)] == expected
+    assert reopened.count() == 4
+    # The highest id was deleted before compacting; it is still not reused
+    assert reopened.add("Filme novo", "Drama", 2000) > ids[5]
+    reopened.close()
@@ -0,0 +1,185 @@
+"""
+Poster Thumbnails Generated off the UI Thread
+
+Decoding a full-resolution poster for every visible row is the slowest part
+of scrolling the movie list. ThumbnailStore moves that work to a small
+thread pool and keeps the result on disk:
+- Each poster is downscaled once with Pillow and saved as a small PNG
+- The cache file name is a hash of the poster's absolute path, mtime and
+  size, so editing or replacing the poster produces a new thumbnail while
+  unchanged posters are never decoded again
+- Concurrent requests for the same poster share a single job
+- Posters kept in a PosterStore are requested as "sha256:<hex>"; their
+  content never changes, so the key needs no stat() and the store's
+  size-bucketed derivative is used instead of a private copy
+
+Everything that touches the file system, stat() included, runs on the
+workers: request() only records the callback.
+
+The module does not import Kivy. The application turns the finished files
+into textures and keeps them in a size-bounded LRU (see ThumbnailCache in
+CRUD-filmesWBD.py). Without Pillow no thumbnail is produced and the list
+shows its placeholder: handing over the original poster would make the UI
+thread decode it at full size.
+"""
+
+# Import Python standard library modules
+import hashlib                                   # Cache file names
+import os                                        # File metadata and paths
+import tempfile                                  # Unique temporary file names
+import threading                                 # Protects the in-flight table
+from concurrent.futures import ThreadPoolExecutor  # Worker pool
+
+try:
+    from PIL import Image  # Pillow (listed in requirements.txt)
+except ImportError:
+    Image = None
+
+# Errors meaning "this poster cannot be turned into a thumbnail"
+DECODE_ERRORS = (OSError, ValueError) + ((Image.DecompressionBombError,) if Image else ())
+
+
+class ThumbnailStore:
+    """
+    On-disk thumbnail cache filled by a pool of worker threads.
+
+    Attributes:
+        cache_dir (str): Directory holding the generated thumbnails
+        size (tuple): Maximum (width, height) of a thumbnail
+    """
+
+    # Default bounding box of a thumbnail, in pixels
+    DEFAULT_SIZE = (160, 240)
+
+    # Worker threads decoding posters
+    DEFAULT_WORKERS = 2
+
+    # Prefix of sources that name a poster in the PosterStore by hash
+    CONTENT_PREFIX = "sha256:"
+
+    def __init__(self, cache_dir, size=DEFAULT_SIZE, workers=DEFAULT_WORKERS, posters=None):
+        """
+        Args:
+            cache_dir (str): Directory for thumbnails of plain image paths
+            size (tuple): Maximum (width, height) of a thumbnail
+            workers (int): Decoding threads
+            posters (PosterStore, optional): Store resolving "sha256:" sources
+        """
+        self.cache_dir = cache_dir
+        self.size = tuple(size)
+        self.posters = posters
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix="thumbnail")
+        self._lock = threading.Lock()
+        self._pending = {}    # source -> list of callbacks waiting for it
+        self._failed = set()  # cache keys of posters that could not be decoded
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def cache_key(self, source):
+        """
+        Return the cache key of a poster, or None if the file does not exist.
+
+        The key covers the absolute path, modification time and file size,
+        plus the thumbnail size, so any change to the poster invalidates it.
+        Content-addressed sources are their own key.
+        """
+        if self.posters is not None and source.startswith(self.CONTENT_PREFIX):
+            return source
+        try:
+            stat = os.stat(source)
+        except (OSError, ValueError):
+            return None
+        identity = f"{os.path.abspath(source)}|{stat.st_mtime_ns}|{stat.st_size}|{self.size}"
+        return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+    def cached_path(self, key):
+        """Path of the thumbnail file for a cache key."""
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def lookup(self, source):
+        """Return the thumbnail path if it is already on disk, else None."""
+        key = self.cache_key(source)
+        if key is None:
+            return None
+        if key.startswith(self.CONTENT_PREFIX):
+            path = self.posters.derivative_path(key[len(self.CONTENT_PREFIX):], self.size[0])
+        else:
+            path = self.cached_path(key)
+        return path if os.path.exists(path) else None
+
+    def thumbnail(self, source):
+        """
+        Return the thumbnail path for a poster, generating it if needed.
+
+        Runs synchronously; the application calls request() instead.
+
+        Returns:
+            str or None: Thumbnail path, or None if Pillow is not available
+            or the poster is missing or unreadable
+        """
+        if Image is None:
+            return None
+        key = self.cache_key(source)
+        if key is None or key in self._failed:
+            return None
+        if key.startswith(self.CONTENT_PREFIX):
+            try:
+                return self.posters.derivative(key[len(self.CONTENT_PREFIX):], self.size[0])
+            except DECODE_ERRORS:
+                self._failed.add(key)
+                return None
+
+        path = self.cached_path(key)
+        if os.path.exists(path):
+            return path
+
+        # Write to a temporary name first so a half-written file is never
+        # picked up by lookup(); mkstemp keeps it unique across processes
+        handle, temporary = tempfile.mkstemp(prefix=f"{key}.", suffix=".tmp",
+                                             dir=self.cache_dir)
+        os.close(handle)
+        try:
+            with Image.open(source) as poster:
+                poster.draft("RGB", self.size)  # Lets JPEG decode at reduced scale
+                poster = poster.convert("RGBA")
+                poster.thumbnail(self.size)
+                poster.save(temporary, "PNG")
+            os.replace(temporary, path)
+        except DECODE_ERRORS:
+            self._failed.add(key)
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            return None
+        return path
+
+    def request(self, source, callback):
+        """
+        Generate the thumbnail in the background.
+
+        callback(source, path) runs on a worker thread when the thumbnail is
+        ready; path is None if the poster is missing or could not be read.
+        Requests for a poster that is already being processed join the
+        running job. Nothing is read here, so the caller (the UI thread)
+        never waits for the disk.
+        """
+        with self._lock:
+            if source in self._pending:
+                self._pending[source].append(callback)
+                return
+            self._pending[source] = [callback]
+
+        def job():
+            try:
+                path = self.thumbnail(source)
+            except Exception:
+                path = None
+            with self._lock:
+                callbacks = self._pending.pop(source, [])
+            for waiting in callbacks:
+                waiting(source, path)
+
+        self._executor.submit(job)
+
+    def shutdown(self):
+        """Stop accepting work and discard jobs that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
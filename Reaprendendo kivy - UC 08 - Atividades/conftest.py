@@ -0,0 +1,48 @@
+"""
+Shared fixtures of the movie_suggestions tests.
+
+Run from this folder:
+    python -m pytest -q
+"""
+
+# Import Python standard library modules
+import csv                        # Source files of the test catalogs
+
+import pytest
+
+from movie_suggestions import MovieCatalog
+
+
+def write_source(folder, movies, genres=(("Drama", 0), ("Comédia", 0), ("Terror", 16))):
+    """
+    Write generos.csv and filmes.csv.
+
+    Args:
+        folder (pathlib.Path): Target directory
+        movies (iterable): (title, year, genre, rating) tuples
+        genres (iterable): (genre, minimum age) tuples
+    """
+    with open(folder / "generos.csv", "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["genero", "idade_minima", "idade_maxima"])
+        writer.writerows([name, age, 100] for name, age in genres)
+    with open(folder / "filmes.csv", "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["titulo", "ano", "genero", "imagem", "idade_minima"])
+        writer.writerows([title, year, genre, "", rating] for title, year, genre, rating in movies)
+
+
+@pytest.fixture
+def make_catalog(tmp_path):
+    """Return make(movies, **genres) -> MovieCatalog over a throwaway folder."""
+    catalogs = []
+
+    def make(movies, **kwargs):
+        write_source(tmp_path, movies, **kwargs)
+        catalog = MovieCatalog(str(tmp_path))
+        catalogs.append(catalog)
+        return catalog
+
+    yield make
+    for catalog in catalogs:
+        catalog.close()
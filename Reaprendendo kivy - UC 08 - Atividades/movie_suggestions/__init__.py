@@ -0,0 +1,16 @@
+"""
+Movie Suggestion Package
+
+Kivy-free logic shared by the movie suggestion apps of Atividades 04, 05
+and 07: the genre-partitioned movie catalog built from data/*.csv, its
+age eligibility index, the non-repeating suggestion sampler, the
+preference-based recommender (optional NumPy) and the bounded
+suggestion history. The history's RecycleView panel (history_view.py) is
+the one Kivy module; import it from movie_suggestions.history_view.
+"""
+
+from movie_suggestions.catalog import Genre, Movie, MovieCatalog, build_catalog
+from movie_suggestions.eligibility import EligibilityIndex
+from movie_suggestions.history import HistoryEntry, SuggestionHistory
+from movie_suggestions.recommender import Recommender
+from movie_suggestions.shuffle import ShuffleBag, SuggestionSampler
@@ -0,0 +1,29 @@
+"""
+Rebuild the movie catalog file from its CSV sources.
+
+Usage:
+    python -m movie_suggestions [--source DIR] [--target FILE]
+"""
+
+# Import Python standard library modules
+import argparse  # Command line parsing
+
+from movie_suggestions.catalog import DATA_DIR, MovieCatalog, build_catalog
+
+
+def main(argv=None):
+    """Parse the command line, rebuild the catalog and list its genres."""
+    parser = argparse.ArgumentParser(description="Gera o catálogo de filmes a partir dos CSV")
+    parser.add_argument("--source", default=DATA_DIR, help="pasta com generos.csv e filmes.csv")
+    parser.add_argument("--target", help="arquivo gerado (padrão: catalogo.db na pasta)")
+    args = parser.parse_args(argv)
+    path = build_catalog(args.source, args.target)
+    catalog = MovieCatalog(args.source, path)
+    for name in catalog.genres():
+        print(f"{name:<20}{catalog.count(name):>10,} filmes")
+    print(f"{path} (versão {catalog.version[:12]})")
+    catalog.close()
+
+
+if __name__ == "__main__":
+    main()
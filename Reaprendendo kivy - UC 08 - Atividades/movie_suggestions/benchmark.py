@@ -0,0 +1,281 @@
+"""
+Benchmarks for the movie suggestion package.
+
+Each scenario generates its own catalog in a temporary directory, so
+running the benchmarks never touches data/catalogo.db. Run them from the
+"Reaprendendo kivy - UC 08 - Atividades" folder.
+
+Usage:
+    python -m movie_suggestions.benchmark catalog [--sizes 25 200000] [--ops 10000]
+    python -m movie_suggestions.benchmark eligibility [--titles 200000] [--ops 2000]
+    python -m movie_suggestions.benchmark shuffle [--titles 25 200000] [--ops 20000]
+    python -m movie_suggestions.benchmark recommend [--titles 100000] [--ops 200] [--k 5]
+
+The recommend scenario needs NumPy; set OPENBLAS_NUM_THREADS=1 (or
+OMP_NUM_THREADS=1) to measure it on one core.
+"""
+
+# Import Python standard library modules
+import argparse         # Command line parsing
+import csv              # Synthetic source files
+import os               # File path operations
+import random           # Random genres for the workloads
+import tempfile         # Throwaway catalogs
+import time             # High resolution timers
+import tracemalloc      # Memory held by the samplers
+
+from movie_suggestions.catalog import SOURCE_FILES, MovieCatalog, build_catalog
+from movie_suggestions.recommender import Recommender
+from movie_suggestions.shuffle import ShuffleBag, SuggestionSampler
+
+GENRES = [("Ação", 16), ("Comédia", 10), ("Drama", 12), ("Ficção Científica", 12),
+          ("Animação", 0)]
+
+# Per-title ratings of the synthetic catalogs ("" = the genre's minimum age)
+RATINGS = ["", "", "", 10, 12, 14, 16, 18]
+
+
+def write_source(folder, titles):
+    """Write generos.csv and filmes.csv with the given number of titles."""
+    rng = random.Random(titles)
+    with open(os.path.join(folder, SOURCE_FILES[0]), "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["genero", "idade_minima", "idade_maxima"])
+        writer.writerows([name, age, 100] for name, age in GENRES)
+    with open(os.path.join(folder, SOURCE_FILES[1]), "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["titulo", "ano", "genero", "imagem", "idade_minima"])
+        writer.writerows([f"Filme {i}", 1950 + i % 75, GENRES[i % len(GENRES)][0], "",
+                          rng.choice(RATINGS)] for i in range(titles))
+
+
+def load_dicts(folder):
+    """Baseline: the whole catalog as a dict of lists, like the old literals."""
+    movies = {}
+    minimum = dict(GENRES)
+    with open(os.path.join(folder, SOURCE_FILES[1]), newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            rating = int(row["idade_minima"] or minimum[row["genero"]])
+            movies.setdefault(row["genero"], []).append(
+                (row["titulo"], int(row["ano"]), row["imagem"], rating))
+    return movies
+
+
+def bench_catalog(args):
+    """Startup cost and suggestion cost, dict literals vs the catalog file."""
+    print(f"\n{'titles':>9}{'build ms':>10}{'start before':>14}{'start after':>13}"
+          f"{'suggest before':>16}{'suggest after':>15}")
+    for titles in args.sizes:
+        with tempfile.TemporaryDirectory() as folder:
+            write_source(folder, titles)
+            start = time.perf_counter()
+            build_catalog(folder)
+            build_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            movies = load_dicts(folder)
+            before_start = (time.perf_counter() - start) * 1000
+            genres = list(movies)
+            start = time.perf_counter()
+            for _ in range(args.ops):
+                random.choice(movies[random.choice(genres)])
+            before_us = (time.perf_counter() - start) / args.ops * 1e6
+
+            # Startup = create the catalog and list the genre buttons
+            start = time.perf_counter()
+            catalog = MovieCatalog(folder)
+            genres = catalog.genres()
+            after_start = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            for _ in range(args.ops):
+                catalog.random_movie(random.choice(genres))
+            after_us = (time.perf_counter() - start) / args.ops * 1e6
+            catalog.close()
+
+        print(f"{titles:>9,}{build_ms:>10.1f}{before_start:>12.2f}ms{after_start:>11.2f}ms"
+              f"{before_us:>14.2f}us{after_us:>13.2f}us")
+
+
+def bench_eligibility(args):
+    """Per-click age filtering: range comparisons and a title scan vs the index."""
+    with tempfile.TemporaryDirectory() as folder:
+        write_source(folder, args.titles)
+        build_catalog(folder)
+        movies = load_dicts(folder)
+        limits = {name: (age, 100) for name, age in GENRES}
+        clicks = [(random.randint(0, 99), random.choice(GENRES)[0]) for _ in range(args.ops)]
+
+        def before(age, genre):
+            allowed = [name for name, (low, high) in limits.items() if low <= age <= high]
+            titles = [movie for movie in movies[genre] if movie[3] <= age]
+            return random.choice(titles) if genre in allowed and titles else None
+
+        start = time.perf_counter()
+        for age, genre in clicks:
+            before(age, genre)
+        before_us = (time.perf_counter() - start) / args.ops * 1e6
+
+        catalog = MovieCatalog(folder)
+        start = time.perf_counter()
+        index = catalog.eligibility()
+        load_ms = (time.perf_counter() - start) * 1000
+
+        def after(age, genre):
+            return catalog.random_movie(genre, age=age) if index.allows(age, genre) else None
+
+        start = time.perf_counter()
+        for age, genre in clicks:
+            after(age, genre)
+        after_us = (time.perf_counter() - start) / args.ops * 1e6
+
+        # Both must agree on which titles each age may watch
+        for age in range(0, 101):
+            for name, _ in GENRES:
+                expected = sum(movie[3] <= age for movie in movies[name])
+                assert index.count(age, name) == expected, (age, name)
+        catalog.close()
+
+    print(f"\n{args.titles:,} titles, {len(index.starts)} age buckets, "
+          f"index loaded in {load_ms:.2f} ms")
+    print(f"{'per click':<12}{'before':>12}{'after':>12}{'speedup':>10}")
+    print(f"{'':<12}{before_us:>10.1f}us{after_us:>10.1f}us{before_us / after_us:>9.0f}x")
+
+
+def first_repeat(draw, limit):
+    """Return after how many draws an index first comes back (limit if never)."""
+    seen = set()
+    for count in range(limit):
+        index = draw()
+        if index in seen:
+            return count
+        seen.add(index)
+    return limit
+
+
+def bench_shuffle(args):
+    """random.choice vs a shuffled list vs the Feistel shuffle bag."""
+    print(f"\n{'titles':>9}{'sampler':>10}{'setup ms':>10}{'draw us':>9}"
+          f"{'memory KB':>11}{'1st repeat':>12}")
+    for titles in args.titles:
+        rng = random.Random(titles)
+
+        def shuffled_list():
+            order = list(range(titles))
+            rng.shuffle(order)
+            return iter(order).__next__
+
+        samplers = [
+            ("choice", lambda: lambda: rng.randrange(titles)),
+            ("list", shuffled_list),
+            ("bag", lambda: ShuffleBag(titles, rng).draw),
+        ]
+        ops = min(args.ops, titles)
+        for name, create in samplers:
+            start = time.perf_counter()
+            draw = create()
+            setup_ms = (time.perf_counter() - start) * 1000
+            # Memory is measured on a second instance: tracing slows setup down
+            tracemalloc.start()
+            kept = create()
+            memory = tracemalloc.get_traced_memory()[0] / 1024
+            tracemalloc.stop()
+            del kept
+            start = time.perf_counter()
+            for _ in range(ops):
+                draw()
+            draw_us = (time.perf_counter() - start) / ops * 1e6
+            repeat = first_repeat(create(), titles)
+            print(f"{titles:>9,}{name:>10}{setup_ms:>10.2f}{draw_us:>9.2f}{memory:>11.1f}"
+                  f"{repeat:>12,}")
+
+    # Suggestions through the catalog: a seeded sampler repeats itself
+    with tempfile.TemporaryDirectory() as folder:
+        write_source(folder, max(args.titles))
+        catalog = MovieCatalog(folder)
+        first = SuggestionSampler(catalog, seed=1)
+        second = SuggestionSampler(catalog, seed=1)
+        ops = min(args.ops, catalog.count("Drama"))
+        start = time.perf_counter()
+        titles = [first.suggest("Ana", "Drama", 30).title for _ in range(ops)]
+        suggest_us = (time.perf_counter() - start) / ops * 1e6
+        assert titles == [second.suggest("ana", "Drama", 30).title for _ in range(ops)]
+        assert len(set(titles)) == ops
+        catalog.close()
+    print(f"\nSuggestionSampler.suggest: {suggest_us:.1f} us, {ops:,} suggestions "
+          f"without a repeat, same sequence for the same seed")
+
+
+def bench_recommend(args):
+    """Preference vector scoring: one-time feature matrix and per-call top-k."""
+    with tempfile.TemporaryDirectory() as folder:
+        write_source(folder, args.titles)
+        catalog = MovieCatalog(folder)
+        recommender = Recommender(catalog, seed=1)
+        if not recommender.available:
+            print("NumPy não está instalado: o recomendador fica desativado")
+            return
+        catalog.version  # Build the catalog file outside the timing
+        start = time.perf_counter()
+        features = recommender.features()
+        matrix_ms = (time.perf_counter() - start) * 1000
+
+        # A user who accepted a few dramas from the 1990s and skipped others
+        rng = random.Random(args.titles)
+        drama = catalog.genre("Drama")
+        for _ in range(20):
+            movie_id = rng.randrange(drama.first_id, drama.first_id + drama.count)
+            recommender.record("Ana", movie_id, accepted=catalog.movie_by_id(movie_id).year // 10 == 199)
+
+        print(f"\n{args.titles:,} titles, {features.rows.shape[1]} features, "
+              f"matrix {features.rows.nbytes / 1024:,.0f} KB built in {matrix_ms:.1f} ms")
+        print(f"{'scope':>22}{'candidates':>12}{'ms per call':>13}")
+        for label, genre, age in (("whole catalog", None, None), ("Drama, age 12", "Drama", 12),
+                                  ("every genre, age 12", None, 12)):
+            candidates = sum(len(ids) for ids in recommender._candidate_ranges(genre, age))
+            start = time.perf_counter()
+            for _ in range(args.ops):
+                recommender.recommend_ids("Ana", args.k, genre, age)
+            call_ms = (time.perf_counter() - start) / args.ops * 1000
+            print(f"{label:>22}{candidates:>12,}{call_ms:>13.2f}")
+
+        top = recommender.recommend("Ana", args.k, "Drama")
+        print("\nTop", args.k, "for Ana:", ", ".join(f"{movie.title} ({movie.year})" for movie in top))
+        catalog.close()
+
+
+def main():
+    """Parse the command line and run the selected benchmark."""
+    parser = argparse.ArgumentParser(description="Movie suggestion benchmarks")
+    subparsers = parser.add_subparsers(dest="scenario", required=True)
+
+    catalog = subparsers.add_parser(
+        "catalog", help="dict literals vs the genre-partitioned catalog file")
+    catalog.add_argument("--sizes", type=int, nargs="+", default=[25, 200_000])
+    catalog.add_argument("--ops", type=int, default=10_000)
+    catalog.set_defaults(func=bench_catalog)
+
+    eligibility = subparsers.add_parser(
+        "eligibility", help="range checks and rating scans vs the eligibility index")
+    eligibility.add_argument("--titles", type=int, default=200_000)
+    eligibility.add_argument("--ops", type=int, default=2_000)
+    eligibility.set_defaults(func=bench_eligibility)
+
+    shuffle = subparsers.add_parser(
+        "shuffle", help="random.choice vs a shuffled list vs the Feistel shuffle bag")
+    shuffle.add_argument("--titles", type=int, nargs="+", default=[25, 200_000])
+    shuffle.add_argument("--ops", type=int, default=20_000)
+    shuffle.set_defaults(func=bench_shuffle)
+
+    recommend = subparsers.add_parser(
+        "recommend", help="preference vector scoring with diversity re-ranking")
+    recommend.add_argument("--titles", type=int, default=100_000)
+    recommend.add_argument("--ops", type=int, default=200)
+    recommend.add_argument("--k", type=int, default=5)
+    recommend.set_defaults(func=bench_recommend)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
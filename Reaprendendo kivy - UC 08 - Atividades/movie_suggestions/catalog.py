@@ -0,0 +1,390 @@
+"""
+Movie Catalog Stored in an Indexed Data File
+
+The suggestion apps (Atividades 04, 05 and 07) used to rebuild the
+catalog from dict literals on every start. The catalog now lives in two
+CSV files that anyone can edit (data/generos.csv and data/filmes.csv) and
+is read through a SQLite file built from them (data/catalogo.db):
+
+- Movies are stored sorted by genre, so each genre is one contiguous range
+  of ids (generos.primeiro_id, generos.total) and of B-tree pages; the
+  n-th movie of a genre is a single rowid lookup
+- Within a genre, movies are sorted by age rating, and the table
+  elegibilidade records how many of them each age may watch
+  (see eligibility.py)
+- Nothing is read when MovieCatalog is created. The first call opens the
+  file and reads the genres table (one row per genre); a suggestion then
+  reads one movie row of the genre being sampled, whatever the size of the
+  catalog
+- The file is rebuilt automatically, in a temporary file swapped in with
+  os.replace(), when the CSV files change (size or modification time);
+  each build records a version, the SHA-256 of the CSV files
+
+The file can also be rebuilt by hand:
+    python -m movie_suggestions [--source DIR] [--target FILE]
+
+The module does not import Kivy.
+"""
+
+# Import Python standard library modules
+import csv                        # Source files
+import hashlib                    # Catalog version
+import os                         # Paths and atomic replacement
+import random                     # Default random source of random_movie()
+import sqlite3                    # Catalog file
+from collections import namedtuple
+
+from movie_suggestions.eligibility import EligibilityIndex
+
+# Directory with generos.csv, filmes.csv and the generated catalogo.db
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Source files, in the order their contents enter the version hash
+SOURCE_FILES = ("generos.csv", "filmes.csv")
+
+# Rows inserted per executemany() call while building
+BATCH_SIZE = 10_000
+
+# Layout of the catalog file; files built with another layout are rebuilt
+FORMAT = "2"
+
+# One movie; title, year and image come first so code indexing the old
+# (title, year, image) tuples keeps working
+Movie = namedtuple("Movie", "title year image id genre rating")
+
+# One genre: its id range in the filmes table and the allowed ages
+Genre = namedtuple("Genre", "id name min_age max_age first_id count")
+
+SCHEMA = """
+    CREATE TABLE catalogo (
+        chave TEXT PRIMARY KEY,
+        valor TEXT NOT NULL
+    );
+    CREATE TABLE generos (
+        id INTEGER PRIMARY KEY,
+        nome TEXT NOT NULL UNIQUE,
+        idade_minima INTEGER NOT NULL,
+        idade_maxima INTEGER NOT NULL,
+        primeiro_id INTEGER NOT NULL DEFAULT 1,
+        total INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE filmes (
+        id INTEGER PRIMARY KEY,
+        genero_id INTEGER NOT NULL REFERENCES generos (id),
+        titulo TEXT NOT NULL,
+        ano INTEGER NOT NULL,
+        imagem TEXT NOT NULL DEFAULT '',
+        idade_minima INTEGER NOT NULL
+    );
+    CREATE TABLE elegibilidade (
+        idade INTEGER NOT NULL,
+        genero_id INTEGER NOT NULL REFERENCES generos (id),
+        total INTEGER NOT NULL,
+        PRIMARY KEY (idade, genero_id)
+    ) WITHOUT ROWID;
+"""
+
+
+def source_signature(source):
+    """Return the size and mtime of the source files, or None if one is missing."""
+    parts = []
+    for name in SOURCE_FILES:
+        try:
+            status = os.stat(os.path.join(source, name))
+        except FileNotFoundError:
+            return None
+        parts.append(f"{status.st_size}:{status.st_mtime_ns}")
+    return " ".join(parts)
+
+
+def source_version(source):
+    """SHA-256 of the source files, used as the catalog version."""
+    digest = hashlib.sha256()
+    for name in SOURCE_FILES:
+        with open(os.path.join(source, name), "rb") as file:
+            for block in iter(lambda: file.read(1 << 16), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _csv_rows(path):
+    """Yield (line number, row dict) from a CSV file with a header line."""
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def _movie_rows(path, genres):
+    """
+    Yield (genre id, title, year, image, rating) tuples from filmes.csv.
+
+    Args:
+        genres (dict): Genre name -> (id, minimum age); the minimum age is
+            the rating of titles whose idade_minima column is empty
+    """
+    for line, row in _csv_rows(path):
+        if row["genero"] not in genres:
+            raise ValueError(f"{path}, linha {line}: gênero desconhecido {row['genero']!r}")
+        genre_id, rating = genres[row["genero"]]
+        try:
+            year = int(row["ano"])
+            if (row.get("idade_minima") or "").strip():
+                rating = int(row["idade_minima"])
+        except ValueError:
+            raise ValueError(f"{path}, linha {line}: ano ou idade mínima inválidos") from None
+        if rating < 0:
+            raise ValueError(f"{path}, linha {line}: idade mínima negativa")
+        yield genre_id, row["titulo"].strip(), year, (row.get("imagem") or "").strip(), rating
+
+
+def build_catalog(source=DATA_DIR, target=None):
+    """
+    Build the catalog file from the CSV files of a directory.
+
+    The file is written under a temporary name and moved over the old one
+    only when complete, so an open catalog never sees a half-built file.
+
+    Args:
+        source (str): Directory with generos.csv and filmes.csv
+        target (str, optional): Catalog file (default: catalogo.db in source)
+
+    Returns:
+        str: Path of the catalog file
+
+    Raises:
+        ValueError: If a row has an unknown genre or an invalid year
+    """
+    target = target or os.path.join(source, "catalogo.db")
+    signature = source_signature(source)
+    temporary = f"{target}.{os.getpid()}.tmp"
+    if os.path.exists(temporary):
+        os.remove(temporary)
+
+    conn = sqlite3.connect(temporary)
+    try:
+        conn.executescript(SCHEMA)
+        genres = {}
+        for _, row in _csv_rows(os.path.join(source, "generos.csv")):
+            minimum = int(row["idade_minima"])
+            genres[row["genero"]] = conn.execute(
+                "INSERT INTO generos (nome, idade_minima, idade_maxima) VALUES (?, ?, ?)",
+                (row["genero"], minimum, int(row["idade_maxima"]))).lastrowid, minimum
+
+        # Rows go to a staging table first, then into filmes sorted by
+        # genre and rating: each genre gets a contiguous range of ids, and
+        # the titles an age may watch are a prefix of that range
+        conn.execute("CREATE TEMP TABLE entrada (genero_id, titulo, ano, imagem, idade_minima)")
+        rows = _movie_rows(os.path.join(source, "filmes.csv"), genres)
+        while True:
+            batch = [row for _, row in zip(range(BATCH_SIZE), rows)]
+            if not batch:
+                break
+            conn.executemany("INSERT INTO entrada VALUES (?, ?, ?, ?, ?)", batch)
+        conn.execute("""
+            INSERT INTO filmes (genero_id, titulo, ano, imagem, idade_minima)
+            SELECT genero_id, titulo, ano, imagem, idade_minima
+            FROM entrada ORDER BY genero_id, idade_minima, rowid
+        """)
+        conn.execute("""
+            UPDATE generos SET
+                primeiro_id = COALESCE((SELECT MIN(id) FROM filmes WHERE genero_id = generos.id), 1),
+                total = (SELECT COUNT(*) FROM filmes WHERE genero_id = generos.id)
+        """)
+
+        # Eligibility index: the answer only changes at a rating or one
+        # past a genre's maximum age, so one row per such age and genre
+        conn.execute("""
+            CREATE TEMP TABLE contagem AS
+            SELECT genero_id, idade_minima, COUNT(*) AS total
+            FROM filmes GROUP BY genero_id, idade_minima
+        """)
+        conn.execute("""
+            WITH limites (idade) AS (
+                SELECT 0 UNION SELECT idade_minima FROM contagem
+                UNION SELECT idade_maxima + 1 FROM generos
+            )
+            INSERT INTO elegibilidade (idade, genero_id, total)
+            SELECT l.idade, g.id, CASE WHEN l.idade > g.idade_maxima THEN 0 ELSE (
+                SELECT COALESCE(SUM(c.total), 0) FROM contagem AS c
+                WHERE c.genero_id = g.id AND c.idade_minima <= l.idade) END
+            FROM limites AS l CROSS JOIN generos AS g
+        """)
+        conn.executemany(
+            "INSERT INTO catalogo (chave, valor) VALUES (?, ?)",
+            [("formato", FORMAT), ("versao", source_version(source)),
+             ("origem", signature or "")])
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(temporary, target)
+    return target
+
+
+class MovieCatalog:
+    """
+    Lazily opened, genre-partitioned movie catalog.
+
+    Attributes:
+        source (str): Directory with the CSV files the catalog is built from
+        path (str): Catalog file
+    """
+
+    def __init__(self, source=DATA_DIR, path=None):
+        self.source = source
+        self.path = path or os.path.join(source, "catalogo.db")
+        self._conn = None
+        self._genres = None       # name -> Genre, read on first use
+        self._eligibility = None  # EligibilityIndex, read on first use
+        self._version = None
+
+    def _connection(self):
+        """Open the catalog file, (re)building it first if it is stale."""
+        if self._conn is None:
+            signature = source_signature(self.source)
+            if signature is not None and self._stored_signature() != signature:
+                build_catalog(self.source, self.path)
+            elif not os.path.exists(self.path):
+                raise FileNotFoundError(f"Catálogo {self.path} não encontrado")
+            self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        return self._conn
+
+    def _stored_signature(self):
+        """Return the source signature recorded in the catalog file, if any."""
+        if not os.path.exists(self.path):
+            return None
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            stored = dict(conn.execute(
+                "SELECT chave, valor FROM catalogo WHERE chave IN ('formato', 'origem')"))
+        except sqlite3.DatabaseError:
+            return None  # Damaged file: rebuild it
+        finally:
+            conn.close()
+        return stored.get("origem") if stored.get("formato") == FORMAT else None
+
+    def _genre_table(self):
+        """Return the genres (name -> Genre), reading them once."""
+        if self._genres is None:
+            rows = self._connection().execute(
+                "SELECT id, nome, idade_minima, idade_maxima, primeiro_id, total "
+                "FROM generos ORDER BY id")
+            self._genres = {row[1]: Genre(*row) for row in rows}
+        return self._genres
+
+    @property
+    def version(self):
+        """SHA-256 of the CSV files the catalog file was built from."""
+        if self._version is None:
+            self._version = self._connection().execute(
+                "SELECT valor FROM catalogo WHERE chave = 'versao'").fetchone()[0]
+        return self._version
+
+    def genres(self):
+        """Return the genre names in the order of generos.csv."""
+        return list(self._genre_table())
+
+    def genre(self, name):
+        """Return the Genre named name, or None."""
+        return self._genre_table().get(name)
+
+    def eligibility(self):
+        """Return the age eligibility index, reading it once per catalog version."""
+        if self._eligibility is None:
+            rows = self._connection().execute(
+                "SELECT idade, genero_id, total FROM elegibilidade ORDER BY idade")
+            self._eligibility = EligibilityIndex(
+                self.version, self._genre_table().values(), rows)
+        return self._eligibility
+
+    def age_limits(self):
+        """
+        Return {genre: (minimum age, maximum age)} for every genre.
+
+        The minimum is the youngest age with at least one eligible title,
+        so per-title ratings below the genre's default are taken into
+        account.
+        """
+        index = self.eligibility()
+        return {name: index.age_range(name) or (genre.min_age, genre.max_age)
+                for name, genre in self._genre_table().items()}
+
+    def count(self, genre):
+        """Return how many movies a genre has (0 for an unknown genre)."""
+        info = self.genre(genre)
+        return info.count if info else 0
+
+    def movie(self, genre, index):
+        """
+        Return the index-th movie (0-based) of a genre.
+
+        Raises:
+            IndexError: If the genre has fewer movies
+        """
+        info = self.genre(genre)
+        if info is None or not 0 <= index < info.count:
+            raise IndexError(f"{genre!r} não tem o filme {index}")
+        return self.movie_by_id(info.first_id + index)
+
+    def movie_by_id(self, movie_id):
+        """Return the movie with an id, or None."""
+        row = self._connection().execute(
+            "SELECT f.titulo, f.ano, f.imagem, f.id, g.nome, f.idade_minima "
+            "FROM filmes AS f JOIN generos AS g ON g.id = f.genero_id WHERE f.id = ?",
+            (movie_id,)).fetchone()
+        return Movie(*row) if row else None
+
+    def id_range(self):
+        """Return the range of movie ids (contiguous, one genre after another)."""
+        count, first_id = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(MIN(id), 1) FROM filmes").fetchone()
+        return range(first_id, first_id + count)
+
+    def attributes(self):
+        """
+        Yield (genre id, year, age rating) of every movie, in id order.
+
+        The recommender builds its feature matrix from these; genre ids are
+        the Genre.id of genre().
+        """
+        yield from self._connection().execute(
+            "SELECT genero_id, ano, idade_minima FROM filmes ORDER BY id")
+
+    def movies(self, genre, age=None):
+        """
+        Return the movies of a genre, read from its id range only.
+
+        Args:
+            genre (str): Genre name
+            age (int, optional): Only the movies this age may watch
+        """
+        if age is None:
+            info = self.genre(genre)
+            ids = range(info.first_id, info.first_id + info.count) if info else range(0)
+        else:
+            ids = self.eligibility().title_ids(age, genre)
+        rows = self._connection().execute(
+            "SELECT titulo, ano, imagem, id, idade_minima FROM filmes "
+            "WHERE id >= ? AND id < ? ORDER BY id", (ids.start, ids.stop))
+        return [Movie(*row[:4], genre, row[4]) for row in rows]
+
+    def random_movie(self, genre, rng=random, age=None):
+        """
+        Return a uniformly chosen movie of a genre, or None if it has none.
+
+        Args:
+            genre (str): Genre name
+            rng (random.Random, optional): Random source
+            age (int, optional): Only draw among the movies this age may watch
+        """
+        total = self.count(genre) if age is None else self.eligibility().count(age, genre)
+        return self.movie(genre, rng.randrange(total)) if total else None
+
+    def close(self):
+        """Close the catalog file; it is reopened on the next call."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._genres = None
+        self._eligibility = None
+        self._version = None
@@ -0,0 +1,105 @@
+"""
+Age Eligibility Index of the Movie Catalog
+
+The apps used to compare the user's age with the (minimum, maximum) of the
+selected genre on every click. With per-title ratings that becomes a scan
+of the genre's titles. The index answers "which genres and titles may
+this age watch?" with a list lookup instead:
+
+- Every title has a rating (filmes.csv idade_minima, or the genre's
+  minimum age from generos.csv when empty). build_catalog() stores each
+  genre's titles sorted by rating, so the titles an age may watch are
+  always a prefix of the genre's id range
+- The ages where the answer changes (each rating, and each genre's maximum
+  age + 1) split 0..∞ into buckets. For every bucket and genre the catalog
+  file keeps how many titles are eligible (table elegibilidade), computed
+  once per catalog version at build time
+- In memory, an array maps every age to its bucket, so genres(age),
+  count(age, genre) and title_ids(age, genre) cost O(1)
+
+The module does not import Kivy.
+"""
+
+# Import Python standard library modules
+from bisect import bisect_right  # Bucket of each age
+
+
+class EligibilityIndex:
+    """
+    Eligible genres and titles per age bucket.
+
+    Attributes:
+        version (str): Catalog version the index was built for
+        starts (list): First age of each bucket, ascending
+    """
+
+    def __init__(self, version, genres, rows):
+        """
+        Args:
+            version (str): Catalog version
+            genres (iterable): Genre tuples of the catalog, in display order
+            rows (iterable): (first age of bucket, genre id, eligible titles)
+        """
+        self.version = version
+        self._genres = {genre.name: genre for genre in genres}
+        counts = {}
+        for age, genre_id, total in rows:
+            counts.setdefault(age, {})[genre_id] = total
+        self.starts = sorted(counts) or [0]
+
+        # Per bucket: {genre name: eligible titles} and the eligible names
+        self._counts = []
+        self._eligible = []
+        for start in self.starts:
+            bucket = {name: counts.get(start, {}).get(genre.id, 0)
+                      for name, genre in self._genres.items()}
+            self._counts.append(bucket)
+            self._eligible.append(tuple(name for name, total in bucket.items() if total))
+
+        # Ages past the last bucket start all share the last bucket
+        self._bucket_of_age = [bisect_right(self.starts, age) - 1
+                               for age in range(self.starts[-1] + 1)]
+
+    def bucket(self, age):
+        """
+        Return the bucket number of an age.
+
+        Raises:
+            ValueError: If the age is negative
+        """
+        if age < 0:
+            raise ValueError(f"Idade inválida: {age}")
+        return self._bucket_of_age[min(age, len(self._bucket_of_age) - 1)]
+
+    def genres(self, age):
+        """Return the genres with at least one title for an age, in catalog order."""
+        return self._eligible[self.bucket(age)]
+
+    def count(self, age, genre):
+        """Return how many titles of a genre an age may watch."""
+        return self._counts[self.bucket(age)].get(genre, 0)
+
+    def allows(self, age, genre):
+        """Return True if an age may watch at least one title of a genre."""
+        return self.count(age, genre) > 0
+
+    def title_ids(self, age, genre):
+        """Return the ids of the titles of a genre an age may watch, as a range."""
+        info = self._genres.get(genre)
+        if info is None:
+            return range(0)
+        return range(info.first_id, info.first_id + self.count(age, genre))
+
+    def age_range(self, genre):
+        """
+        Return (youngest age with an eligible title, genre maximum age).
+
+        Returns None for an unknown genre or a genre without titles.
+        """
+        info = self._genres.get(genre)
+        if info is None:
+            return None
+        for start, bucket in zip(self.starts, self._counts):
+            if bucket[genre]:
+                return start, info.max_age
+        return None
@@ -0,0 +1,110 @@
+"""
+Bounded Suggestion History with an On-Disk Log
+
+The apps of Atividades 04 and 07 added a Label and an Image widget to the
+history for every suggestion and never removed them, so a long session
+kept growing its widget tree and scrolling slowed down. SuggestionHistory
+keeps the history out of the widget tree:
+
+- Only the last `limit` suggestions stay in memory, in a deque; the apps
+  show them in a HistoryPanel (history_view.py), a RecycleView that
+  creates widgets for the visible rows only and reuses them while
+  scrolling. The history owns the limit: add() returns the entry it
+  pushed out, and the panel drops its first row only then, so it always
+  mirrors the deque
+- A suggestion pushed out of the deque is appended to a CSV log
+  (data/historico.csv by default), so nothing is lost: memory stays flat
+  however many suggestions a session makes
+- clear() empties the panel and moves its entries to the log as well
+
+The module does not import Kivy.
+"""
+
+# Import Python standard library modules
+import csv                        # Log file
+import os                         # Paths
+import time                       # Timestamps of the entries
+from collections import deque, namedtuple
+
+from movie_suggestions.catalog import DATA_DIR
+
+# Default log file, next to the catalog (ignored by git)
+LOG_PATH = os.path.join(DATA_DIR, "historico.csv")
+
+# Columns of the log file
+LOG_COLUMNS = ("data_hora", "usuario", "titulo", "ano", "genero", "imagem")
+
+# One suggestion shown to a user
+HistoryEntry = namedtuple("HistoryEntry", "time user title year genre image")
+
+
+class SuggestionHistory:
+    """
+    The last suggestions of a session, older ones spilled to a log file.
+
+    Attributes:
+        limit (int): Suggestions kept in memory
+        path (str): Log file (None to drop old entries instead)
+        spilled (int): Entries written to the log by this instance
+    """
+
+    def __init__(self, limit=50, path=LOG_PATH):
+        if limit < 1:
+            raise ValueError(f"Limite do histórico inválido: {limit}")
+        self.limit = limit
+        self.path = path
+        self.spilled = 0
+        self._entries = deque()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        """Iterate over the entries in memory, oldest first."""
+        return iter(self._entries)
+
+    def add(self, user, movie):
+        """
+        Record a suggestion; the oldest one goes to the log past the limit.
+
+        Args:
+            user (str): User name
+            movie (Movie): Suggested movie
+
+        Returns:
+            HistoryEntry or None: The entry pushed out to the log, if any
+        """
+        self._entries.append(HistoryEntry(time.strftime("%Y-%m-%d %H:%M:%S"), user,
+                                          movie.title, movie.year, movie.genre, movie.image))
+        if len(self._entries) <= self.limit:
+            return None
+        evicted = self._entries.popleft()
+        self._spill([evicted])
+        return evicted
+
+    def clear(self):
+        """Empty the history, moving its entries to the log."""
+        self._spill(self._entries)
+        self._entries.clear()
+
+    def _spill(self, entries):
+        """Append entries to the log file (header written on creation)."""
+        if not entries or self.path is None:
+            return
+        new_file = not os.path.exists(self.path)
+        with open(self.path, "a", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            if new_file:
+                writer.writerow(LOG_COLUMNS)
+            writer.writerows(entries)
+        self.spilled += len(entries)
+
+    def log(self):
+        """Yield the entries of the log file, oldest first."""
+        if self.path is None or not os.path.exists(self.path):
+            return
+        with open(self.path, newline="", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            for row in reader:
+                yield HistoryEntry(*row)
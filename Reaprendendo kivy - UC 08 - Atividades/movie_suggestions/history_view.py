@@ -0,0 +1,142 @@
+"""
+Recycled Suggestion History Panel (Kivy)
+
+The apps of Atividades 04 and 07 each carried their own copy of the
+history row widget and of the code that appends a row, drops the oldest
+one and resizes the panel. HistoryPanel is that code, written once:
+
+- A RecycleView over a SuggestionHistory: only the rows on screen exist
+  as widgets, and they are reused while scrolling
+- add() records the suggestion in the history and mirrors it in the
+  panel data; the panel drops its first row only when the history
+  evicted an entry, so the history is the one place that enforces the
+  limit
+- clear() moves the history to the log and empties the panel
+
+This is the only module of the package that imports Kivy; it is not
+imported by movie_suggestions/__init__.py.
+"""
+
+# Import Python standard library modules
+import os                         # Poster paths
+
+from kivy.logger import Logger
+from kivy.properties import StringProperty
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.image import Image
+from kivy.uix.label import Label
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+
+
+class HistoryItem(BoxLayout):
+    """
+    One row of the history (RecycleView view class), caption above the poster.
+
+    Each time the row is shown for another suggestion, text and source are
+    set from that suggestion's data dict and the bindings update the label
+    and the poster.
+
+    Attributes:
+        text (StringProperty): Caption of the suggestion
+        source (StringProperty): Poster image path ("" when missing)
+    """
+
+    text = StringProperty("")
+    source = StringProperty("")
+
+    # Order of the child widgets (Atividade 07 shows the poster first)
+    caption_first = True
+
+    def __init__(self, **kwargs):
+        """Create the caption and poster widgets once; they are reused."""
+        super().__init__(orientation='vertical', **kwargs)
+        self.label = Label(color=(1, 1, 1, 1), size_hint_y=None, height=30)
+        self.image = Image(allow_stretch=True)
+        for widget in ((self.label, self.image) if self.caption_first
+                       else (self.image, self.label)):
+            self.add_widget(widget)
+        self.bind(text=self.label.setter('text'), source=self._update_image)
+
+    def _update_image(self, instance, value):
+        """Show the poster of the suggestion, or hide the image when missing."""
+        self.image.source = value
+        self.image.opacity = 1 if value else 0
+
+
+class PosterFirstHistoryItem(HistoryItem):
+    """History row with the poster above the caption."""
+
+    caption_first = False
+
+
+class HistoryPanel(RecycleView):
+    """
+    Recycled view of a SuggestionHistory; hidden (height 0) while empty.
+
+    Attributes:
+        history (SuggestionHistory): Entries shown, oldest first
+        image_dir (str): Directory the movie image names are relative to
+        missing_note (str): Appended to the caption when the poster is missing
+        rows (RecycleBoxLayout): Layout of the rows
+    """
+
+    # Tallest the panel grows before it scrolls
+    MAX_HEIGHT = 300
+
+    # Height of a row with a poster and of a caption-only row
+    POSTER_ROW_HEIGHT = 240
+    CAPTION_ROW_HEIGHT = 30
+
+    # Space between rows
+    SPACING = 10
+
+    def __init__(self, history, image_dir, missing_note="", viewclass=HistoryItem, **kwargs):
+        kwargs.setdefault("size_hint", (1, None))
+        kwargs.setdefault("height", 0)
+        super().__init__(**kwargs)
+        self.history = history
+        self.image_dir = image_dir
+        self.missing_note = missing_note
+        self.rows = RecycleBoxLayout(
+            viewclass=viewclass,           # Row widget, reused while scrolling
+            orientation='vertical',
+            size_hint_y=None,              # Height from the rows
+            default_size_hint=(1, None),   # Full width rows, height from data
+            spacing=self.SPACING,
+            padding=5
+        )
+        self.rows.bind(minimum_height=self.rows.setter('height'))
+        self.add_widget(self.rows)
+
+    def add(self, user, movie):
+        """
+        Record a suggestion and show it as the last row.
+
+        Returns:
+            HistoryEntry or None: The entry the history pushed out to the log
+        """
+        evicted = self.history.add(user, movie)
+        self.data.append(self._row(user, movie))
+        if evicted is not None:
+            del self.data[0]
+        self.height = min(self.MAX_HEIGHT,
+                          sum(row["height"] + self.SPACING for row in self.data))
+        self.scroll_y = 0  # Latest entry (bottom of the list)
+        return evicted
+
+    def clear(self):
+        """Move the history to the log file and hide the panel."""
+        self.history.clear()
+        self.data = []
+        self.height = 0
+
+    def _row(self, user, movie):
+        """Data dict of a suggestion's row; text-only when the poster is missing."""
+        text = f"{user} sugeriu: {movie.title} ({movie.year})"
+        path = os.path.join(self.image_dir, movie.image)
+        if os.path.exists(path):
+            return {"text": text, "source": path, "height": self.POSTER_ROW_HEIGHT}
+        Logger.warning(f"History: poster not found: {path}")
+        return {"text": text + self.missing_note, "source": "",
+                "height": self.CAPTION_ROW_HEIGHT}
@@ -0,0 +1,286 @@
+"""
+Preference-Based Movie Recommendations
+
+The apps collected a history of suggestions without ever using it. The
+Recommender turns that history into a preference vector per user and
+ranks the catalog with it:
+
+- Every title is a row of a feature matrix: one-hot genre, decade and age
+  rating, scaled to unit length. The matrix is built once per catalog
+  version, in one pass over MovieCatalog.attributes()
+- A user's preference vector is the decayed sum of the rows of the titles
+  they accepted (+1) and of those only suggested to them (-0.1), folded
+  in one event at a time: O(features) per event, no stored history
+- Nothing is built for users who never accept a title: until the first
+  acceptance their suggestions are only buffered (the last
+  PENDING_EVENTS of them) and replayed into the new profile then, so the
+  feature matrix is not built on every suggestion
+- Scoring is one matrix-vector product over the eligible titles (a
+  genre's titles for an age are one id range, see eligibility.py). The
+  best candidates are taken with argpartition and re-ranked for diversity
+  with maximal marginal relevance, so the top-k is not k near-identical
+  titles
+- Titles already suggested to the user are excluded until every eligible
+  title of the genre has been suggested
+
+NumPy is optional: without it, available is False and the apps keep the
+shuffle bags of shuffle.py. The module does not import Kivy.
+"""
+
+# Import Python standard library modules
+import math                       # Row normalization
+from collections import deque     # Suggestions before the first acceptance
+
+try:
+    import numpy as np  # Optional: without it the apps keep the shuffle bags
+except ImportError:
+    np = None
+
+
+class FeatureMatrix:
+    """
+    Feature rows of every title of a catalog version.
+
+    Attributes:
+        version (str): Catalog version the matrix was built from
+        first_id (int): Id of row 0 (ids are contiguous)
+        rows (numpy.ndarray): float32 matrix, one unit-length row per title
+        columns (list): Name of each column, e.g. "gênero:Drama", "década:1990"
+    """
+
+    def __init__(self, catalog):
+        self.version = catalog.version
+        genres = {catalog.genre(name).id: name for name in catalog.genres()}
+        ids = catalog.id_range()
+        count = len(ids)
+        self.first_id = ids.start
+
+        values = np.fromiter(
+            (value for row in catalog.attributes() for value in row),
+            dtype=np.int32, count=count * 3).reshape(count, 3)
+
+        # One block of one-hot columns per attribute
+        self.columns = []
+        blocks = []
+        for label, column in (("gênero", values[:, 0]), ("década", values[:, 1] // 10 * 10),
+                              ("idade", values[:, 2])):
+            levels, positions = np.unique(column, return_inverse=True)
+            if label == "gênero":
+                self.columns.extend(f"gênero:{genres.get(int(level), level)}" for level in levels)
+            else:
+                self.columns.extend(f"{label}:{int(level)}" for level in levels)
+            blocks.append((positions, len(levels)))
+
+        self.rows = np.zeros((count, len(self.columns)), dtype=np.float32)
+        offset = 0
+        lines = np.arange(count)
+        for positions, width in blocks:
+            self.rows[lines, offset + positions] = 1.0
+            offset += width
+        self.rows /= math.sqrt(len(blocks))
+
+    def row(self, movie_id):
+        """Return the feature row of a title."""
+        return self.rows[movie_id - self.first_id]
+
+
+class Recommender:
+    """
+    Per-user preference vectors and top-k recommendations over a catalog.
+
+    Attributes:
+        catalog (MovieCatalog): Catalog the titles come from
+        available (bool): False when NumPy is not installed
+    """
+
+    # Weight of an accepted title and of a title only suggested
+    ACCEPTED = 1.0
+    SUGGESTED = -0.1
+
+    # Older events fade: each new event multiplies the profile by this
+    DECAY = 0.95
+
+    # Suggestions kept until a user's first acceptance (0.95 ** 100 < 1%)
+    PENDING_EVENTS = 100
+
+    # Candidates taken from the scores for the diversity re-ranking, per k
+    CANDIDATES_PER_RESULT = 4
+
+    # Relevance vs diversity in the re-ranking (1.0 = relevance only)
+    RELEVANCE = 0.7
+
+    def __init__(self, catalog, seed=None):
+        self.catalog = catalog
+        self.available = np is not None
+        self._features = None
+        self._profiles = {}  # user -> preference vector
+        self._pending = {}   # user -> ids suggested before the first acceptance
+        self._seen = {}      # user -> ids already suggested
+        self._rng = np.random.default_rng(seed) if self.available else None
+
+    @staticmethod
+    def user_key(user):
+        """Names typed with other spacing or case are the same user."""
+        return " ".join(str(user).split()).casefold()
+
+    def features(self):
+        """Return the feature matrix, rebuilding it when the catalog changes."""
+        if self._features is None or self._features.version != self.catalog.version:
+            self._features = FeatureMatrix(self.catalog)
+            self._profiles.clear()
+        return self._features
+
+    def record(self, user, movie_id, accepted=False):
+        """
+        Fold one history event into the user's preference vector.
+
+        A suggestion to a user without a profile is only buffered; the
+        first acceptance builds the profile and replays the buffer first.
+
+        Args:
+            user (str): User name
+            movie_id (int): Title suggested to the user
+            accepted (bool): True if the user accepted the suggestion
+        """
+        key = self.user_key(user)
+        self._seen.setdefault(key, set()).add(movie_id)
+        if not self.available:
+            return
+        if not accepted and key not in self._profiles:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = deque(maxlen=self.PENDING_EVENTS)
+            pending.append(movie_id)
+            return
+        features = self.features()
+        profile = self._profiles.get(key)
+        if profile is None:
+            profile = self._profiles[key] = np.zeros(len(features.columns), dtype=np.float32)
+            for suggested in self._pending.pop(key, ()):
+                profile *= self.DECAY
+                profile += self.SUGGESTED * features.row(suggested)
+        profile *= self.DECAY
+        profile += (self.ACCEPTED if accepted else self.SUGGESTED) * features.row(movie_id)
+
+    def has_preferences(self, user):
+        """Return True once the user accepted something the profile still favors."""
+        profile = self._profiles.get(self.user_key(user))
+        return profile is not None and bool((profile > 0).any())
+
+    def preferences(self, user):
+        """Return {column: weight} of the user's profile, strongest first."""
+        profile = self._profiles.get(self.user_key(user))
+        if profile is None:
+            return {}
+        columns = self.features().columns
+        return {columns[i]: float(profile[i]) for i in np.argsort(-profile) if profile[i]}
+
+    def _candidate_ranges(self, genre, age):
+        """Return the id ranges that may be recommended."""
+        if genre is not None:
+            if age is None:
+                info = self.catalog.genre(genre)
+                return [range(info.first_id, info.first_id + info.count)] if info else []
+            return [self.catalog.eligibility().title_ids(age, genre)]
+        names = self.catalog.genres() if age is None else self.catalog.eligibility().genres(age)
+        return [self._candidate_ranges(name, age)[0] for name in names]
+
+    def recommend_ids(self, user, k=5, genre=None, age=None, exclude_seen=True):
+        """
+        Return up to k title ids ranked by preference, diversified.
+
+        Args:
+            user (str): User name
+            k (int): Number of titles
+            genre (str, optional): Only this genre
+            age (int, optional): Only titles this age may watch
+            exclude_seen (bool): Skip titles already suggested to the user
+        """
+        features = self.features()
+        profile = self._profiles.get(self.user_key(user))
+        if profile is None:
+            profile = np.zeros(len(features.columns), dtype=np.float32)
+        ranges = [ids for ids in self._candidate_ranges(genre, age) if len(ids)]
+        if not ranges:
+            return []
+
+        # The scoring itself: one matrix-vector product per genre range
+        # (contiguous rows, no copy of the matrix); the jitter breaks ties
+        # between titles with identical features at random
+        offsets = [ids.start - features.first_id for ids in ranges]
+        scores = np.concatenate([features.rows[offset:offset + len(ids)] @ profile
+                                 for offset, ids in zip(offsets, ranges)])
+        scores += self._rng.random(len(scores), dtype=np.float32) * 1e-3
+        ids = np.concatenate([np.arange(ids.start, ids.stop) for ids in ranges])
+
+        seen = self._seen.get(self.user_key(user), ())
+        if exclude_seen and seen:
+            # ids is ascending, so each seen id is found by binary search
+            seen_ids = np.fromiter(seen, dtype=ids.dtype, count=len(seen))
+            positions = np.searchsorted(ids, seen_ids)
+            inside = positions < len(ids)
+            positions, seen_ids = positions[inside], seen_ids[inside]
+            hit = positions[ids[positions] == seen_ids]
+            if len(hit) >= len(ids):
+                return []
+            scores[hit] = -np.inf
+
+        pool = min(len(scores), k * self.CANDIDATES_PER_RESULT)
+        candidates = np.argpartition(scores, len(scores) - pool)[len(scores) - pool:]
+        candidates = candidates[np.isfinite(scores[candidates])]
+        if not len(candidates):
+            return []
+        candidates = candidates[np.argsort(-scores[candidates])]
+        chosen = self._diversify(features.rows[ids[candidates] - features.first_id],
+                                 scores[candidates], k)
+        return [int(ids[candidates[i]]) for i in chosen]
+
+    def _diversify(self, rows, relevance, k):
+        """
+        Maximal marginal relevance re-ranking.
+
+        Args:
+            rows (numpy.ndarray): Feature rows of the candidates
+            relevance (numpy.ndarray): Their scores
+            k (int): Number of candidates to pick
+
+        Returns:
+            list: Positions of the picked candidates, in order
+        """
+        spread = float(relevance.max() - relevance.min()) or 1.0
+        relevance = (relevance - relevance.min()) / spread
+        similarity = rows @ rows.T
+        chosen = []
+        closest = np.zeros(len(rows), dtype=np.float32)
+        available = np.ones(len(rows), dtype=bool)
+        for _ in range(min(k, len(rows))):
+            value = self.RELEVANCE * relevance - (1 - self.RELEVANCE) * closest
+            value[~available] = -np.inf
+            best = int(np.argmax(value))
+            chosen.append(best)
+            available[best] = False
+            closest = np.maximum(closest, similarity[best])
+        return chosen
+
+    def recommend(self, user, k=5, genre=None, age=None):
+        """Return up to k Movie tuples for a user (see recommend_ids)."""
+        return [self.catalog.movie_by_id(movie_id)
+                for movie_id in self.recommend_ids(user, k, genre, age)]
+
+    def suggest(self, user, genre, age=None):
+        """
+        Return the best title of a genre the user was not suggested yet.
+
+        Returns None while the user has no preferences (or without NumPy);
+        once every eligible title was suggested the genre starts over.
+        """
+        if not self.available or not self.has_preferences(user):
+            return None
+        ids = self.recommend_ids(user, 1, genre, age)
+        if not ids:
+            key = self.user_key(user)
+            ranges = self._candidate_ranges(genre, age)
+            self._seen[key] = {movie_id for movie_id in self._seen.get(key, ())
+                               if not any(movie_id in ids for ids in ranges)}
+            ids = self.recommend_ids(user, 1, genre, age)
+        return self.catalog.movie_by_id(ids[0]) if ids else None
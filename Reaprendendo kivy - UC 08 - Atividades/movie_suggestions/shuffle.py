@@ -0,0 +1,193 @@
+"""
+Non-Repeating Movie Suggestions (Shuffle Bags)
+
+random.choice() brings the same title back again and again within a
+session. A shuffle bag draws every title of a genre once, in random
+order, before any title repeats:
+
+- The order is a FeistelPermutation of range(n): a keyed bijection whose
+  k-th element is computed on demand (a 4-round Feistel network over the
+  next even power of two, cycle-walking the values >= n). Nothing
+  proportional to n is ever stored or shuffled, so creating a bag and each
+  draw are O(1), even for a genre of 200k titles
+- A bag is only its size, its position and its key. When it is exhausted
+  it starts a new round with a new key; if that round would start with
+  the title just suggested, its first two draws are swapped
+- SuggestionSampler keeps one bag per (user, genre) over the titles the
+  user's age may watch (a prefix of the genre, see eligibility.py). A bag
+  restarts when that number changes (another age or catalog version)
+- Keys come from random.Random, so a sampler created with a seed always
+  suggests the same sequence, which keeps tests reproducible
+
+The module does not import Kivy.
+"""
+
+# Import Python standard library modules
+import random  # Round keys
+
+# 64-bit arithmetic of the round function
+MASK_64 = (1 << 64) - 1
+
+
+def _mix(value, key):
+    """Round function: a 64-bit finalizer (splitmix64) of value xor key."""
+    value = ((value ^ key) * 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+class FeistelPermutation:
+    """
+    Keyed permutation of range(size), evaluated one index at a time.
+
+    Attributes:
+        size (int): Number of elements permuted
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, size, keys):
+        """
+        Args:
+            size (int): Number of elements (at least 1)
+            keys (sequence): One 64-bit key per round
+        """
+        if size < 1:
+            raise ValueError("Uma permutação precisa de pelo menos um elemento")
+        self.size = size
+        self._keys = tuple(keys)
+        # Smallest even number of bits covering size - 1 (at least 2), so
+        # the network works on two halves of equal width
+        bits = max(2, (size - 1).bit_length())
+        bits += bits % 2
+        self._half = bits // 2
+        self._half_mask = (1 << self._half) - 1
+
+    def _encrypt(self, value):
+        """One pass of the Feistel network over the power-of-two domain."""
+        left, right = value >> self._half, value & self._half_mask
+        for key in self._keys:
+            left, right = right, left ^ (_mix(right, key) & self._half_mask)
+        return (left << self._half) | right
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        """Return the element at position index of the permutation."""
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        # Cycle walking: the domain is less than 4x size, so values past the
+        # end are re-encrypted fewer than 4 times on average
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+
+class ShuffleBag:
+    """
+    Draws every index of range(size) once per round, in random order.
+
+    Attributes:
+        size (int): Number of indexes in the bag
+        position (int): Draws made in the current round
+        rounds (int): Rounds started so far
+    """
+
+    def __init__(self, size, rng=None):
+        """
+        Args:
+            size (int): Number of indexes (at least 1)
+            rng (random.Random, optional): Source of the round keys
+        """
+        self.size = size
+        self._rng = rng or random.Random()
+        self.rounds = 0
+        self._last = None
+        self._start_round()
+
+    def _start_round(self):
+        """Pick a new permutation and rewind."""
+        keys = [self._rng.getrandbits(64) for _ in range(FeistelPermutation.ROUNDS)]
+        self._permutation = FeistelPermutation(self.size, keys)
+        self.position = 0
+        self.rounds += 1
+        # Never suggest the same index twice in a row across rounds
+        self._swap_first = self.size > 1 and self._permutation[0] == self._last
+
+    @property
+    def remaining(self):
+        """Indexes not drawn yet in the current round."""
+        return self.size - self.position
+
+    def draw(self):
+        """Return the next index; a new round starts once all were drawn."""
+        if self.position == self.size:
+            self._start_round()
+        position = self.position
+        if self._swap_first and position < 2:
+            position = 1 - position
+        self._last = self._permutation[position]
+        self.position += 1
+        return self._last
+
+
+class SuggestionSampler:
+    """
+    Per-user, per-genre shuffle bags over a MovieCatalog.
+
+    Attributes:
+        catalog (MovieCatalog): Catalog the movies are read from
+        seed: Seed of every bag (None for a different order each session)
+    """
+
+    def __init__(self, catalog, seed=None):
+        self.catalog = catalog
+        self.seed = seed
+        self._bags = {}  # (user, genre) -> (catalog version, ShuffleBag)
+
+    @staticmethod
+    def user_key(user):
+        """Names typed with other spacing or case are the same user."""
+        return " ".join(str(user).split()).casefold()
+
+    def bag(self, user, genre, age=None):
+        """
+        Return the bag of a user and genre, or None if no title is eligible.
+
+        Args:
+            user (str): User name
+            genre (str): Genre name
+            age (int, optional): Only titles this age may watch
+        """
+        if age is None:
+            size = self.catalog.count(genre)
+        else:
+            size = self.catalog.eligibility().count(age, genre)
+        if not size:
+            return None
+
+        key = (self.user_key(user), genre)
+        version, bag = self._bags.get(key, (None, None))
+        if bag is None or bag.size != size or version != self.catalog.version:
+            rng = random.Random(f"{self.seed}:{key[0]}:{genre}:{size}") \
+                if self.seed is not None else random.Random()
+            bag = ShuffleBag(size, rng)
+            self._bags[key] = (self.catalog.version, bag)
+        return bag
+
+    def suggest(self, user, genre, age=None):
+        """Return the next movie of the user's bag for a genre, or None."""
+        bag = self.bag(user, genre, age)
+        return self.catalog.movie(genre, bag.draw()) if bag else None
+
+    def reset(self, user=None):
+        """Forget the bags of one user (or of everybody)."""
+        if user is None:
+            self._bags.clear()
+        else:
+            name = self.user_key(user)
+            for key in [key for key in self._bags if key[0] == name]:
+                del self._bags[key]
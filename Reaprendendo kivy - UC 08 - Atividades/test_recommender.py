@@ -0,0 +1,64 @@
+"""
+Tests of the preference-based recommendations (movie_suggestions/recommender.py).
+"""
+
+import pytest
+
+from movie_suggestions.recommender import Recommender
+
+np = pytest.importorskip("numpy")
+
+
+def test_an_accepted_genre_ranks_higher(make_catalog):
+    # Same decade and rating everywhere: only the genre tells titles apart
+    catalog = make_catalog([(f"Drama {i}", 2000, "Drama", 0) for i in range(5)]
+                           + [(f"Comédia {i}", 2000, "Comédia", 0) for i in range(5)])
+    recommender = Recommender(catalog, seed=1)
+    comedies = catalog.genre("Comédia")
+    recommender.record("Ana", comedies.first_id)
+    recommender.record("Ana", catalog.genre("Drama").first_id, accepted=True)
+
+    preferences = recommender.preferences("Ana")
+    assert preferences["gênero:Drama"] > 0 > preferences["gênero:Comédia"]
+    assert [catalog.movie_by_id(movie_id).genre
+            for movie_id in recommender.recommend_ids("Ana", k=3)] == ["Drama"] * 3
+    assert recommender.suggest("Ana", "Drama").genre == "Drama"
+
+
+def test_suggestions_are_buffered_until_the_first_acceptance(make_catalog):
+    catalog = make_catalog([(f"Drama {i}", 1990 + i, "Drama", i % 3 * 6) for i in range(12)])
+    recommender = Recommender(catalog, seed=1)
+    for movie_id in range(1, 9):
+        recommender.record("Ana", movie_id)
+    assert recommender._features is None
+    assert not recommender.has_preferences("Ana")
+    assert recommender.suggest("Ana", "Drama") is None
+
+    recommender.record("Ana", 9, accepted=True)
+    features = recommender.features()
+    expected = np.zeros(len(features.columns), dtype=np.float32)
+    for movie_id in range(1, 9):
+        expected = expected * Recommender.DECAY + Recommender.SUGGESTED * features.row(movie_id)
+    expected = expected * Recommender.DECAY + Recommender.ACCEPTED * features.row(9)
+    assert np.allclose(recommender._profiles["ana"], expected)
+    assert recommender.has_preferences(" ANA ")
+
+
+def test_diversity_picks_another_kind_before_a_second_twin(make_catalog):
+    # Two groups of identical titles with nothing in common, both liked
+    catalog = make_catalog([(f"Drama {i}", 1990, "Drama", 12) for i in range(4)]
+                           + [(f"Comédia {i}", 2010, "Comédia", 0) for i in range(4)]
+                           + [(f"Terror {i}", 1970, "Terror", 18) for i in range(4)])
+    recommender = Recommender(catalog, seed=1)
+    recommender.record("Ana", catalog.genre("Drama").first_id, accepted=True)
+    recommender.record("Ana", catalog.genre("Comédia").first_id, accepted=True)
+
+    genres = [catalog.movie_by_id(movie_id).genre
+              for movie_id in recommender.recommend_ids("Ana", k=2)]
+    assert genres == ["Comédia", "Drama"]
+
+    # Relevance alone would have returned two identical comedies
+    recommender.RELEVANCE = 1.0
+    genres = [catalog.movie_by_id(movie_id).genre
+              for movie_id in recommender.recommend_ids("Ana", k=2)]
+    assert genres == ["Comédia", "Comédia"]
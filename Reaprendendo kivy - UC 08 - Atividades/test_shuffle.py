@@ -0,0 +1,77 @@
+"""
+Tests of the non-repeating suggestions (movie_suggestions/shuffle.py).
+"""
+
+import random
+
+import pytest
+
+from conftest import write_source
+from movie_suggestions.shuffle import FeistelPermutation, ShuffleBag, SuggestionSampler
+
+# Powers of two and sizes that make the permutation cycle-walk
+SIZES = [1, 2, 3, 4, 5, 7, 16, 17, 100, 1000, 1023, 1025]
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_permutation_is_a_bijection(size):
+    permutation = FeistelPermutation(size, [random.Random(size).getrandbits(64)
+                                            for _ in range(FeistelPermutation.ROUNDS)])
+    assert sorted(permutation[i] for i in range(size)) == list(range(size))
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_every_index_is_drawn_once_per_round(size):
+    bag = ShuffleBag(size, random.Random(size))
+    for _ in range(3):
+        assert sorted(bag.draw() for _ in range(size)) == list(range(size))
+    assert bag.rounds == 3
+
+
+@pytest.mark.parametrize("size", [2, 3, 5, 17])
+def test_a_round_never_starts_with_the_last_draw(size):
+    bag = ShuffleBag(size, random.Random(0))
+    last = None
+    for _ in range(200):
+        for position in range(size):
+            index = bag.draw()
+            if position == 0:
+                assert index != last
+        last = index
+
+
+def test_the_same_seed_gives_the_same_sequence(make_catalog):
+    catalog = make_catalog([(f"Drama {i}", 2000, "Drama", 0) for i in range(30)])
+    first, second = SuggestionSampler(catalog, seed=7), SuggestionSampler(catalog, seed=7)
+    sequence = [first.suggest("Ana", "Drama") for _ in range(60)]
+    assert sequence == [second.suggest(" ana ", "Drama") for _ in range(60)]
+    other = SuggestionSampler(catalog, seed=8)
+    assert sequence != [other.suggest("Ana", "Drama") for _ in range(60)]
+
+
+def test_the_bag_restarts_when_the_eligible_count_changes(make_catalog):
+    catalog = make_catalog([(f"Livre {i}", 2000, "Drama", 0) for i in range(5)]
+                           + [(f"Adulto {i}", 2000, "Drama", 18) for i in range(5)])
+    sampler = SuggestionSampler(catalog, seed=1)
+    child = sampler.bag("Ana", "Drama", age=10)
+    assert child.size == 5
+    child.draw()
+    adult = sampler.bag("Ana", "Drama", age=30)
+    assert adult is not child and adult.size == 10 and adult.position == 0
+    assert sampler.bag("Ana", "Drama", age=30) is adult
+
+
+def test_the_bag_restarts_when_the_catalog_version_changes(make_catalog, tmp_path):
+    movies = [(f"Drama {i}", 2000, "Drama", 0) for i in range(10)]
+    catalog = make_catalog(movies)
+    sampler = SuggestionSampler(catalog, seed=1)
+    bag = sampler.bag("Ana", "Drama")
+    bag.draw()
+    version = catalog.version
+
+    # Same number of titles, different contents
+    write_source(tmp_path, [(title + " (remasterizado)", *rest) for title, *rest in movies])
+    catalog.close()
+    assert catalog.version != version
+    restarted = sampler.bag("Ana", "Drama")
+    assert restarted is not bag and restarted.size == 10 and restarted.position == 0